@@ -0,0 +1,122 @@
+"""End-to-end animations, from the DataArray to the video file."""
+
+import tempfile
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+
+from mapflow import animate, animate_batch, animate_quiver
+from mapflow._misc import check_ffmpeg
+
+from .common import N_FRAMES, dask_array, data_array, lazy_netcdf, timed
+
+matplotlib.use("Agg")
+
+UPSAMPLE_RATIO = 2
+OPTIONS = {
+    "fps": 12,
+    "upsample_ratio": UPSAMPLE_RATIO,
+    "n_jobs": 2,
+    "dpi": 80,
+    "video_width": 640,
+    "figsize": (8, 4),
+}
+
+
+class _AnimationBenchmark:
+    timeout = 600
+
+    def setup_tempdir(self):
+        if not check_ffmpeg():
+            raise NotImplementedError("FFmpeg is not available.")
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tempdir.name) / "animation.mp4"
+        self.n_frames = (N_FRAMES - 1) * UPSAMPLE_RATIO + 1
+
+    def teardown(self, *params):
+        self.tempdir.cleanup()
+
+
+class Animate(_AnimationBenchmark):
+    params = ([64, 256], ["numpy", "netcdf", "dask"], ["persistent", "numpy"], [False, True])
+    param_names = ["n", "source", "engine", "pipe"]
+
+    def setup(self, n, source, engine, pipe):
+        self.setup_tempdir()
+        if source == "numpy":
+            self.da = data_array(n)
+        elif source == "netcdf":
+            self.da = lazy_netcdf(self.tempdir.name, n)
+        else:
+            self.da = dask_array(n)
+
+    def teardown(self, n, source, engine, pipe):
+        if source == "netcdf":
+            self.da.close()
+        super().teardown()
+
+    def _animate(self, engine, pipe):
+        animate(self.da, self.path, engine=engine, pipe=pipe, **OPTIONS)
+
+    def time_animate(self, n, source, engine, pipe):
+        self._animate(engine, pipe)
+
+    def peakmem_animate(self, n, source, engine, pipe):
+        self._animate(engine, pipe)
+
+    def track_frames_per_second(self, n, source, engine, pipe):
+        return self.n_frames / timed(self._animate, engine, pipe)
+
+    track_frames_per_second.unit = "frames/s"
+
+
+class AnimateQuiver(_AnimationBenchmark):
+    params = [[64, 256]]
+    param_names = ["n"]
+
+    def setup(self, n):
+        self.setup_tempdir()
+        self.u = data_array(n)
+        self.v = self.u.copy(data=np.roll(self.u.values, 1, axis=2))
+
+    def _animate(self):
+        animate_quiver(self.u, self.v, self.path, subsample=max(1, self.u.sizes["lat"] // 16), **OPTIONS)
+
+    def time_animate_quiver(self, n):
+        self._animate()
+
+    def track_frames_per_second(self, n):
+        return self.n_frames / timed(self._animate)
+
+    track_frames_per_second.unit = "frames/s"
+
+
+class AnimateBatch(_AnimationBenchmark):
+    """Several short animations of a same grid, one after the other or over one shared pool."""
+
+    params = ([64, 256], [False, True])
+    param_names = ["n", "batch"]
+    n_animations = 8
+
+    def setup(self, n, batch):
+        self.setup_tempdir()
+        self.da = data_array(n)
+        self.n_frames *= self.n_animations
+
+    def _animate(self, batch):
+        paths = [self.path.with_name(f"animation_{i}.mp4") for i in range(self.n_animations)]
+        options = {key: value for key, value in OPTIONS.items() if key != "n_jobs"}
+        if batch:
+            animate_batch([{"da": self.da, "path": path, **options} for path in paths], n_jobs=OPTIONS["n_jobs"])
+        else:
+            for path in paths:
+                animate(self.da, path, **OPTIONS)
+
+    def time_animate(self, n, batch):
+        self._animate(batch)
+
+    def track_frames_per_second(self, n, batch):
+        return self.n_frames / timed(self._animate, batch)
+
+    track_frames_per_second.unit = "frames/s"
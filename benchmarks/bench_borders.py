@@ -0,0 +1,55 @@
+"""Construction of the plot model: border loading, reprojection, clipping and simplification."""
+
+import numpy as np
+
+from mapflow import PlotModel, clear_border_cache
+
+from .common import coords
+
+DOMAINS = {
+    "regional": (np.linspace(-5, 10, 300), np.linspace(40, 55, 300)),
+    "global": (np.linspace(-180, 180, 720), np.linspace(-90, 90, 360)),
+}
+
+
+class PlotModelInit:
+    params = (list(DOMAINS), [False, True])
+    param_names = ["domain", "cached"]
+
+    def setup(self, domain, cached):
+        self.x, self.y = DOMAINS[domain]
+        clear_border_cache()
+        if cached:
+            PlotModel(self.x, self.y)
+
+    def time_init(self, domain, cached):
+        if not cached:
+            clear_border_cache()
+        PlotModel(self.x, self.y)
+
+    def peakmem_init(self, domain, cached):
+        if not cached:
+            clear_border_cache()
+        PlotModel(self.x, self.y)
+
+
+class PlotModelProjected:
+    def setup(self):
+        self.x, self.y = coords(256)
+        self.x, self.y = self.x * 1e5, (self.y - 50) * 1e5
+
+    def time_init_lambert(self):
+        clear_border_cache()
+        PlotModel(self.x, self.y, crs=3035)
+
+
+class BorderSimplification:
+    params = [list(DOMAINS)]
+    param_names = ["domain"]
+
+    def setup(self, domain):
+        self.plot = PlotModel(*DOMAINS[domain])
+
+    def time_simplify(self, domain):
+        self.plot._simplified_borders.clear()
+        self.plot._borders_for((8, 4), 180)
@@ -0,0 +1,71 @@
+"""Color range computation, in memory and streamed over lazily-backed frames."""
+
+import tempfile
+
+from mapflow import Animation
+from mapflow._classic import PlotModel
+from mapflow._dask import dask_sketch
+
+from .common import GRID_SIZES, N_FRAMES, dask_array, frames, lazy_netcdf, timed
+
+
+class Norm:
+    params = [GRID_SIZES]
+    param_names = ["n"]
+
+    def setup(self, n):
+        self.data = frames(n)
+
+    def time_norm(self, n):
+        PlotModel._norm(self.data, None, None, 0.01, 99.9, None, log=False)
+
+    def time_norm_diff(self, n):
+        PlotModel._norm(self.data, None, None, 0.01, 99.9, None, log=False, diff=True)
+
+    def peakmem_norm(self, n):
+        PlotModel._norm(self.data, None, None, 0.01, 99.9, None, log=False)
+
+
+class NormStreaming:
+    params = (GRID_SIZES, ["numpy", "netcdf", "dask"])
+    param_names = ["n", "source"]
+
+    def setup(self, n, source):
+        self.tempdir = tempfile.TemporaryDirectory()
+        if source == "numpy":
+            self.data = frames(n)
+        elif source == "netcdf":
+            self.data = lazy_netcdf(self.tempdir.name, n)
+        else:
+            self.data = dask_array(n)
+
+    def teardown(self, n, source):
+        if source == "netcdf":
+            self.data.close()
+        self.tempdir.cleanup()
+
+    def _norm(self):
+        raw = Animation._iter_raw_frames(self.data)
+        return PlotModel._norm_streaming(raw, None, None, 0.01, 99.9, None, log=False)
+
+    def time_norm_streaming(self, n, source):
+        self._norm()
+
+    def peakmem_norm_streaming(self, n, source):
+        self._norm()
+
+    def track_frames_per_second(self, n, source):
+        return N_FRAMES / timed(self._norm)
+
+    track_frames_per_second.unit = "frames/s"
+
+
+class DaskSketch:
+    params = [GRID_SIZES]
+    param_names = ["n"]
+
+    def setup(self, n):
+        self.data = dask_array(n)
+
+    def time_dask_sketch(self, n):
+        dask_sketch(self.data)
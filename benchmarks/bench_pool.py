@@ -0,0 +1,58 @@
+"""Dispatch of frames to the render pool, by transport and with interpolation in the workers."""
+
+from collections import deque
+from contextlib import ExitStack
+
+import matplotlib
+
+from mapflow import Animation
+from mapflow._render import render_run_task, render_slot_task, render_task
+
+from .common import DPI, N_FRAMES, coords, frames, render_settings, timed
+
+matplotlib.use("Agg")
+
+N_JOBS = 2
+RATIO = 4
+
+
+class PoolDispatch:
+    params = ([64, 256], ["pickle", "shm", "worker_interpolation"])
+    param_names = ["n", "transport"]
+    timeout = 300
+
+    def setup(self, n, transport):
+        self.animation = Animation(*coords(n))
+        self.data = frames(n)
+        norm = self.animation.plot._norm(self.data, None, None, 0.01, 99.9, None, log=False)
+        self.settings = render_settings("numpy", norm, upsample_ratio=RATIO)
+        first = self.data[0]
+        self.settings["frame_box"] = self.animation._make_renderer(first, None, self.settings).frame_box(DPI, 0.2)
+        self.n_frames = (N_FRAMES - 1) * RATIO + 1
+
+    def _dispatch(self, transport):
+        animation = self.animation
+        if transport == "worker_interpolation":
+            with animation._pool(N_JOBS, self.settings) as pool:
+                runs = animation._iter_source_runs(self.data, RATIO, 8, 0)
+                deque(animation._imap_bounded(pool, render_run_task, runs, N_JOBS), maxlen=0)
+            return
+        ring_size = 4 * N_JOBS + 1
+        frames = animation._iter_frames(self.data, RATIO, ring=1 if transport == "shm" else ring_size)
+        if transport == "shm":
+            with ExitStack() as stack:
+                shared, ring = stack.enter_context(animation._shared_memory(self.data[0], n_slots=ring_size))
+                pool = stack.enter_context(shared._pool(N_JOBS, self.settings, frames=ring))
+                tasks = ((k, ring.put(k, frame)) for k, frame in enumerate(frames))
+                deque(animation._imap_bounded(pool, render_slot_task, tasks, 2 * N_JOBS), maxlen=0)
+            return
+        with animation._pool(N_JOBS, self.settings) as pool:
+            deque(animation._imap_bounded(pool, render_task, enumerate(frames), 2 * N_JOBS), maxlen=0)
+
+    def time_dispatch(self, n, transport):
+        self._dispatch(transport)
+
+    def track_frames_per_second(self, n, transport):
+        return self.n_frames / timed(self._dispatch, transport)
+
+    track_frames_per_second.unit = "frames/s"
@@ -0,0 +1,59 @@
+"""Rendering of a single frame, by each engine, to a PNG file and to raw RGB pixels."""
+
+import tempfile
+from pathlib import Path
+
+import matplotlib
+
+from mapflow import Animation
+
+from .common import DPI, GRID_SIZES, coords, frames, render_settings, timed
+
+matplotlib.use("Agg")
+
+ENGINES = ["persistent", "rebuild", "numpy"]
+
+
+class RenderFrame:
+    params = (GRID_SIZES, ["regular", "curvilinear"], ENGINES)
+    param_names = ["n", "grid", "engine"]
+    timeout = 120
+
+    def setup(self, n, grid, engine):
+        if engine == "numpy" and grid == "curvilinear":
+            raise NotImplementedError("The 'numpy' engine only supports regular grids.")
+        self.animation = Animation(*coords(n, curvilinear=grid == "curvilinear"))
+        self.frames = frames(n, n_frames=2)
+        norm = self.animation.plot._norm(self.frames, None, None, 0.01, 99.9, None, log=False)
+        self.settings = render_settings(engine, norm)
+        self.renderer = self.animation._make_renderer(self.frames[0], None, self.settings)
+        self.frame_box = self.renderer.frame_box(DPI, 0.2)
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def teardown(self, n, grid, engine):
+        self.tempdir.cleanup()
+
+    def _render_rgb(self):
+        if self.settings["engine"] == "rebuild":
+            self.renderer = self.animation._make_renderer(self.frames[1], None, self.settings)
+        else:
+            self.renderer.update(self.frames[1])
+        self.renderer.to_rgb(self.frame_box, DPI)
+
+    def time_build_renderer(self, n, grid, engine):
+        self.animation._make_renderer(self.frames[0], None, self.settings)
+
+    def time_render_rgb(self, n, grid, engine):
+        self._render_rgb()
+
+    def time_render_png(self, n, grid, engine):
+        self.renderer.update(self.frames[1])
+        self.renderer.savefig(Path(self.tempdir.name) / "frame.png", dpi=DPI, pad_inches=0.2)
+
+    def peakmem_render_rgb(self, n, grid, engine):
+        self._render_rgb()
+
+    def track_frames_per_second(self, n, grid, engine):
+        return 1 / timed(self._render_rgb)
+
+    track_frames_per_second.unit = "frames/s"
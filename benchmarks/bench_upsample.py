@@ -0,0 +1,53 @@
+"""Temporal interpolation of the frames, streamed and materialized."""
+
+from collections import deque
+
+import numpy as np
+
+from mapflow import Animation
+
+from .common import GRID_SIZES, N_FRAMES, frames, timed
+
+RATIOS = [1, 5, 20]
+
+
+class IterUpsampledFrames:
+    params = (GRID_SIZES, RATIOS, ["float32", "int16"])
+    param_names = ["n", "ratio", "dtype"]
+
+    def setup(self, n, ratio, dtype):
+        self.data = (frames(n) * 1000).astype(dtype)
+        self.n_frames = (N_FRAMES - 1) * ratio + 1
+
+    def _consume(self, ratio, ring=None):
+        deque(Animation._iter_upsampled_frames(self.data, ratio=ratio, ring=ring), maxlen=0)
+
+    def time_iter_upsampled_frames(self, n, ratio, dtype):
+        self._consume(ratio, ring=64)
+
+    def peakmem_iter_upsampled_frames(self, n, ratio, dtype):
+        self._consume(ratio, ring=64)
+
+    def track_frames_per_second(self, n, ratio, dtype):
+        return self.n_frames / timed(self._consume, ratio, ring=64)
+
+    track_frames_per_second.unit = "frames/s"
+
+
+class Upsample:
+    params = [GRID_SIZES]
+    param_names = ["n"]
+
+    def setup(self, n):
+        self.data = frames(n)
+
+    def time_upsample(self, n):
+        Animation.upsample(self.data, ratio=5)
+
+    def peakmem_upsample(self, n):
+        Animation.upsample(self.data, ratio=5)
+
+    def track_bytes_per_frame(self, n):
+        return np.dtype(Animation._interpolation_dtype(self.data.dtype)).itemsize * self.data[0].size
+
+    track_bytes_per_frame.unit = "bytes"
@@ -0,0 +1,57 @@
+"""Encoding of the rendered frames with FFmpeg."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from matplotlib.image import imsave
+
+from mapflow import Animation
+from mapflow._misc import check_ffmpeg
+from mapflow._segments import SegmentEncoder
+
+from .common import timed
+
+N_VIDEO_FRAMES = 48
+
+
+class CreateVideo:
+    """Single FFmpeg process (``segment_frames=None``) or segments encoded in parallel."""
+
+    params = [[(480, 270), (1280, 720)], [None, 12]]
+    param_names = ["size", "segment_frames"]
+    timeout = 300
+
+    def setup(self, size, segment_frames):
+        if not check_ffmpeg():
+            raise NotImplementedError("FFmpeg is not available.")
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.frame_dir = Path(self.tempdir.name) / "frames"
+        self.frame_dir.mkdir()
+        width, height = size
+        rng = np.random.default_rng(0)
+        base = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        for k in range(N_VIDEO_FRAMES):
+            imsave(self.frame_dir / f"frame_{k:08d}.png", np.roll(base, 4 * k, axis=1))
+        self.path = Path(self.tempdir.name) / "video.mp4"
+        self.segment_frames = segment_frames
+
+    def teardown(self, size, segment_frames):
+        self.tempdir.cleanup()
+
+    def _encode(self):
+        if self.segment_frames is None:
+            Animation._create_video(self.frame_dir, self.path, fps=24, timeout=300)
+            return
+        encoders = N_VIDEO_FRAMES // self.segment_frames
+        SegmentEncoder(
+            Animation, self.frame_dir, self.path, 24, N_VIDEO_FRAMES, self.segment_frames, 300, encoders
+        ).finish()
+
+    def time_create_video(self, size, segment_frames):
+        self._encode()
+
+    def track_frames_per_second(self, size, segment_frames):
+        return N_VIDEO_FRAMES / timed(self._encode)
+
+    track_frames_per_second.unit = "frames/s"
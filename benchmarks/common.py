@@ -0,0 +1,88 @@
+"""Synthetic inputs shared by the benchmarks.
+
+Every input is generated from a fixed seed, at the grid sizes of ``GRID_SIZES``
+(number of cells along y, x has twice as many), so timings only depend on the
+code under test.
+"""
+
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+import xarray as xr
+
+GRID_SIZES = [64, 256, 1024]
+N_FRAMES = 12
+DPI = 100
+
+
+def coords(n, curvilinear=False):
+    """Returns the x and y coordinates of a grid of ``n`` by ``2 * n`` cells over Europe."""
+    x = np.linspace(-10, 30, 2 * n)
+    y = np.linspace(35, 70, n)
+    if not curvilinear:
+        return x, y
+    xx, yy = np.meshgrid(x, y)
+    # Slightly rotated grid, as produced by regional climate models.
+    return xx + 0.05 * (yy - 50), yy - 0.05 * (xx - 10)
+
+
+def frames(n, n_frames=N_FRAMES, dtype=np.float32):
+    """Returns ``n_frames`` smooth random frames of ``n`` by ``2 * n`` cells."""
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 2 * np.pi, n_frames)[:, None, None]
+    yy, xx = np.mgrid[0 : 1 : n * 1j, 0 : 2 : 2 * n * 1j]
+    noise = rng.normal(scale=0.1, size=(n_frames, n, 2 * n))
+    return (np.sin(4 * xx + t) * np.cos(3 * yy - t) + noise).astype(dtype)
+
+
+def data_array(n, n_frames=N_FRAMES):
+    """Returns the frames of :func:`frames` as a DataArray with its coordinates."""
+    x, y = coords(n)
+    return xr.DataArray(
+        frames(n, n_frames),
+        dims=("time", "lat", "lon"),
+        coords={
+            "time": np.datetime64("2020-01-01T00") + np.arange(n_frames) * np.timedelta64(1, "h"),
+            "lat": y,
+            "lon": x,
+        },
+        name="field",
+    )
+
+
+def lazy_netcdf(directory, n, n_frames=N_FRAMES):
+    """Writes :func:`data_array` to netCDF in ``directory`` and returns it opened lazily."""
+    path = Path(directory) / f"field_{n}_{n_frames}.nc"
+    if not path.exists():
+        data_array(n, n_frames).to_netcdf(path)
+    return xr.open_dataarray(path)
+
+
+def dask_array(n, n_frames=N_FRAMES, time_chunk=4):
+    """Returns :func:`data_array` backed by dask, chunked along time."""
+    return data_array(n, n_frames).chunk({"time": time_chunk})
+
+
+def timed(func, *args, **kwargs):
+    """Returns the wall time of ``func(*args, **kwargs)``, for the throughputs reported by ``track_`` benchmarks."""
+    start = perf_counter()
+    func(*args, **kwargs)
+    return perf_counter() - start
+
+
+def render_settings(engine, norm, upsample_ratio=1):
+    """Returns the render settings of an animation, as built by ``Animation._animate``, for raw RGB frames."""
+    return {
+        "figsize": (8, 4),
+        "titles": None,
+        "cmap": "turbo",
+        "norm": norm,
+        "label": None,
+        "dpi": DPI,
+        "pad_inches": 0.2,
+        "engine": engine,
+        "upsample_ratio": upsample_ratio,
+        "frame_dir": None,
+        "frame_box": None,
+    }
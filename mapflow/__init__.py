@@ -1,16 +1,58 @@
+from importlib import import_module
 from importlib.metadata import version
+from typing import TYPE_CHECKING
 
-from ._classic import Animation, PlotModel, animate, plot_da
-from ._quiver import QuiverAnimation, animate_quiver, plot_da_quiver
+if TYPE_CHECKING:
+    from ._batch import BatchResult, animate_batch
+    from ._borders import border_cache_info, clear_border_cache
+    from ._classic import Animation, PlotModel, animate, animate_in_executor, plot_da
+    from ._quiver import QuiverAnimation, animate_quiver, plot_da_quiver
+    from ._report import AnimationReport
+
+# Submodule of each public name, imported at first access so that `import mapflow`
+# does not import matplotlib, geopandas or xarray.
+_LAZY = {
+    "Animation": "._classic",
+    "AnimationReport": "._report",
+    "BatchResult": "._batch",
+    "PlotModel": "._classic",
+    "QuiverAnimation": "._quiver",
+    "animate": "._classic",
+    "animate_batch": "._batch",
+    "animate_in_executor": "._classic",
+    "animate_quiver": "._quiver",
+    "border_cache_info": "._borders",
+    "clear_border_cache": "._borders",
+    "plot_da": "._classic",
+    "plot_da_quiver": "._quiver",
+}
 
 __all__ = [
     "Animation",
+    "AnimationReport",
+    "BatchResult",
     "PlotModel",
     "QuiverAnimation",
     "animate",
+    "animate_batch",
+    "animate_in_executor",
     "animate_quiver",
+    "border_cache_info",
+    "clear_border_cache",
     "plot_da",
     "plot_da_quiver",
 ]
 
 __version__ = version("mapflow")
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY])
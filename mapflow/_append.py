@@ -0,0 +1,140 @@
+import inspect
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+NORM_PARAMETERS = ("vmin", "vmax", "vcenter", "halfrange", "linthresh", "linscale", "base", "gamma", "clip")
+
+# Settings fixing the size and encoding of the frames, which an appended segment must share with the video.
+VIDEO_SETTINGS = ("figsize", "dpi", "pad_inches", "video_width", "crf")
+
+
+@dataclass
+class AppendState:
+    """State of an animation, kept next to the video so that new time steps can be appended to it.
+
+    It is stored in two sidecar files of the video: ``<video>.mapflow.json``
+    with the attributes below, and ``<video>.mapflow.npz`` with the last
+    source frame, which the first appended frames are interpolated from.
+
+    Attributes:
+        fps (float): Frame rate of the video.
+        upsample_ratio (int): Upsampling ratio of the time axis.
+        norm (dict): Color normalization, see :meth:`describe_norm`.
+        n_source (int): Number of source time steps in the video.
+        last_time (str | float | None): Coordinate of the last source time step,
+            if the data had one. Time steps up to it are not appended again.
+        last_title (str | None): Title of the last source time step.
+        video (dict): Frame size and encoding settings of the video, see
+            ``VIDEO_SETTINGS``, which appended segments must match.
+    """
+
+    fps: float
+    upsample_ratio: int
+    norm: dict
+    n_source: int
+    last_time: str | float | None = None
+    last_title: str | None = None
+    video: dict = field(default_factory=dict)
+
+    @staticmethod
+    def paths(path):
+        """Returns the paths of the JSON and NumPy sidecar files of the video ``path``."""
+        path = Path(path)
+        return path.with_name(f"{path.name}.mapflow.json"), path.with_name(f"{path.name}.mapflow.npz")
+
+    @classmethod
+    def load(cls, path):
+        """Returns the state and the last source frame of the video ``path``, or None if there is no video or state."""
+        json_path, npz_path = cls.paths(path)
+        if not (Path(path).is_file() and json_path.is_file() and npz_path.is_file()):
+            return None
+        with np.load(npz_path, allow_pickle=False) as npz:
+            last_frame = npz["last_frame"]
+        return cls(**json.loads(json_path.read_text())), last_frame
+
+    def save(self, path, last_frame):
+        """Writes the sidecar files of the video ``path``."""
+        json_path, npz_path = self.paths(path)
+        with open(npz_path, "wb") as f:
+            np.savez(f, last_frame=np.asarray(last_frame))
+        json_path.write_text(json.dumps(asdict(self), indent=2))
+
+    @staticmethod
+    def describe_video(**settings):
+        """Returns the JSON description of the ``VIDEO_SETTINGS`` of a run."""
+        settings = {name: settings[name] for name in VIDEO_SETTINGS}
+        return json.loads(json.dumps(settings))
+
+    def check(self, fps, upsample_ratio, duration, **settings):
+        """Raises a ValueError if the arguments of an appending run conflict with the video.
+
+        ``fps`` and ``upsample_ratio`` must be None or the ones of the video,
+        ``duration`` must be None, and the ``VIDEO_SETTINGS`` must be the ones
+        of the video, for the new segment to be joined to it without
+        re-encoding.
+        """
+        if duration is not None:
+            raise ValueError("duration cannot be set when appending: the fps and upsample_ratio of the video are kept.")
+        conflicts = [
+            f"{name}={value!r} (video: {kept!r})"
+            for name, value, kept in (("fps", fps, self.fps), ("upsample_ratio", upsample_ratio, self.upsample_ratio))
+            if value is not None and value != kept
+        ]
+        video = self.describe_video(**settings)
+        conflicts += [
+            f"{name}={video[name]!r} (video: {self.video[name]!r})"
+            for name in VIDEO_SETTINGS
+            if name in self.video and video[name] != self.video[name]
+        ]
+        if conflicts:
+            raise ValueError(f"Cannot append to a video with other settings: {', '.join(conflicts)}.")
+
+    @staticmethod
+    def describe_norm(norm):
+        """Returns a JSON-serializable description of the ``matplotlib.colors`` normalization ``norm``."""
+        import matplotlib.colors
+
+        cls = type(norm)
+        if getattr(matplotlib.colors, cls.__name__, None) is not cls:
+            raise ValueError(f"Appending requires a normalization from matplotlib.colors, got {cls.__name__}.")
+        parameters = inspect.signature(cls).parameters
+        described = {"class": cls.__name__}
+        for name in NORM_PARAMETERS:
+            if name in parameters and hasattr(norm, name):
+                value = getattr(norm, name)
+                described[name] = value.item() if isinstance(value, np.generic) else value
+        return described
+
+    def make_norm(self):
+        """Returns the normalization described by ``norm``."""
+        import matplotlib.colors
+
+        params = dict(self.norm)
+        return getattr(matplotlib.colors, params.pop("class"))(**params)
+
+    @staticmethod
+    def time_of(data):
+        """Returns the coordinate of the last time step of ``data`` as stored in ``last_time``, or None."""
+        coord = _time_coord(data)
+        if coord is None:
+            return None
+        value = coord.values[-1]
+        return str(value) if np.issubdtype(coord.dtype, np.datetime64) else value.item()
+
+    def new_steps(self, data):
+        """Returns the mask of the time steps of ``data`` after ``last_time``, or None if they are all new."""
+        coord = _time_coord(data)
+        if coord is None or self.last_time is None:
+            return None
+        return coord.values > np.asarray(self.last_time, dtype=coord.dtype)
+
+
+def _time_coord(data):
+    dims = getattr(data, "dims", None)
+    if not dims or dims[0] not in data.coords:
+        return None
+    coord = data.coords[dims[0]]
+    return coord if np.issubdtype(coord.dtype, np.datetime64) or np.issubdtype(coord.dtype, np.number) else None
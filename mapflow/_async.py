@@ -0,0 +1,141 @@
+import asyncio
+import subprocess
+from concurrent.futures import CancelledError as FutureCancelledError
+from contextlib import suppress
+from contextvars import ContextVar, copy_context
+from functools import partial
+from threading import Event, Lock
+from time import monotonic
+
+_RUNNER = ContextVar("mapflow_async_runner", default=None)
+
+# Longest time a blocked wait goes without checking for cancellation, in seconds.
+POLL_INTERVAL = 0.1
+
+
+class AsyncRunner:
+    """Bridges an animation run on an executor thread and the event loop awaiting it.
+
+    The run keeps its thread until it is done: its blocking waits (worker
+    results, streaming and segment FFmpeg processes) check :meth:`check` at
+    least every ``POLL_INTERVAL`` seconds, and the FFmpeg commands run to
+    completion (final encoding, concatenation) are asyncio subprocesses of
+    ``loop`` (see :meth:`run_ffmpeg`). Once :meth:`cancel` is called, the run
+    raises :class:`asyncio.CancelledError` at its next check, which
+    terminates the worker pool and the FFmpeg processes on the way out.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): Running event loop awaiting the run.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.cancelled = Event()
+        self._futures = set()
+        self._lock = Lock()
+
+    def check(self):
+        """Raises :class:`asyncio.CancelledError` if the run was cancelled."""
+        if self.cancelled.is_set():
+            raise asyncio.CancelledError()
+
+    def cancel(self):
+        """Cancels the run, killing the FFmpeg processes of the event loop."""
+        self.cancelled.set()
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+    def run_ffmpeg(self, cmd, timeout):
+        """Runs ``cmd`` on the event loop and waits for it, like ``subprocess.run(cmd, check=True, timeout=timeout)``."""
+        self.check()
+        future = asyncio.run_coroutine_threadsafe(_run_process(cmd, timeout), self.loop)
+        with self._lock:
+            self._futures.add(future)
+        if self.cancelled.is_set():
+            future.cancel()
+        try:
+            return future.result()
+        except FutureCancelledError:
+            raise asyncio.CancelledError() from None
+        finally:
+            with self._lock:
+                self._futures.discard(future)
+
+
+async def _run_process(cmd, timeout):
+    process = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except BaseException as error:
+        process.kill()
+        await process.wait()
+        if isinstance(error, asyncio.TimeoutError):
+            raise subprocess.TimeoutExpired(cmd, timeout) from None
+        raise
+    stdout, stderr = stdout.decode(errors="replace"), stderr.decode(errors="replace")
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, cmd, output=stdout, stderr=stderr)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+def current_runner():
+    """Returns the :class:`AsyncRunner` of the current run, or None if it is not run asynchronously."""
+    return _RUNNER.get()
+
+
+def checkpoint():
+    """Raises :class:`asyncio.CancelledError` if the current asynchronous run was cancelled."""
+    runner = _RUNNER.get()
+    if runner is not None:
+        runner.check()
+
+
+def wait_result(result):
+    """Returns the value of the ``multiprocessing`` ``AsyncResult`` ``result``, checking for cancellation."""
+    runner = _RUNNER.get()
+    if runner is not None:
+        while not result.ready():
+            runner.check()
+            result.wait(POLL_INTERVAL)
+    return result.get()
+
+
+def wait_process(process, timeout=None):
+    """Equivalent of ``process.wait(timeout)`` checking for cancellation."""
+    runner = _RUNNER.get()
+    if runner is None:
+        return process.wait(timeout=timeout)
+    deadline = None if timeout is None else monotonic() + timeout
+    while True:
+        runner.check()
+        remaining = POLL_INTERVAL if deadline is None else max(0.0, min(POLL_INTERVAL, deadline - monotonic()))
+        try:
+            return process.wait(timeout=remaining)
+        except subprocess.TimeoutExpired:
+            if deadline is not None and monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(process.args, timeout) from None
+
+
+async def run_in_executor(func, *args, executor=None, **kwargs):
+    """Awaits ``func(*args, **kwargs)``, a synchronous animation run, on a thread of ``executor``.
+
+    The run holds its thread of ``executor`` (the default executor of the
+    loop if None) until it is done; only the waits of the event loop are
+    freed. Cancelling the awaiting task cancels the run, and returns once its
+    workers and FFmpeg processes are terminated and its temporary files
+    removed.
+    """
+    loop = asyncio.get_running_loop()
+    runner = AsyncRunner(loop)
+    context = copy_context()
+    context.run(_RUNNER.set, runner)
+    future = loop.run_in_executor(executor, partial(context.run, func, *args, **kwargs))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        runner.cancel()
+        with suppress(BaseException):
+            await future
+        raise
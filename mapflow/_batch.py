@@ -0,0 +1,187 @@
+import hashlib
+import pickle
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+from itertools import count
+from multiprocessing import Pool
+from os import cpu_count
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Lock
+
+import numpy as np
+
+from ._render import init_batch_worker, render_batch_task
+
+_BATCH = ContextVar("mapflow_batch", default=None)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of an animation of :func:`animate_batch`.
+
+    Attributes:
+        path (str | Path): Output path of the animation.
+        report (AnimationReport | None): Report of the run, with ``report=True``.
+        error (BaseException | None): Exception raised by the animation, if it failed.
+    """
+
+    path: "str | Path"
+    report: object = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self):
+        """Whether the animation succeeded."""
+        return self.error is None
+
+
+class SharedPool:
+    """Worker pool and plot models shared by the animations of a batch.
+
+    Each animation gets a view of the pool (see :meth:`job`) whose tasks
+    carry the file of its render job, which the workers load once, so that
+    the animations of the batch are rendered by the same workers. Animations
+    of a same grid, CRS and borders share their :class:`Animation` (see
+    :meth:`animation`), and thus their plot model and simplified borders.
+
+    Args:
+        processes (int): Number of worker processes.
+        directory (str | Path): Directory of the render job files.
+        max_jobs (int, optional): Number of render jobs kept by each worker,
+            at least the number of animations rendered at once. Defaults to 1.
+    """
+
+    def __init__(self, processes, directory, max_jobs=1):
+        self.processes = processes
+        self.directory = Path(directory)
+        self.pool = Pool(processes=processes, initializer=init_batch_worker, initargs=(max_jobs,))
+        self._ids = count()
+        self._animations = {}
+        self._lock = Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.pool.terminate()
+        self.pool.join()
+
+    @contextmanager
+    def job(self, job):
+        """Yields a view of the pool running the tasks of the render job ``job``."""
+        path = self.directory / f"job_{next(self._ids):05d}.pkl"
+        with open(path, "wb") as f:
+            pickle.dump(job, f, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            yield _JobPool(self.pool, str(path))
+        finally:
+            path.unlink(missing_ok=True)
+
+    def animation(self, cls, x, y, crs, **kwargs):
+        """Returns the ``cls`` animation of the grid ``x``, ``y``, creating it on first use."""
+        key = (cls, _array_key(x), _array_key(y), crs.to_wkt(), *((name, id(value)) for name, value in kwargs.items()))
+        with self._lock:
+            if key not in self._animations:
+                self._animations[key] = cls(x=x, y=y, crs=crs, **kwargs)
+            return self._animations[key]
+
+
+class _JobPool:
+    """View of a :class:`SharedPool` for one render job, with the ``map_async`` used by ``_imap_bounded``."""
+
+    def __init__(self, pool, path):
+        self.pool = pool
+        self.path = path
+
+    def map_async(self, func, iterable, chunksize=None):
+        return self.pool.map_async(render_batch_task, [(self.path, func, task) for task in iterable], chunksize)
+
+
+def _array_key(array):
+    array = np.ascontiguousarray(array)
+    return array.dtype.str, array.shape, hashlib.sha256(array.data).hexdigest()
+
+
+def current_batch():
+    """Returns the :class:`SharedPool` of the current batch, or None."""
+    return _BATCH.get()
+
+
+def _size(spec):
+    """Number of values of the data of an animation spec, used to schedule the largest ones first."""
+    if "da" in spec:
+        return spec["da"].size
+    return spec["u"].size + spec["v"].size
+
+
+def _run(spec, n_jobs):
+    from ._classic import animate
+    from ._quiver import animate_quiver
+
+    spec = {"n_jobs": n_jobs, **spec}
+    return animate(**spec) if "da" in spec else animate_quiver(**spec)
+
+
+def animate_batch(specs, n_jobs=None, max_concurrent=None):
+    """Renders many animations over one shared worker pool.
+
+    Each spec holds the keyword arguments of :func:`animate` (with ``da``) or
+    of :func:`animate_quiver` (with ``u`` and ``v``). The animations run
+    concurrently, the largest ones (by number of data values) first, and
+    their frames are interleaved in a single pool of ``n_jobs`` workers,
+    which is only started once. Animations of a same grid, CRS and borders
+    share their plot model, and the border preparation with it.
+
+    A failing animation does not stop the others: its exception is returned
+    in its :class:`BatchResult`.
+
+    Args:
+        specs (Iterable[dict]): Keyword arguments of each animation. ``n_jobs``
+            defaults to the size of the pool, and only sets the default number
+            of frames in flight of the animation.
+        n_jobs (int, optional): Number of worker processes. Defaults to 2/3 of
+            the CPU cores.
+        max_concurrent (int, optional): Maximum number of animations read,
+            interpolated and encoded at once, each in a thread of the main
+            process. Each worker keeps the render job of each of them, so
+            that their interleaved frames do not reload it. Defaults to
+            ``n_jobs``, and at least 2.
+
+    Returns:
+        list[BatchResult]: The result of each spec, in the order of ``specs``.
+
+    .. code-block:: python
+
+        from mapflow import animate_batch
+
+        results = animate_batch(
+            [{"da": ds[name], "path": f"{name}.mp4"} for name in ds.data_vars]
+        )
+        failed = [result for result in results if not result.ok]
+
+    """
+    specs = [dict(spec) for spec in specs]
+    if not specs:
+        return []
+    n_jobs = max(1, int((2 * (cpu_count() or 1)) / 3)) if n_jobs is None else n_jobs
+    max_concurrent = max(2, n_jobs) if max_concurrent is None else max_concurrent
+    results = [BatchResult(path=spec.get("path")) for spec in specs]
+    with (
+        TemporaryDirectory(prefix="mapflow-batch-") as tempdir,
+        SharedPool(n_jobs, tempdir, max_jobs=min(max_concurrent, len(specs))) as shared,
+        ThreadPoolExecutor(max_workers=min(max_concurrent, len(specs))) as executor,
+    ):
+        context = copy_context()
+        context.run(_BATCH.set, shared)
+        # The executor starts the animations in submission order.
+        order = sorted(range(len(specs)), key=lambda i: _size(specs[i]), reverse=True)
+        futures = {executor.submit(context.copy().run, _run, specs[i], n_jobs): i for i in order}
+        for future in as_completed(futures):
+            result = results[futures[future]]
+            result.error = future.exception()
+            if result.error is None:
+                result.report = future.result()
+    return results
@@ -0,0 +1,248 @@
+import hashlib
+import sys
+import weakref
+from collections import OrderedDict, namedtuple
+from itertools import pairwise
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+import shapely
+from pyproj import Transformer
+from pyproj.exceptions import ProjError
+from shapely.geometry import LineString, MultiLineString, MultiPolygon, Polygon, box
+
+from ._cache import DiskCache
+
+WORLD_BORDERS = Path(__file__).parent / "_static" / "world.gpkg"
+
+BorderCacheInfo = namedtuple("BorderCacheInfo", ["hits", "disk_hits", "misses", "currsize", "maxsize"])
+
+_MAXSIZE = 64
+_MEMORY = OrderedDict()
+_STATS = {"hits": 0, "disk_hits": 0, "misses": 0}
+# Digests of custom borders, by object id: (weak reference to the object, digest).
+_DIGESTS = {}
+_LOCK = Lock()
+
+
+def border_cache_info():
+    """Returns the statistics of the border cache shared by all plot models of the process.
+
+    Returns:
+        BorderCacheInfo: ``hits`` (served from memory), ``disk_hits`` (served
+        from a ``border_cache`` directory), ``misses`` (read, reprojected and
+        clipped), and the current and maximum number of entries kept in memory.
+
+    .. code-block:: python
+
+        from mapflow import border_cache_info
+
+        print(border_cache_info())
+
+    """
+    with _LOCK:
+        return BorderCacheInfo(**_STATS, currsize=len(_MEMORY), maxsize=_MAXSIZE)
+
+
+def clear_border_cache():
+    """Empties the in-memory border cache and the digests of custom borders, and resets its statistics."""
+    with _LOCK:
+        _MEMORY.clear()
+        _DIGESTS.clear()
+        _STATS.update(hits=0, disk_hits=0, misses=0)
+
+
+def geometry_lines(gdf):
+    """Returns the boundary lines of the geometries of ``gdf`` as ``(n, 2)`` arrays."""
+    lines = []
+    for geom in gdf.geometry.values:
+        if isinstance(geom, Polygon):
+            lines.append(geom.exterior.coords)
+        elif isinstance(geom, MultiPolygon):
+            for poly in geom.geoms:
+                lines.append(poly.exterior.coords)
+        elif isinstance(geom, LineString):
+            lines.append(geom.coords)
+        elif isinstance(geom, MultiLineString):
+            for line in geom.geoms:
+                lines.append(line.coords)
+    return [np.asarray(line, dtype=np.float64)[:, :2] for line in lines if len(line) > 1]
+
+
+def simplify_lines(lines, tolerance):
+    """Simplifies lines with the Douglas-Peucker algorithm, without creating self-intersections.
+
+    Args:
+        lines (list[np.ndarray]): ``(n, 2)`` arrays of line coordinates.
+        tolerance (float): Maximum distance between the original and the
+            simplified lines, in the units of the coordinates.
+
+    Returns:
+        list[np.ndarray]: The simplified lines.
+    """
+    if not lines or tolerance <= 0:
+        return lines
+    arrays = _to_arrays(lines)
+    geoms = shapely.linestrings(arrays["coords"], indices=np.repeat(np.arange(len(lines)), np.diff(arrays["offsets"])))
+    coords, index = shapely.get_coordinates(
+        shapely.simplify(geoms, tolerance, preserve_topology=True), return_index=True
+    )
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(index, minlength=len(lines)))))
+    return _from_arrays({"coords": coords, "offsets": offsets})
+
+
+def _source_key(borders):
+    """Identifies the borders source: the packaged world borders, or a digest of custom geometries.
+
+    The digest of custom borders is computed once per object (see
+    :func:`_memoized_digest`), so they must not be modified in place once
+    used, unless :func:`clear_border_cache` is called.
+    """
+    if borders is None:
+        stat = WORLD_BORDERS.stat()
+        return ("world", stat.st_size, stat.st_mtime_ns)
+    return ("custom", _memoized_digest(borders))
+
+
+def _geometry_digest(borders):
+    """Returns the SHA-256 digest of the CRS and the WKB of every geometry of ``borders``."""
+    digest = hashlib.sha256(str(borders.crs).encode())
+    for wkb in borders.geometry.to_wkb().values:
+        digest.update(b"" if wkb is None else wkb)
+    return digest.hexdigest()
+
+
+def _memoized_digest(borders):
+    """Returns :func:`_geometry_digest` of ``borders``, computed on the first call for this object only.
+
+    GeoDataFrames are not hashable, so digests are kept by object id along
+    with a weak reference that drops them once the object is collected.
+    """
+    key = id(borders)
+    with _LOCK:
+        entry = _DIGESTS.get(key)
+        if entry is not None and entry[0]() is borders:
+            return entry[1]
+    digest = _geometry_digest(borders)
+
+    def forget(ref):
+        # Called by the garbage collector, possibly while _LOCK is held: single dict operations only.
+        if _DIGESTS.get(key, (None,))[0] is ref:
+            _DIGESTS.pop(key, None)
+
+    with _LOCK:
+        _DIGESTS[key] = (weakref.ref(borders, forget), digest)
+    return digest
+
+
+def _native_boxes(bbox, crs, native_crs):
+    """Returns the boxes covering ``bbox`` of ``crs`` in ``native_crs``, or None if it cannot be transformed.
+
+    The edges of ``bbox`` are densified before being transformed, and a box
+    crossing the antimeridian of a geographic ``native_crs`` is split in two.
+    """
+    try:
+        transformer = Transformer.from_crs(crs, native_crs, always_xy=True)
+        xmin, ymin, xmax, ymax = transformer.transform_bounds(*bbox, densify_pts=21)
+    except ProjError:
+        return None
+    if not np.all(np.isfinite((xmin, ymin, xmax, ymax))):
+        return None
+    if xmin > xmax and native_crs.is_geographic:
+        return [box(xmin, ymin, 180, ymax), box(-180, ymin, xmax, ymax)]
+    return [box(xmin, ymin, xmax, ymax)]
+
+
+def _intersecting(gdf, crs, bbox):
+    """Selects the features of ``gdf`` that may intersect ``bbox`` of ``crs``, with the spatial index of ``gdf``.
+
+    The query is done in the CRS of ``gdf``, so only the selected features
+    need to be reprojected and clipped. All features are kept if ``bbox``
+    cannot be transformed to that CRS.
+    """
+    if gdf.crs is None or len(gdf) == 0:
+        return gdf
+    boxes = _native_boxes(bbox, crs, gdf.crs)
+    if boxes is None:
+        return gdf
+    index = np.unique(np.concatenate([gdf.sindex.query(b, predicate="intersects") for b in boxes]))
+    return gdf.iloc[index]
+
+
+def _round_bbox(bbox):
+    """Rounds ``bbox`` outwards to a power of ten about 1/100 of its largest side, so close domains share entries."""
+    xmin, ymin, xmax, ymax = bbox
+    span = max(xmax - xmin, ymax - ymin)
+    step = 10.0 ** np.floor(np.log10(span / 100)) if span > 0 else 1.0
+    return (
+        float(np.floor(xmin / step) * step),
+        float(np.floor(ymin / step) * step),
+        float(np.ceil(xmax / step) * step),
+        float(np.ceil(ymax / step) * step),
+    )
+
+
+def _to_arrays(lines):
+    offsets = np.cumsum([0] + [len(line) for line in lines])
+    coords = np.concatenate(lines) if lines else np.empty((0, 2))
+    return {"coords": coords, "offsets": offsets}
+
+
+def _from_arrays(arrays):
+    coords, offsets = arrays["coords"], arrays["offsets"]
+    return [coords[start:stop] for start, stop in pairwise(offsets)]
+
+
+def border_lines(borders, crs, bbox, cache_dir=None):
+    """Returns the border lines of ``borders`` reprojected to ``crs`` and clipped to ``bbox``.
+
+    Results are cached in memory (LRU, shared by the whole process) and, if
+    ``cache_dir`` is given, on disk, keyed by the borders source, the CRS and
+    the bounding box rounded outwards (see :func:`_round_bbox`), so that plot
+    models of a same domain skip reading, reprojecting and clipping them. On
+    a miss, only the features selected by :func:`_intersecting` are
+    reprojected and clipped.
+
+    Args:
+        borders (gpd.GeoDataFrame | gpd.GeoSeries | None): Borders, or None for
+            the packaged world borders.
+        crs (pyproj.CRS): Target CRS.
+        bbox (tuple[float, float, float, float]): Bounding box in ``crs``.
+        cache_dir (str | Path, optional): Directory of the on-disk cache.
+            Defaults to None.
+
+    Returns:
+        list[np.ndarray]: ``(n, 2)`` arrays of line coordinates. They are
+        shared between cache hits and must not be modified.
+    """
+    # geopandas is only imported on a miss: custom borders are instances of it, so it is already loaded then.
+    gpd = sys.modules.get("geopandas")
+    if borders is not None and (gpd is None or not isinstance(borders, (gpd.GeoDataFrame, gpd.GeoSeries))):
+        raise TypeError("borders must be a geopandas GeoDataFrame, GeoSeries, or None.")
+    bbox = _round_bbox(bbox)
+    key = DiskCache.make_key("borders", _source_key(borders), crs.to_wkt(), bbox)
+    with _LOCK:
+        if key in _MEMORY:
+            _MEMORY.move_to_end(key)
+            _STATS["hits"] += 1
+            return _MEMORY[key]
+    disk = None if cache_dir is None else DiskCache(cache_dir)
+    arrays = None if disk is None else disk.get(key)
+    if arrays is not None:
+        lines = _from_arrays(arrays)
+        stat = "disk_hits"
+    else:
+        import geopandas as gpd
+
+        gdf = gpd.read_file(WORLD_BORDERS) if borders is None else borders
+        lines = geometry_lines(_intersecting(gdf, crs, bbox).to_crs(crs).clip(bbox))
+        if disk is not None:
+            disk.set(key, _to_arrays(lines))
+        stat = "misses"
+    with _LOCK:
+        _STATS[stat] += 1
+        _MEMORY[key] = lines
+        while len(_MEMORY) > _MAXSIZE:
+            _MEMORY.popitem(last=False)
+    return lines
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import xarray as xr
+
+
+class DiskCache:
+    """Size-bounded on-disk cache of dictionaries of numpy arrays.
+
+    Each entry is stored as an ``.npz`` file named after its key. Reading an
+    entry refreshes its modification time, and once the total size of the
+    cache exceeds ``max_bytes`` the least recently used entries are removed.
+    Entries are written atomically, so concurrent runs sharing a cache
+    directory never read a partial file.
+
+    Args:
+        directory (str | Path): Cache directory, created if needed.
+        max_bytes (int, optional): Maximum total size of the entries in bytes.
+            Defaults to 256 MiB.
+    """
+
+    def __init__(self, directory, max_bytes=2**28):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(*parts):
+        """Returns a file-name-safe key identifying ``parts``."""
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.npz"
+
+    def get(self, key):
+        """Returns the arrays stored under ``key``, or None if there are none."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                arrays = {name: npz[name] for name in npz.files}
+            os.utime(path)
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+            return None
+        return arrays
+
+    def set(self, key, arrays):
+        """Stores the dictionary of arrays ``arrays`` under ``key``."""
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def data_fingerprint(data):
+    """Returns a tuple identifying the content of a file- or dask-backed DataArray.
+
+    The fingerprint combines the source file (path, size and modification
+    time) and the dask graph name when available, with the variable name,
+    dtype, chunking and a hash of the coordinate values of every dimension.
+    It changes whenever the source is rewritten or a different subset is
+    selected.
+
+    Data read from a file is only fingerprinted while it is lazily backed by
+    the file, and if every dimension has a coordinate telling which part of
+    the file was selected: once loaded, the values may have been modified in
+    memory. The graph name of dask-backed data already identifies the
+    selection.
+
+    Args:
+        data: Data to identify.
+
+    Returns:
+        tuple | None: The fingerprint, or None if the content of the data
+        cannot be identified without reading it.
+    """
+    if not isinstance(data, xr.DataArray):
+        return None
+    source = data.encoding.get("source")
+    dask_name = getattr(data.data, "name", None) if data.chunks is not None else None
+    if dask_name is None:
+        if source is None or data.variable._in_memory:
+            return None
+        if any(dim not in data.coords or data[dim].ndim != 1 for dim in data.dims):
+            return None
+    if source is not None:
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        source = (str(source), stat.st_size, stat.st_mtime_ns)
+    indexes = []
+    for dim, size in zip(data.dims, data.shape, strict=True):
+        if dim in data.coords and data[dim].ndim == 1:
+            values = data[dim].values
+            raw = repr(values.tolist()).encode() if values.dtype == object else np.ascontiguousarray(values).tobytes()
+            indexes.append((dim, size, values.dtype.str, hashlib.sha256(raw).hexdigest()))
+        else:
+            indexes.append((dim, size))
+    chunks = (data.encoding.get("chunksizes"), data.encoding.get("preferred_chunks"), data.chunks)
+    return (source, dask_name, data.name, data.dtype.str, tuple(indexes), repr(chunks))
@@ -1,20 +1,31 @@
 import subprocess
+from collections import deque
+from contextlib import ExitStack, contextmanager, suppress
 from copy import copy
+from functools import partial
+from itertools import chain, count, cycle, islice
 from multiprocessing import Pool
 from os import cpu_count
 from pathlib import Path
-from tempfile import TemporaryDirectory
+from queue import Full, Queue
+from tempfile import TemporaryDirectory, TemporaryFile
+from threading import Event, Thread
+from typing import TYPE_CHECKING
 
-import geopandas as gpd
-import matplotlib.pyplot as plt
+import matplotlib
 import numpy as np
 import xarray as xr
 from matplotlib.collections import LineCollection
 from matplotlib.colors import LogNorm, Normalize
 from pyproj import CRS
-from shapely.geometry import LineString, MultiLineString, MultiPolygon, Polygon
 from tqdm.auto import tqdm
 
+from ._append import AppendState
+from ._async import checkpoint, current_runner, run_in_executor, wait_process, wait_result
+from ._batch import current_batch
+from ._borders import border_lines, simplify_lines
+from ._cache import DiskCache, data_fingerprint
+from ._dask import dask_render, dask_sketch, is_dask_backed, require_dask
 from ._misc import (
     TIME_NAME_CANDIDATES,
     X_NAME_CANDIDATES,
@@ -24,6 +35,24 @@ from ._misc import (
     guess_coord_name,
     process_crs,
 )
+from ._reduce import REDUCTIONS, ReducedFrames, block_reduce, reduction_factors
+from ._render import (
+    CompositeRenderer,
+    FrameRenderer,
+    RenderJob,
+    init_worker,
+    render_run_task,
+    render_slot_task,
+    render_task,
+)
+from ._report import AnimationReport, current_report, reporting, timed_encoding, timed_iter, timed_stage
+from ._segments import SegmentEncoder
+from ._shm import SharedArray, SharedFrameRing
+from ._sketch import QuantileSketch
+from ._workdir import FrameStore
+
+if TYPE_CHECKING:
+    import geopandas as gpd
 
 
 class PlotModel:
@@ -37,6 +66,15 @@ class PlotModel:
             Defaults to 4326 (WGS84).
         borders (gpd.GeoDataFrame | gpd.GeoSeries | None): Custom borders to use.
             If None, defaults to world borders from a packaged GeoPackage.
+        border_cache (str | Path | None): Directory where the reprojected and
+            clipped borders are cached across processes. They are always cached
+            in memory for the process, see :func:`border_cache_info`, keyed by a
+            digest of custom borders computed once per object: modify them in
+            place only after calling :func:`clear_border_cache`.
+        border_tolerance (float | str | None): Tolerance, in the units of x and y,
+            of the simplification of the borders when they are drawn. "auto"
+            uses half of the size of an output pixel, derived from the figure
+            size and dpi, and None keeps every vertex. Defaults to "auto".
 
     .. code-block:: python
 
@@ -51,7 +89,7 @@ class PlotModel:
 
     """
 
-    def __init__(self, x, y, crs=4326, borders=None):
+    def __init__(self, x, y, crs=4326, borders=None, border_cache=None, border_tolerance="auto"):
         self.x = np.asarray_chkfinite(x)
         self.y = np.asarray_chkfinite(y)
         if self.x.ndim != self.y.ndim:
@@ -62,12 +100,7 @@ class PlotModel:
             self.aspect = 1 / np.cos(self.y.mean() * np.pi / 180)
         else:
             self.aspect = 1
-        if self.x.ndim == 1:
-            self.dx = abs(self.x[1] - self.x[0])
-            self.dy = abs(self.y[1] - self.y[0])
-        else:
-            self.dx = np.diff(self.x, axis=1).max()
-            self.dy = np.diff(self.y, axis=0).max()
+        self.dx, self.dy = self._grid_steps(self.x, self.y)
         bbox = (
             self.x.min() - 10 * self.dx,
             self.y.min() - 10 * self.dy,
@@ -75,30 +108,70 @@ class PlotModel:
             self.y.max() + 10 * self.dy,
         )
 
-        if borders is None:
-            borders_ = gpd.read_file(Path(__file__).parent / "_static" / "world.gpkg")
-        elif isinstance(borders, (gpd.GeoDataFrame, gpd.GeoSeries)):
-            borders_ = borders
+        lines = border_lines(borders, self.crs, bbox, cache_dir=border_cache)
+        self.borders = LineCollection(lines, linewidth=0.5, edgecolor="k")
+        self.border_tolerance = border_tolerance
+        self._simplified_borders = {}
+
+    @staticmethod
+    def _grid_steps(x, y):
+        if x.ndim == 1:
+            return abs(x[1] - x[0]), abs(y[1] - y[0])
+        return np.diff(x, axis=1).max(), np.diff(y, axis=0).max()
+
+    def _borders_for(self, figsize, dpi):
+        """Returns the borders simplified for a figure of ``figsize`` inches at ``dpi``.
+
+        Simplified borders are computed once per tolerance, see ``border_tolerance``.
+        """
+        tolerance = self.border_tolerance
+        if tolerance == "auto":
+            tolerance = self._auto_border_tolerance(figsize, dpi)
+        if tolerance is None or tolerance <= 0:
+            return self.borders
+        if tolerance not in self._simplified_borders:
+            lines = simplify_lines(self.borders.get_segments(), tolerance)
+            self._simplified_borders[tolerance] = LineCollection(lines, linewidth=0.5, edgecolor="k")
+        return self._simplified_borders[tolerance]
+
+    def _auto_border_tolerance(self, figsize, dpi):
+        """Returns half of the smallest possible size of an output pixel, in the units of x and y.
+
+        The map spans at most the whole figure, so its pixels are at least
+        ``span / (figure size * dpi)`` wide along each axis.
+        """
+        width, height = figsize
+        x_span = self.x.max() - self.x.min() + self.dx
+        y_span = self.y.max() - self.y.min() + self.dy
+        return 0.5 * float(min(x_span / (width * dpi), y_span / (height * dpi)))
+
+    def _reduced(self, factors, how):
+        """Returns a copy of the plot model on the grid reduced by :func:`block_reduce`.
+
+        Coordinates are averaged over each block (or taken at its center
+        cell with "nearest"), and borders are kept as they are.
+        """
+        how = "nearest" if how == "nearest" else "mean"
+        plot = copy(self)
+        if self.x.ndim == 1:
+            plot.x = block_reduce(self.x[np.newaxis], (1, factors[1]), how)[0]
+            plot.y = block_reduce(self.y[np.newaxis], (1, factors[0]), how)[0]
         else:
-            raise TypeError("borders must be a geopandas GeoDataFrame, GeoSeries, or None.")
-        borders_ = borders_.to_crs(self.crs).clip(bbox)
-        self.borders = self._shp_to_lines(borders_)
-
-    @staticmethod
-    def _shp_to_lines(gdf):
-        lines = []
-        for geom in gdf.geometry.values:
-            if isinstance(geom, Polygon):
-                lines.append(geom.exterior.coords)
-            elif isinstance(geom, MultiPolygon):
-                for poly in geom.geoms:
-                    lines.append(poly.exterior.coords)
-            elif isinstance(geom, LineString):
-                lines.append(geom.coords)
-            elif isinstance(geom, MultiLineString):
-                for line in geom.geoms:
-                    lines.append(line.coords)
-        return LineCollection(lines, linewidth=0.5, edgecolor="k")
+            plot.x, plot.y = block_reduce(self.x, factors, how), block_reduce(self.y, factors, how)
+        plot.dx, plot.dy = self._grid_steps(plot.x, plot.y)
+        return plot
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if state.get("_shared_coords") is not None:
+            # Coordinates already in shared memory: only their names are pickled.
+            del state["x"], state["y"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if "x" not in state:
+            self.x, self.y = (shared.array for shared in state["_shared_coords"])
 
     @staticmethod
     def _log_norm(data, vmin, vmax, qmin, qmax):
@@ -162,16 +235,16 @@ class PlotModel:
         return Normalize(vmin=vmin, vmax=vmax)
 
     @staticmethod
-    def _norm_streaming(frames, vmin, vmax, qmin, qmax, norm, log, diff=False):
+    def _norm_streaming(frames, vmin, vmax, qmin, qmax, norm, log, diff=False, cache=None, compute_sketch=None):
         """Streaming counterpart of :meth:`_norm` operating on an iterable of 2D frames.
 
         Frames are consumed one at a time, so the full 3D array is never held
-        in memory. Quantile-based bounds are aggregated per frame (minimum of
-        the per-frame lower quantiles, maximum of the per-frame upper
-        quantiles), which yields a range at least as wide as the exact global
+        in memory. Each frame is added to a mergeable :class:`QuantileSketch`
+        in O(pixels), and the quantiles of the whole sequence are read from
+        the sketch, within a relative error of 1e-4 of the exact global
         quantiles. The frames iterable is not consumed at all when explicit
         bounds (``norm``, or ``vmin`` and ``vmax``) make the data pass
-        unnecessary.
+        unnecessary, nor when the sketch of the same data is found in ``cache``.
 
         Args:
             frames (Iterable[np.ndarray]): Iterable of 2D frames.
@@ -182,6 +255,13 @@ class PlotModel:
             norm (matplotlib.colors.Normalize): Custom normalization object.
             log (bool): Indicates if a logarithmic scale should be used.
             diff (bool): Indicates if a divergent colormap should be used.
+            cache (tuple[DiskCache, str], optional): Cache and key under which the
+                sketch of the frames is stored. The sketch holds every quantile,
+                so a cached sketch is reused whatever ``qmin``, ``qmax``, ``log``
+                and ``diff``. Defaults to None.
+            compute_sketch (Callable[[], QuantileSketch], optional): Computes the
+                sketch of the data instead of iterating over ``frames``, e.g. as
+                a parallel dask reduction. Defaults to None.
 
         Returns:
             matplotlib.colors.Normalize: Normalization object.
@@ -191,45 +271,48 @@ class PlotModel:
         if norm is not None:
             return norm
 
+        if (diff and vmax is not None) or (not diff and vmin is not None and vmax is not None):
+            return PlotModel._norm_from_sketch(None, vmin, vmax, qmin, qmax, log, diff)
+        arrays = None if cache is None else cache[0].get(cache[1])
+        if arrays is not None:
+            sketch = QuantileSketch.from_arrays(arrays)
+        else:
+            if compute_sketch is not None:
+                sketch = compute_sketch()
+            else:
+                sketch = QuantileSketch()
+                for frame in frames:
+                    sketch.update(frame)
+            if cache is not None:
+                cache[0].set(cache[1], sketch.to_arrays())
+        return PlotModel._norm_from_sketch(sketch, vmin, vmax, qmin, qmax, log, diff)
+
+    @staticmethod
+    def _norm_from_sketch(sketch, vmin, vmax, qmin, qmax, log, diff=False):
+        """Builds the normalization from the quantiles of ``sketch`` for the bounds not given."""
+
+        def quantile(q, mode):
+            value = sketch.quantile(q, mode=mode)
+            return None if np.isnan(value) else value
+
         if diff:
             if vmax is None:
-                high = None
-                for frame in frames:
-                    value = np.nanpercentile(np.abs(frame), q=qmax)
-                    if not np.isnan(value):
-                        high = value if high is None else max(high, value)
-                vmax = high
+                vmax = quantile(qmax, "abs")
             vmin = None if vmax is None else -vmax
             return Normalize(vmin=vmin, vmax=vmax)
 
         if log:
             if vmin is None or vmax is None:
-                low = high = None
-                for frame in frames:
-                    positive = frame[frame > 0]
-                    if positive.size == 0:
-                        continue
-                    frame_min, frame_max = np.nanpercentile(positive, q=[qmin, qmax])
-                    low = frame_min if low is None else min(low, frame_min)
-                    high = frame_max if high is None else max(high, frame_max)
-                if low is None or high is None:
+                if sketch.positive.total == 0:
                     return Normalize(vmin=1e-1, vmax=1e0)
-                vmin = low if vmin is None else vmin
-                vmax = high if vmax is None else vmax
+                vmin = quantile(qmin, "positive") if vmin is None else vmin
+                vmax = quantile(qmax, "positive") if vmax is None else vmax
             if vmin <= 0 or vmax <= 0:
                 raise ValueError(f"Normalization range for log scale must be positive. Got vmin={vmin}, vmax={vmax}")
             return LogNorm(vmin=vmin, vmax=vmax)
 
-        if vmin is None or vmax is None:
-            low = high = None
-            for frame in frames:
-                frame_min, frame_max = np.nanpercentile(frame, q=[qmin, qmax])
-                if not np.isnan(frame_min):
-                    low = frame_min if low is None else min(low, frame_min)
-                if not np.isnan(frame_max):
-                    high = frame_max if high is None else max(high, frame_max)
-            vmin = low if vmin is None else vmin
-            vmax = high if vmax is None else vmax
+        vmin = quantile(qmin, "linear") if vmin is None else vmin
+        vmax = quantile(qmax, "linear") if vmax is None else vmax
         return Normalize(vmin=vmin, vmax=vmax)
 
     def _process_data(self, data):
@@ -304,9 +387,34 @@ class PlotModel:
             cmap = "bwr"
         data = self._process_data(data)
         norm = self._norm(data, vmin, vmax, qmin, qmax, norm, log=log, diff=diff)
-        plt.figure(figsize=figsize)
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=figsize)
+        self._draw(fig, data, cmap=cmap, norm=norm, shading=shading, shrink=shrink, label=label, title=title)
+        if show:
+            plt.show()
+
+    def _draw(self, fig, data, cmap, norm, shading="nearest", shrink=0.5, label=None, title=None, dpi=None):
+        """Draws a frame on ``fig`` and returns the artists that change between frames.
+
+        Args:
+            fig (matplotlib.figure.Figure): Empty figure to draw on.
+            data (np.ndarray): 2D array of data to plot.
+            cmap (str): Colormap to use.
+            norm (matplotlib.colors.Normalize): Normalization object.
+            shading (str, optional): Shading method. Defaults to "nearest".
+            shrink (float, optional): Colorbar shrink factor. Defaults to 0.5.
+            label (str, optional): Colorbar label. Defaults to None.
+            title (str, optional): Plot title. Defaults to None.
+            dpi (float, optional): Resolution at which the figure will be saved,
+                for the simplification of the borders. Defaults to the dpi of ``fig``.
+
+        Returns:
+            tuple: The axes, the image or mesh holding the data, and the title text.
+        """
+        ax = fig.add_subplot()
         if (self.x.ndim == 1) and (self.y.ndim == 1):
-            plt.imshow(
+            mappable = ax.imshow(
                 X=data,
                 cmap=cmap,
                 norm=norm,
@@ -320,7 +428,7 @@ class PlotModel:
                 interpolation=shading,
             )
         else:
-            plt.pcolormesh(
+            mappable = ax.pcolormesh(
                 self.x,
                 self.y,
                 data,
@@ -329,18 +437,17 @@ class PlotModel:
                 shading=shading,
                 rasterized=True,
             )
-        plt.colorbar(shrink=shrink, label=label)
-        plt.xlim(self.x.min() - self.dx / 2, self.x.max() + self.dx / 2)
-        plt.ylim(self.y.min() - self.dy / 2, self.y.max() + self.dy / 2)
-        plt.gca().add_collection(copy(self.borders))
-        plt.gca().set_aspect(self.aspect)
+        fig.colorbar(mappable, ax=ax, shrink=shrink, label=label)
+        ax.set_xlim(self.x.min() - self.dx / 2, self.x.max() + self.dx / 2)
+        ax.set_ylim(self.y.min() - self.dy / 2, self.y.max() + self.dy / 2)
+        ax.add_collection(copy(self._borders_for(fig.get_size_inches(), dpi or fig.dpi)))
+        ax.set_aspect(self.aspect)
         if title is not None:
-            plt.title(str(title))
-        plt.gca().axis("off")
-        plt.tight_layout()
-        plt.gcf().set_facecolor("#f5f5f5")
-        if show:
-            plt.show()
+            ax.set_title(str(title))
+        ax.axis("off")
+        fig.tight_layout()
+        fig.set_facecolor("#f5f5f5")
+        return ax, mappable, ax.title
 
 
 def plot_da(da: xr.DataArray, x_name=None, y_name=None, crs=None, borders=None, diff=False, subsample=None, **kwargs):
@@ -431,6 +538,19 @@ class Animation:
         borders (gpd.GeoDataFrame | gpd.GeoSeries | None, optional):
             Custom borders to use for plotting. If None, defaults to
             world borders. Defaults to None.
+        border_cache (str | Path | None, optional): Directory where the
+            reprojected and clipped borders are cached across processes.
+            Defaults to None.
+        border_tolerance (float | str | None, optional): Tolerance of the
+            simplification of the borders, see :class:`PlotModel`. Defaults
+            to "auto" (half an output pixel).
+
+    Attributes:
+        read_block_bytes (int): Maximum size in bytes of the blocks of frames
+            read at once from lazily-backed data chunked along time. Reading
+            holds up to ``prefetch + 1`` blocks, so this bounds its memory, at
+            the cost of decompressing again the storage chunks larger than a
+            block. Class attribute, 64 MiB by default.
 
     .. code-block:: python
 
@@ -445,22 +565,51 @@ class Animation:
 
     """
 
-    def __init__(self, x, y, crs=4326, verbose=0, borders=None):
-        self.plot = PlotModel(x=x, y=y, crs=crs, borders=borders)
+    read_block_bytes = 2**26
+
+    def __init__(self, x, y, crs=4326, verbose=0, borders=None, border_cache=None, border_tolerance="auto"):
+        self.plot = PlotModel(
+            x=x,
+            y=y,
+            crs=crs,
+            borders=borders,
+            border_cache=border_cache,
+            border_tolerance=border_tolerance,
+        )
         self.verbose = verbose
 
-    @staticmethod
-    def upsample(data, ratio=5):
+    @classmethod
+    def upsample(cls, data, ratio=5):
+        """Linearly interpolates ``ratio - 1`` frames between each pair of consecutive frames.
+
+        Materializing counterpart of :meth:`_iter_upsampled_frames`, with the
+        same output dtype policy (see :meth:`_interpolation_dtype`).
+
+        Args:
+            data (np.ndarray): 3D array of frames.
+            ratio (int, optional): Upsampling ratio. Defaults to 5.
+
+        Returns:
+            np.ndarray: The ``ratio * (len(data) - 1) + 1`` frames.
+        """
         if ratio == 1:
             return data
-        else:
-            nt, ny, nx = data.shape
-            ret = np.empty((ratio * (nt - 1) + 1, ny, nx), dtype=data.dtype)
-            ret[::ratio] = data
-            delta = np.diff(data, axis=0)
-            for k in range(1, ratio):
-                ret[k::ratio] = ret[::ratio][:-1] + k * delta / ratio
-            return ret
+        nt, ny, nx = data.shape
+        ret = np.empty((ratio * (nt - 1) + 1, ny, nx), dtype=cls._interpolation_dtype(data.dtype))
+        for k, frame in enumerate(cls._iter_upsampled_frames(data, ratio=ratio)):
+            ret[k] = frame
+        return ret
+
+    @staticmethod
+    def _interpolation_dtype(dtype):
+        """Returns the dtype of interpolated frames.
+
+        float64 data is interpolated in float64, anything else (integers,
+        booleans, float16, float32) in float32, so that interpolated integer
+        frames are not truncated.
+        """
+        dtype = np.dtype(dtype)
+        return dtype if dtype == np.float64 else np.dtype(np.float32)
 
     @staticmethod
     def _frame_values(data, k):
@@ -469,46 +618,245 @@ class Animation:
         return np.asarray(getattr(frame, "values", frame))
 
     @classmethod
-    def _iter_raw_frames(cls, data):
-        """Yields raw frames one at a time as numpy arrays."""
-        for k in range(len(data)):
-            yield cls._frame_values(data, k)
+    def _time_blocks(cls, data, max_bytes=None):
+        """Returns the ``(start, stop)`` bounds of the blocks of frames read at once.
+
+        Blocks follow the storage chunks along the first (time) dimension, so
+        that each chunk is read and decompressed only once: the dask chunks,
+        or the chunking of the time dimension of the netCDF/zarr variable
+        recorded in its encoding. The encoded chunks start at the first stored
+        time step, and the offset of a selection is not recorded, so they are
+        only followed if the time dimension was read whole (same length as
+        its ``original_shape``). Blocks are split to hold at most ``max_bytes``
+        (``read_block_bytes`` by default). Other data (numpy arrays,
+        contiguous variables, selections along time) is read frame by frame.
+        """
+        n_frames = len(data)
+        chunks = getattr(data, "chunks", None)
+        if isinstance(chunks, tuple) and chunks and isinstance(chunks[0], tuple):
+            sizes = chunks[0]
+        else:
+            size = cls._encoded_time_chunk(data) or 1
+            sizes = [size] * (n_frames // size) + ([n_frames % size] if n_frames % size else [])
+        step_max = 1
+        if max(sizes, default=1) > 1:
+            max_bytes = cls.read_block_bytes if max_bytes is None else max_bytes
+            frame_bytes = int(np.prod(data.shape[1:])) * data.dtype.itemsize
+            step_max = max(1, max_bytes // max(frame_bytes, 1))
+        blocks, start = [], 0
+        for size in sizes:
+            for block_start in range(start, start + size, step_max):
+                blocks.append((block_start, min(block_start + step_max, start + size)))
+            start += size
+        return blocks
+
+    @staticmethod
+    def _encoded_time_chunk(data):
+        """Returns the storage chunk size along the time dimension of a variable read whole along it, or None."""
+        if not isinstance(data, xr.DataArray):
+            return None
+        encoding = data.encoding
+        # Both are in the order of the stored dimensions, which may differ from ``data.dims``.
+        preferred, original = encoding.get("preferred_chunks") or {}, encoding.get("original_shape")
+        dims = list(preferred)
+        if data.dims[0] not in dims or original is None or len(original) != len(dims):
+            return None
+        if original[dims.index(data.dims[0])] != len(data):
+            return None
+        return preferred[data.dims[0]]
 
     @classmethod
-    def _iter_upsampled_frames(cls, data, ratio=1):
+    def _read_blocks(cls, data):
+        """Yields the frames of ``data`` read one block at a time, as 3D arrays."""
+        for start, stop in cls._time_blocks(data):
+            if stop - start == 1:
+                yield cls._frame_values(data, start)[np.newaxis]
+            else:
+                block = data[start:stop]
+                yield np.asarray(getattr(block, "values", block))
+
+    @staticmethod
+    def _prefetch(iterable, depth):
+        """Yields the items of ``iterable``, produced ahead of time by a background thread.
+
+        At most ``depth`` items are waiting to be consumed, which bounds the
+        memory held by the prefetched items. Exceptions raised while producing
+        an item are re-raised in the consumer, and the thread stops when the
+        consumer is closed.
+
+        Args:
+            iterable (Iterable): Items to produce, e.g. frames read from disk.
+            depth (int): Maximum number of items produced and not consumed yet.
+
+        Yields:
+            The items of ``iterable``, in order.
+        """
+        items = Queue(maxsize=depth)
+        stop = Event()
+
+        def put(item):
+            while not stop.is_set():
+                with suppress(Full):
+                    items.put(item, timeout=0.1)
+                    return True
+            return False
+
+        def produce():
+            try:
+                for item in iterable:
+                    if not put(("item", item)):
+                        return
+            except Exception as exc:
+                put(("error", exc))
+            else:
+                put(("done", None))
+
+        thread = Thread(target=produce, name="mapflow-prefetch", daemon=True)
+        thread.start()
+        try:
+            while True:
+                kind, item = items.get()
+                if kind == "done":
+                    return
+                if kind == "error":
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+    @classmethod
+    def _iter_raw_frames(cls, data, prefetch=0):
+        """Yields raw frames one at a time as numpy arrays.
+
+        Chunked data is read one block of frames at a time (see
+        :meth:`_time_blocks`), and the frames are views of that block. With
+        ``prefetch``, lazily-backed data is read by a background thread up to
+        ``prefetch`` blocks ahead, overlapping I/O and decompression (which
+        mostly release the GIL) with the consumer.
+        """
+        blocks = cls._read_blocks(data)
+        if prefetch and not isinstance(data, np.ndarray):
+            blocks = cls._prefetch(blocks, prefetch)
+        for block in timed_iter("read", blocks):
+            checkpoint()
+            yield from block
+
+    @classmethod
+    def _iter_upsampled_frames(cls, data, ratio=1, prefetch=0, ring=None):
         """Yields temporally interpolated frames one at a time.
 
-        Streaming equivalent of :meth:`upsample`: at most two source frames
-        are held in memory at any time, so lazily-backed data (e.g. an xarray
-        DataArray opened from a netCDF/zarr store or backed by dask) is never
-        fully loaded, and the interpolated frames are never all materialized
-        at once.
+        Streaming equivalent of :meth:`upsample`: source frames are read one
+        storage chunk at a time (see :meth:`_iter_raw_frames`), so lazily-backed
+        data (e.g. an xarray DataArray opened from a netCDF/zarr store or backed
+        by dask) is never fully loaded, and the interpolated frames are never
+        all materialized at once.
+
+        Frames are computed in place from the difference of two consecutive
+        source frames and precomputed interpolation weights, in the dtype
+        given by :meth:`_interpolation_dtype`. With ``ratio=1`` the source
+        frames are yielded unchanged.
+
+        Args:
+            data: Sequence of 2D frames.
+            ratio (int, optional): Upsampling ratio. Defaults to 1.
+            prefetch (int, optional): See :meth:`_iter_raw_frames`. Defaults to 0.
+            ring (int, optional): Maximum number of yielded frames still in use
+                by the consumer. If given, frames are written to a preallocated
+                ring buffer and are views that are overwritten once ``ring`` more
+                frames have been yielded, so no array is allocated per frame.
+                If None, each group of ``ratio`` frames gets its own array.
+                Defaults to None.
         """
-        n_raw = len(data)
-        if n_raw == 0:
+        if len(data) == 0:
             raise ValueError("data must contain at least one frame.")
-        previous = cls._frame_values(data, 0)
-        for k in range(1, n_raw):
-            yield previous
-            current = cls._frame_values(data, k)
-            if ratio > 1:
-                delta = (current - previous) / ratio
-                for j in range(1, ratio):
-                    yield (previous + j * delta).astype(previous.dtype, copy=False)
+        frames = cls._iter_raw_frames(data, prefetch=prefetch)
+        if ratio == 1:
+            yield from frames
+            return
+        previous = next(frames)
+        dtype = cls._interpolation_dtype(previous.dtype)
+        weights = np.arange(ratio, dtype=dtype) / dtype.type(ratio)
+        delta = np.empty(previous.shape, dtype=dtype)
+        if ring is None:
+            groups = (np.empty((ratio, *previous.shape), dtype=dtype) for _ in count())
+        else:
+            # Enough groups of ``ratio`` frames that the one being written is
+            # never among the ``ring`` frames last yielded.
+            buffer = np.empty((-(-ring // ratio) + 1, ratio, *previous.shape), dtype=dtype)
+            groups = cycle(buffer)
+        for current in frames:
+            out = next(groups)
+            np.copyto(out[0], previous, casting="unsafe")
+            yield out[0]
+            np.subtract(current, previous, out=delta, dtype=dtype)
+            for j in range(1, ratio):
+                # In place, one frame at a time, so each frame is still in cache
+                # for the addition.
+                np.multiply(delta, weights[j], out=out[j])
+                np.add(out[j], previous, out=out[j], dtype=dtype)
+                yield out[j]
             previous = current
-        yield previous
+        out = next(groups)
+        out[0] = previous
+        yield out[0]
 
     @staticmethod
-    def _process_title(title, upsample_ratio):
+    def _process_title(title, upsample_ratio, n_frames):
+        """Returns the title of each of the ``n_frames`` frames, a string title being shown on all of them."""
         if title is None:
             return
         if isinstance(title, str):
-            return [title] * upsample_ratio
+            return [title] * n_frames
         elif isinstance(title, (list, tuple)):
             return np.repeat(title, upsample_ratio).tolist()
         else:
             raise TypeError("Title must be a string or a list of strings.")
 
+    def _check_engine(self, engine):
+        if engine not in ("persistent", "rebuild", "numpy"):
+            raise ValueError(f"engine must be 'persistent', 'rebuild' or 'numpy', got {engine!r}")
+        if engine == "numpy" and self.plot.x.ndim != 1:
+            raise ValueError("The 'numpy' engine requires 1D x and y coordinates.")
+
+    @staticmethod
+    def _check_backend(backend, pipe, *data):
+        if backend not in ("pool", "dask"):
+            raise ValueError(f"backend must be 'pool' or 'dask', got {backend!r}")
+        if backend == "dask":
+            require_dask()
+            if pipe:
+                raise ValueError("backend='dask' renders frames on the dask workers and cannot be used with pipe=True.")
+            if not all(is_dask_backed(d) for d in data):
+                raise ValueError("backend='dask' requires dask-backed data, e.g. opened with `chunks=` or `.chunk()`.")
+
+    @staticmethod
+    def _check_transport(transport, backend, worker_interpolation):
+        if transport not in ("pickle", "shm"):
+            raise ValueError(f"transport must be 'pickle' or 'shm', got {transport!r}")
+        if transport == "shm" and (backend != "pool" or worker_interpolation):
+            raise ValueError("transport='shm' is only available with backend='pool' and worker_interpolation=False.")
+
+    @staticmethod
+    def _check_workdir(workdir, backend, pipe, worker_interpolation):
+        if workdir is not None and (backend != "pool" or pipe or worker_interpolation):
+            raise ValueError(
+                "workdir is only available with backend='pool', pipe=False and worker_interpolation=False."
+            )
+
+    @staticmethod
+    def _check_segments(segment_frames, encoders, pipe):
+        if segment_frames is None:
+            return
+        if not isinstance(segment_frames, (int, np.integer)) or segment_frames < 1:
+            raise ValueError("segment_frames must be a positive integer.")
+        if encoders is not None and encoders < 1:
+            raise ValueError("encoders must be a positive integer.")
+        if pipe:
+            raise ValueError(
+                "segment_frames is not available with pipe=True, which streams to a single FFmpeg process."
+            )
+
     @staticmethod
     def _require_ffmpeg():
         if not check_ffmpeg():
@@ -534,6 +882,20 @@ class Animation:
             figsize = (width_in, height_in)
         return figsize, True
 
+    @staticmethod
+    def _norm_cache(directory, *data, kind="values"):
+        """Returns the ``(DiskCache, key)`` pair under which the color scale sketch of ``data`` is cached.
+
+        Returns None, disabling the cache, if no directory is given or if the
+        data cannot be fingerprinted (in-memory arrays).
+        """
+        if directory is None:
+            return None
+        fingerprints = [data_fingerprint(d) for d in data]
+        if any(fingerprint is None for fingerprint in fingerprints):
+            return None
+        return DiskCache(directory), DiskCache.make_key("norm", kind, *fingerprints)
+
     def _calculate_animation_parameters(self, n_frames_raw, fps, upsample_ratio, duration):
         if sum(p is not None for p in [fps, upsample_ratio, duration]) > 2:
             raise ValueError("Only two of 'fps', 'upsample_ratio', and 'duration' can be provided.")
@@ -583,6 +945,21 @@ class Animation:
         n_jobs: int | None = None,
         timeout: int | str = "auto",
         crf=20,
+        engine: str = "persistent",
+        pipe: bool = False,
+        chunksize: int = 1,
+        max_inflight: int | None = None,
+        norm_cache: str | Path | None = None,
+        prefetch: int = 2,
+        backend: str = "pool",
+        worker_interpolation: bool = False,
+        transport: str = "pickle",
+        reduce: str | None = None,
+        workdir: str | Path | None = None,
+        append: bool = False,
+        segment_frames: int | None = None,
+        encoders: int | None = None,
+        report: bool = False,
     ):
         """Generates an animation from a sequence of 2D data arrays.
 
@@ -629,50 +1006,366 @@ class Animation:
                 Defaults to "auto", which sets the timeout to `max(20, 0.1 * data_len)`.
             crf (int, optional): Constant Rate Factor for video encoding. Lower values
                 mean better quality. Defaults to 20.
+            engine (str, optional): Frame rendering engine. "persistent" builds the
+                figure, colorbar, borders and title once per worker and only updates
+                the data and title of each frame. "rebuild" draws every frame from
+                scratch. "numpy" (1D x/y grids only) draws the static layout once
+                and composites each frame with NumPy, applying the colormap as a
+                lookup table, which is much faster and gives near-identical pixels.
+                Defaults to "persistent".
+            pipe (bool, optional): Whether to stream raw RGB frames to the stdin of
+                FFmpeg as they are rendered, instead of writing PNG files to a
+                temporary directory and encoding them afterwards. Encoding then
+                overlaps with rendering and no temporary disk space is used.
+                Defaults to False.
+            chunksize (int, optional): Number of frames sent to a worker at once.
+                Defaults to 1.
+            max_inflight (int, optional): Maximum number of frames dispatched to the
+                workers and not rendered yet, which bounds the memory used by the
+                frames. Defaults to ``2 * n_jobs * chunksize``.
+            norm_cache (str | Path, optional): Directory where the distribution of
+                the data computed for quantile-based color scaling is cached, keyed
+                by the source file (path, size, modification time) or dask graph of
+                ``data`` and the selected subset. Re-running on the same data then
+                skips the extra pass over the frames, whatever ``qmin``/``qmax``.
+                Only used for dask-backed DataArrays and for DataArrays lazily read
+                from a file, with a coordinate on every dimension. Defaults to None.
+            prefetch (int, optional): Number of frames (or storage chunks, see
+                ``data``) of lazily-backed data read ahead by a background thread,
+                so that reading and decompressing the data overlaps with the
+                interpolation and the rendering. 0 reads them synchronously.
+                Blocks of frames hold at most ``read_block_bytes`` (see
+                :class:`Animation`). Defaults to 2.
+            backend (str, optional): "pool" renders frames in a local process pool
+                fed by the main process. "dask" (dask-backed ``data`` only) computes
+                the color range as a parallel reduction and renders each time chunk
+                in a task on the current dask scheduler, next to where the chunk is
+                loaded; ``n_jobs``, ``chunksize``, ``max_inflight`` and ``prefetch``
+                are then unused, and the temporary frame directory must be
+                reachable by the dask workers. Defaults to "pool".
+            worker_interpolation (bool, optional): Whether to send runs of
+                ``chunksize + 1`` consecutive source frames to the workers, which
+                interpolate and render the frames in between themselves, instead
+                of interpolating every frame in the main process and sending each
+                one. Traffic to the workers is then divided by about
+                ``upsample_ratio``, and ``max_inflight`` counts source frames.
+                Defaults to False.
+            transport (str, optional): How frames reach the workers. "pickle"
+                sends each frame through a pipe. "shm" writes the frames into a
+                ring of ``max(max_inflight, chunksize) + chunksize`` slots in
+                shared memory and only sends slot indices; the coordinates are
+                also shared once instead of being copied to every worker. At most
+                ``max(max_inflight, chunksize)`` frames are submitted and not
+                rendered, plus the chunk being assembled, so a slot is only
+                overwritten once its previous frame is rendered. Defaults to
+                "pickle".
+            reduce (str, optional): Reduces grids finer than the output to about
+                one cell per output pixel before dispatch, with the block size
+                derived from ``figsize`` (or ``video_width``) and ``dpi``. "mean"
+                and "max" reduce each block of cells, ignoring NaNs, and "nearest"
+                keeps its center cell, which is sliced lazily from lazily-backed
+                data. The color range is computed on the full-resolution data.
+                Defaults to None (no reduction).
+            workdir (str | Path, optional): Persistent directory where the
+                rendered frames are kept, each under a key derived from its data
+                (the source frames and interpolation weight it is made of), its
+                title and the render settings. A later run with the same
+                ``workdir`` only renders the frames that are missing or stale,
+                so an interrupted run resumes where it stopped, and changing only
+                ``fps`` or ``crf`` re-encodes without rendering anything.
+                ``video_width`` also sets the figure size when ``figsize`` is
+                None, and then changes the frames. Only available with
+                ``backend="pool"``, ``pipe=False`` and
+                ``worker_interpolation=False``. Defaults to None (temporary
+                frames).
+            append (bool, optional): Whether to append ``data`` to the video
+                already at ``path``. The color normalization, ``fps`` and
+                ``upsample_ratio`` of the first run are kept, only the new frames
+                are rendered, including the ones interpolated from the last time
+                step of the video, and they are encoded as a segment joined to
+                the video without re-encoding it. With a time coordinate, the
+                time steps of ``data`` up to the last one of the video are
+                skipped, so a rolling window can be passed whole. A ValueError is
+                raised if ``duration`` is set, or if ``fps``, ``upsample_ratio``,
+                ``figsize``, ``dpi``, ``pad_inches``, ``video_width`` or ``crf``
+                differ from the first run, as the segment would not match the
+                video. The state of the video is kept in
+                ``<path>.mapflow.json`` and ``<path>.mapflow.npz``; without
+                them (or without the video), the animation is created as usual.
+                Defaults to False.
+            segment_frames (int, optional): Splits the video into segments of
+                ``segment_frames`` frames, each encoded by its own FFmpeg process
+                as soon as its frames are rendered, so that encoding overlaps
+                with rendering and scales with the cores. The segments, which
+                each start with a keyframe, are then joined without re-encoding.
+                ``timeout`` then applies to each segment, "auto" being
+                ``max(20, 0.1 * segment_frames)``. Not available with ``pipe``.
+                Defaults to None (a single FFmpeg process once every frame is
+                rendered).
+            encoders (int, optional): Maximum number of segments encoded at
+                once, sharing the cores between their encoder threads. Defaults
+                to a quarter of the CPU cores.
+            report (bool, optional): Whether to time the run and return an
+                :class:`AnimationReport` with the wall and CPU time of each stage
+                (also aggregated from the workers), the frames per second, the
+                bytes sent to the workers and written to temporary files, and
+                the FFmpeg wall time. Defaults to False.
+
+        Returns:
+            AnimationReport | None: The report of the run if ``report``, else None.
         """
         if diff:
             cmap = "bwr"
+        self._check_engine(engine)
+        self._check_backend(backend, pipe, data)
+        self._check_transport(transport, backend, worker_interpolation)
+        self._check_workdir(workdir, backend, pipe, worker_interpolation)
+        self._check_segments(segment_frames, encoders, pipe)
+        if append and backend != "pool":
+            raise ValueError("append=True is only available with backend='pool'.")
+        if reduce is not None and reduce not in REDUCTIONS:
+            raise ValueError(f"reduce must be None or one of {REDUCTIONS}, got {reduce!r}")
+
+        report = AnimationReport() if report else None
+        with reporting(report):
+            figsize, fixed_frame = self._resolve_figsize(
+                figsize,
+                dpi,
+                video_width,
+                self.plot.x,
+                self.plot.y,
+                self.plot.aspect,
+            )
+            video = {"figsize": figsize, "dpi": dpi, "pad_inches": pad_inches, "video_width": video_width, "crf": crf}
+            previous = AppendState.load(path) if append else None
+            if previous is not None:
+                state, last_frame = previous
+                state.check(fps, upsample_ratio, duration, **video)
+                data, title, new_data = self._appended(state, last_frame, data, title)
+                if len(new_data) == 0:
+                    return report
+                fps, upsample_ratio = state.fps, state.upsample_ratio
+            else:
+                new_data = data
+                fps, upsample_ratio = self._calculate_animation_parameters(len(data), fps, upsample_ratio, duration)
+
+            with timed_stage("norm"):
+                if previous is not None:
+                    norm = state.make_norm()
+                elif isinstance(data, np.ndarray):
+                    norm = self.plot._norm(data, vmin, vmax, qmin, qmax, norm, log, diff)
+                else:
+                    norm = self.plot._norm_streaming(
+                        self._iter_raw_frames(data, prefetch),
+                        vmin,
+                        vmax,
+                        qmin,
+                        qmax,
+                        norm,
+                        log,
+                        diff,
+                        cache=self._norm_cache(norm_cache, data),
+                        compute_sketch=(lambda: dask_sketch(data)) if backend == "dask" else None,
+                    )
+            if append:
+                next_state = AppendState(
+                    fps=fps,
+                    upsample_ratio=upsample_ratio,
+                    norm=AppendState.describe_norm(norm),
+                    n_source=len(new_data) + (state.n_source if previous is not None else 0),
+                    last_time=AppendState.time_of(new_data),
+                    last_title=title[-1] if isinstance(title, (list, tuple)) else title,
+                    video=AppendState.describe_video(**video),
+                )
+                last_frame = np.asarray(data[-1])
+            animation = self
+            if reduce is not None:
+                animation, data = self._reduce_grid(data, figsize, dpi, reduce)
+            with ExitStack() as stack:
+                output = path
+                if previous is not None:
+                    tempdir = stack.enter_context(TemporaryDirectory(dir=Path(path).parent, prefix=".mapflow-append-"))
+                    output = Path(tempdir) / f"segment{Path(path).suffix}"
+                animation._animate(
+                    data=data,
+                    path=output,
+                    figsize=figsize,
+                    title=title,
+                    fps=fps,
+                    upsample_ratio=upsample_ratio,
+                    cmap=cmap,
+                    norm=norm,
+                    label=label,
+                    dpi=dpi,
+                    pad_inches=pad_inches,
+                    n_jobs=n_jobs,
+                    timeout=timeout,
+                    diff=diff,
+                    crf=crf,
+                    video_width=video_width,
+                    fixed_frame=fixed_frame,
+                    engine=engine,
+                    pipe=pipe,
+                    chunksize=chunksize,
+                    max_inflight=max_inflight,
+                    prefetch=prefetch,
+                    backend=backend,
+                    worker_interpolation=worker_interpolation,
+                    transport=transport,
+                    workdir=workdir,
+                    segment_frames=segment_frames,
+                    encoders=encoders,
+                    skip_frames=0 if previous is None else 1,
+                )
+                if previous is not None:
+                    with timed_encoding():
+                        self._concat_videos([path, output], path, self._resolve_timeout(timeout, len(data)))
+            if append:
+                next_state.save(path, last_frame)
+        return report
 
-        fps, upsample_ratio = self._calculate_animation_parameters(len(data), fps, upsample_ratio, duration)
-        figsize, fixed_frame = self._resolve_figsize(
-            figsize,
-            dpi,
-            video_width,
-            self.plot.x,
-            self.plot.y,
-            self.plot.aspect,
-        )
+    @staticmethod
+    def _appended(state, last_frame, data, title):
+        """Returns the source frames and titles to render to append ``data`` to a video, and the new time steps.
 
-        if isinstance(data, np.ndarray):
-            norm = self.plot._norm(data, vmin, vmax, qmin, qmax, norm, log, diff)
-        else:
-            norm = self.plot._norm_streaming(self._iter_raw_frames(data), vmin, vmax, qmin, qmax, norm, log, diff)
-        self._animate(
-            data=data,
-            path=path,
-            frame_generator=self._generate_frame,
-            figsize=figsize,
+        The frames start with the last source frame of the video, which the
+        first new frames are interpolated from. Time steps of ``data`` already
+        in the video are dropped, if ``data`` has a time coordinate.
+        """
+        mask = state.new_steps(data)
+        if mask is not None:
+            data = data[mask]
+            if isinstance(title, (list, tuple)):
+                title = [t for t, new in zip(title, mask, strict=True) if new]
+        if isinstance(title, (list, tuple)):
+            title = [state.last_title or "", *title]
+        frames = np.concatenate([last_frame[None], np.asarray(data, dtype=last_frame.dtype)])
+        return frames, title, data
+
+    async def render_in_executor(self, data, path, *, executor=None, **kwargs):
+        """Awaits :meth:`__call__` run on a thread of ``executor``, for use inside asyncio applications.
+
+        This is a thread offload with cancellation: the whole animation,
+        including the reading, interpolation and dispatch of the frames and
+        the wait for the workers, runs on one thread of ``executor`` until it
+        is done, so at most as many animations as ``executor`` has threads
+        run at once, the others waiting for a free thread. The event loop
+        is not blocked meanwhile, and the final FFmpeg encoding runs as an
+        asyncio subprocess of the loop. Cancelling the awaiting task makes the
+        run stop at its next check (at least every 0.1 s), which terminates
+        the worker pool and kills the FFmpeg processes, streaming and segment
+        encoders included, and removes the temporary files before the
+        cancellation propagates. The dask backend is only cancelled once its
+        computation returns.
+
+        Args:
+            data (np.ndarray | xr.DataArray): See :meth:`__call__`.
+            path (str | Path): See :meth:`__call__`.
+            executor (concurrent.futures.Executor, optional): Executor whose
+                threads run the animations, one thread per animation for the
+                whole run. Defaults to None (the default executor of the event
+                loop).
+            **kwargs: Keyword arguments of :meth:`__call__`.
+
+        Returns:
+            AnimationReport | None: The report of the run if ``report``, else None.
+
+        .. code-block:: python
+
+            report = await animation.render_in_executor(da, "animation.mp4", report=True)
+
+        """
+        return await run_in_executor(self, data, path, executor=executor, **kwargs)
+
+    def _reduce_grid(self, data, figsize, dpi, how):
+        """Returns the animation and the data reduced to about one grid cell per output pixel.
+
+        Dask-backed DataArrays are reduced lazily with xarray (``isel`` or
+        ``coarsen``), other data through :class:`ReducedFrames`.
+        """
+        if figsize is None:
+            figsize = matplotlib.rcParams["figure.figsize"]
+        factors = reduction_factors(data.shape[1:], figsize, dpi)
+        if factors == (1, 1):
+            return self, data
+        animation = copy(self)
+        animation.plot = self.plot._reduced(factors, how)
+        if isinstance(data, xr.DataArray) and is_dask_backed(data):
+            y_dim, x_dim = data.dims[1:]
+            fy, fx = factors
+            if how == "nearest":
+                return animation, data.isel({y_dim: slice(fy // 2, None, fy), x_dim: slice(fx // 2, None, fx)})
+            coarse = data.coarsen({y_dim: fy, x_dim: fx}, boundary="pad")
+            return animation, getattr(coarse, how)()
+        return animation, ReducedFrames(data, factors, how, self._time_blocks(data))
+
+    @staticmethod
+    def _n_frames_raw(data):
+        return len(data)
+
+    def _iter_frames(self, data, upsample_ratio, prefetch=0, ring=None):
+        """Yields the frames handed to :meth:`_make_renderer` and :meth:`FrameRenderer.update`."""
+        return self._iter_upsampled_frames(data, ratio=upsample_ratio, prefetch=prefetch, ring=ring)
+
+    def _iter_source_frames(self, data, prefetch=0):
+        """Yields the source frames of ``data``, before interpolation."""
+        return self._iter_raw_frames(data, prefetch=prefetch)
+
+    @staticmethod
+    def _stack_frames(frames):
+        """Stacks source frames into the data handed to :meth:`_iter_frames`."""
+        return np.stack(frames)
+
+    def _iter_source_runs(self, data, upsample_ratio, run_length, prefetch=0):
+        """Yields ``(start, source, last)`` tasks for :meth:`RenderJob.render_run`.
+
+        Each task holds ``run_length + 1`` consecutive source frames (fewer
+        for the last one), the last of which starts the next run, so that
+        each source frame is sent about once to the workers.
+        """
+        frames = self._iter_source_frames(data, prefetch)
+        run, start = [next(frames)], 0
+        for frame in frames:
+            run.append(frame)
+            if len(run) == run_length + 1:
+                yield start, self._stack_frames(run), False
+                run, start = [frame], start + run_length * upsample_ratio
+        yield start, self._stack_frames(run), True
+
+    def _time_chunks(self, data):
+        """Returns the ``(start, stop)`` bounds of the time chunks rendered by one dask task each."""
+        return self._time_blocks(data)
+
+    @staticmethod
+    def _slice_frames(data, start, stop):
+        """Returns the source frames ``start:stop`` of ``data``, as a dask array for dask-backed data."""
+        return getattr(data, "data", data)[start:stop]
+
+    def _make_renderer(self, frame, title, settings):
+        renderer = CompositeRenderer if settings["engine"] == "numpy" else FrameRenderer
+        return renderer(
+            self.plot,
+            frame,
+            figsize=settings["figsize"],
+            dpi=settings["dpi"],
+            cmap=settings["cmap"],
+            norm=settings["norm"],
+            label=settings["label"],
             title=title,
-            fps=fps,
-            upsample_ratio=upsample_ratio,
-            cmap=cmap,
-            norm=norm,
-            label=label,
-            dpi=dpi,
-            pad_inches=pad_inches,
-            n_jobs=n_jobs,
-            timeout=timeout,
-            diff=diff,
-            crf=crf,
-            video_width=video_width,
-            fixed_frame=fixed_frame,
         )
 
+    @staticmethod
+    def _resolve_timeout(timeout, data_len):
+        if timeout == "auto":
+            return max(20.0, 0.1 * data_len)
+        elif isinstance(timeout, (int, float)):
+            return timeout
+        raise ValueError("timeout must be 'auto' or a numeric value.")
+
     def _animate(
         self,
         data,
         path,
-        frame_generator,
         figsize: tuple[float, float] | None = None,
         title: str | list[str] | tuple[str, ...] | None = None,
         fps: int = 24,
@@ -688,75 +1381,293 @@ class Animation:
         crf=20,
         video_width: int | None = None,
         fixed_frame: bool = False,
+        engine: str = "persistent",
+        pipe: bool = False,
+        chunksize: int = 1,
+        max_inflight: int | None = None,
+        prefetch: int = 0,
+        backend: str = "pool",
+        worker_interpolation: bool = False,
+        transport: str = "pickle",
+        workdir: str | Path | None = None,
+        segment_frames: int | None = None,
+        encoders: int | None = None,
+        skip_frames: int = 0,
+        **kwargs,
     ):
         self._require_ffmpeg()
-        titles = self._process_title(title, upsample_ratio)
-        n_raw = len(data)
+        n_raw = self._n_frames_raw(data)
         data_len = (n_raw - 1) * upsample_ratio + 1 if n_raw > 1 else 1
-
-        with TemporaryDirectory() as tempdir:
-            # Generator consumed lazily by pool.imap: frames are interpolated
-            # and dispatched to workers on the fly, never all held in memory.
-            args = (
-                (
-                    frame,
-                    Path(tempdir) / f"frame_{k:08d}.png",
-                    figsize,
-                    titles[k] if titles and k < len(titles) else None,
-                    cmap,
-                    norm,
-                    label,
-                    dpi,
-                    pad_inches,
-                    fixed_frame,
-                    {"diff": diff},
-                )
-                for k, frame in enumerate(self._iter_upsampled_frames(data, ratio=upsample_ratio))
+        titles = self._process_title(title, upsample_ratio, data_len)
+        timeout_seconds = self._resolve_timeout(timeout, data_len)
+        settings = {
+            **kwargs,
+            "figsize": figsize,
+            "titles": titles,
+            "cmap": cmap,
+            "norm": norm,
+            "label": label,
+            "dpi": dpi,
+            "pad_inches": pad_inches,
+            "engine": engine,
+            "upsample_ratio": upsample_ratio,
+            "frame_dir": None,
+            "frame_box": None,
+            "report": current_report() is not None,
+        }
+        report = current_report()
+        if report is not None:
+            report.n_frames = data_len - skip_frames
+        cpu_total = cpu_count() or 1
+        default_jobs = max(1, int((2 * cpu_total) / 3))
+        n_jobs = default_jobs if n_jobs is None else n_jobs
+        max_inflight = 2 * n_jobs * chunksize if max_inflight is None else max_inflight
+        frames = None
+        # _imap_bounded keeps at most max(max_inflight, chunksize) frames submitted and not rendered, and
+        # pulls the next chunk before submitting it: frame k + ring_size is only written once frame k is rendered.
+        ring_size = max(max_inflight, chunksize) + chunksize
+        if backend == "pool" and not worker_interpolation:
+            # Frames are pickled to the workers by the pool's task thread, so
+            # the interpolation ring must outlive every frame in flight, unless
+            # they are copied to shared memory as soon as they are pulled.
+            ring = 1 if transport == "shm" else ring_size
+            frames = timed_iter("interpolate", self._iter_frames(data, upsample_ratio, prefetch, ring=ring))
+
+        if pipe or engine == "numpy":
+            # Every frame must have the same size: the tight bounding box is
+            # computed once from the first frame and the longest title.
+            if frames is None:
+                first = next(self._iter_frames(data, 1))
+            else:
+                first = next(frames)
+                frames = chain([first], frames)
+            longest = max(titles, key=len) if titles else None
+            with timed_stage("layout"):
+                settings["frame_box"] = self._make_renderer(first, longest, settings).frame_box(dpi, pad_inches)
+
+        encoding = {"timeout": timeout_seconds, "crf": crf, "video_width": video_width}
+        if skip_frames:
+            # The leading frames are rendered, as the next ones may be
+            # interpolated from them, but left out of the video.
+            encoding["start_number"] = skip_frames
+
+        def segment_encoder(tempdir):
+            # Each segment has its own time limit, and the encoder threads are
+            # shared between the concurrent FFmpeg processes.
+            if segment_frames is None:
+                return None
+            n_encoders = max(1, cpu_total // 4) if encoders is None else encoders
+            return SegmentEncoder(
+                type(self),
+                tempdir,
+                path,
+                fps,
+                n_frames=data_len,
+                segment_frames=segment_frames,
+                timeout=self._resolve_timeout(timeout, segment_frames),
+                encoders=n_encoders,
+                start=skip_frames,
+                crf=crf,
+                video_width=video_width,
+                threads=max(1, cpu_total // n_encoders),
             )
 
-            cpu_total = cpu_count() or 1
-            default_jobs = max(1, int((2 * cpu_total) / 3))
-            n_jobs = default_jobs if n_jobs is None else n_jobs
-            with Pool(processes=n_jobs) as pool:
-                list(
-                    tqdm(
-                        pool.imap(frame_generator, args),
-                        total=data_len,
-                        disable=(not self.verbose),
-                        desc="Frames generation",
-                        leave=False,
-                    )
+        if backend == "dask":
+            if report is not None:
+                report.bytes_to_workers = None
+            with TemporaryDirectory() as tempdir:
+                settings["frame_dir"] = tempdir
+                dask_render(self, data, settings, report=report)
+                self._encode_frames(tempdir, path, fps, encoder=segment_encoder(tempdir), **encoding)
+            return
+
+        store = None
+
+        def render(stack):
+            # Generators consumed lazily by _imap_bounded: frames are read,
+            # interpolated and dispatched to workers on the fly, and at most
+            # max_inflight of them are held in memory. Tasks only carry the
+            # frame index and data (or shared memory slot), the constant state
+            # reaches each worker once through the pool initializer.
+            nonlocal frames
+            animation, ring = self, None
+            if transport == "shm":
+                first = next(frames)
+                frames = chain([first], frames)
+                animation, ring = stack.enter_context(self._shared_memory(first, n_slots=ring_size))
+            pool = stack.enter_context(animation._pool(n_jobs, settings, frames=ring))
+            if worker_interpolation:
+                runs = self._iter_source_runs(data, upsample_ratio, chunksize, prefetch)
+                results = self._imap_bounded(pool, render_run_task, self._sent(runs), max(1, max_inflight // chunksize))
+                return chain.from_iterable(self._dispatched(results))
+            tasks = self._sent(enumerate(frames) if store is None else store.missing(frames, titles))
+            if ring is not None:
+                # Slots follow the dispatch order, frames skipped by the store leave no gap.
+                tasks = ((k, ring.put(i, frame), *name) for i, (k, frame, *name) in enumerate(tasks))
+                return self._dispatched(self._imap_bounded(pool, render_slot_task, tasks, max_inflight, chunksize))
+            return self._dispatched(self._imap_bounded(pool, render_task, tasks, max_inflight, chunksize))
+
+        if workdir is not None:
+            store = FrameStore(workdir, FrameStore.render_key(self, settings))
+            settings["frame_dir"] = str(store.frames)
+            with ExitStack() as stack:
+                list(self._progress(render(stack), data_len))
+            with store.sequence(store.names) as tempdir:
+                self._encode_frames(tempdir, path, fps, encoder=segment_encoder(tempdir), **encoding)
+            return
+
+        if pipe:
+            left, top, right, bottom = settings["frame_box"]
+            with ExitStack() as stack, timed_encoding():
+                self._stream_video(
+                    islice(self._progress(render(stack), data_len), skip_frames, None),
+                    path,
+                    fps,
+                    frame_size=(right - left, bottom - top),
+                    timeout=timeout_seconds,
+                    crf=crf,
+                    video_width=video_width,
                 )
+            return
 
-            if timeout == "auto":
-                timeout_seconds = max(20.0, 0.1 * data_len)
-            elif isinstance(timeout, (int, float)):
-                timeout_seconds = timeout
+        with TemporaryDirectory() as tempdir:
+            settings["frame_dir"] = tempdir
+            encoder = segment_encoder(tempdir)
+            try:
+                with ExitStack() as stack:
+                    # Frames are returned in order: each segment is encoded as
+                    # soon as its last frame is rendered.
+                    for n_ready, _ in enumerate(self._progress(render(stack), data_len), 1):
+                        if encoder is not None:
+                            encoder.ready(n_ready)
+                self._encode_frames(tempdir, path, fps, encoder=encoder, **encoding)
+            finally:
+                if encoder is not None:
+                    encoder.close()
+
+    def _encode_frames(self, tempdir, path, fps, encoder=None, **kwargs):
+        """Encodes the PNG frames of ``tempdir``, reporting the temporary disk usage.
+
+        The frames are encoded with :meth:`_create_video`, or by finishing the
+        :class:`SegmentEncoder` ``encoder`` if given.
+        """
+        report = current_report()
+        if report is not None:
+            report.add_temp_files(tempdir)
+        with timed_encoding():
+            if encoder is None:
+                self._create_video(tempdir, path, fps, **kwargs)
             else:
-                raise ValueError("timeout must be 'auto' or a numeric value.")
-            self._create_video(tempdir, path, fps, timeout=timeout_seconds, crf=crf, video_width=video_width)
-
-    def _generate_frame(self, args):
-        """Generates a frame and saves it as a PNG."""
-        data_frame, frame_path, figsize, title, cmap, norm, label, dpi, pad_inches, _fixed_frame, kwargs = args
-        self.plot(
-            data=data_frame,
-            figsize=figsize,
-            title=title,
-            show=False,
-            cmap=cmap,
-            norm=norm,
-            label=label,
-            **kwargs,
-        )
-        bbox = "tight"
-        pad = pad_inches
-        plt.savefig(frame_path, dpi=dpi, bbox_inches=bbox, pad_inches=pad)
-        plt.clf()
-        plt.close()
+                encoder.finish()
+
+    @staticmethod
+    def _sent(tasks):
+        """Counts the frame data of ``tasks`` in the active report, if any."""
+        report = current_report()
+        return tasks if report is None else report.sent(tasks)
 
     @staticmethod
-    def _build_ffmpeg_cmd(tempdir, path, fps, crf=20, video_width: int | None = None):
+    def _dispatched(results):
+        """Times the wait for the workers and collects their timings in the active report, if any."""
+        report = current_report()
+        if report is None:
+            return results
+        return timed_iter("dispatch", report.collect(results))
+
+    @contextmanager
+    def _shared_memory(self, first, n_slots):
+        """Sets up the shared memory transport of the frames to the workers.
+
+        Yields a copy of the animation whose coordinates are pickled as
+        shared memory handles, so that workers attach to them instead of each
+        receiving a copy, and the :class:`SharedFrameRing` of ``n_slots``
+        frames shaped like ``first``. The memory is freed on exit.
+        """
+        ring = SharedFrameRing(first, n_slots)
+        coords = [SharedArray.from_array(self.plot.x), SharedArray.from_array(self.plot.y)]
+        animation, animation.plot = copy(self), copy(self.plot)
+        animation.plot._shared_coords = coords
+        try:
+            yield animation, ring
+        finally:
+            ring.close()
+            for shared in coords:
+                shared.close()
+
+    def _pool(self, n_jobs, settings, frames=None):
+        """Creates the worker pool, handing the render job to each worker once.
+
+        With the "fork" start method, the job is inherited by the workers
+        without being pickled at all. Within :func:`animate_batch`, returns a
+        view of the pool shared by the animations of the batch instead.
+        """
+        job = RenderJob(self, settings, frames)
+        batch = current_batch()
+        if batch is not None:
+            return batch.job(job)
+        return Pool(processes=n_jobs, initializer=init_worker, initargs=(job,))
+
+    @staticmethod
+    def _imap_bounded(pool, func, iterable, max_inflight, chunksize=1):
+        """Ordered equivalent of ``pool.imap`` with backpressure.
+
+        ``Pool.imap`` drains its input in a feeder thread as fast as it can,
+        which would load and queue every frame long before the workers are
+        done. Here tasks are only pulled from ``iterable`` while fewer than
+        ``max_inflight`` of them are waiting for their result, so memory
+        stays bounded by the window whatever the length of the animation.
+
+        Args:
+            pool (multiprocessing.pool.Pool): Worker pool.
+            func (Callable): Picklable function applied to each task.
+            iterable (Iterable): Tasks, consumed lazily.
+            max_inflight (int): Maximum number of tasks submitted and not yet
+                returned. At least one chunk is always in flight.
+            chunksize (int, optional): Number of tasks sent to a worker at once.
+                Defaults to 1.
+
+        Yields:
+            The results of ``func``, in the order of ``iterable``.
+        """
+        iterator = iter(iterable)
+        max_chunks = max(1, max_inflight // chunksize)
+        pending = deque()
+        while True:
+            while len(pending) < max_chunks:
+                chunk = list(islice(iterator, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.map_async(func, chunk, chunksize=len(chunk)))
+            if not pending:
+                return
+            yield from wait_result(pending.popleft())
+
+    def _progress(self, iterable, total):
+        return tqdm(iterable, total=total, disable=(not self.verbose), desc="Frames generation", leave=False)
+
+    @staticmethod
+    def _build_ffmpeg_cmd(
+        tempdir,
+        path,
+        fps,
+        crf=20,
+        video_width: int | None = None,
+        frame_size=None,
+        start_number: int = 0,
+        n_frames: int | None = None,
+        threads: int | None = None,
+        output_size=None,
+        gop: int | None = None,
+    ):
+        """Builds the FFmpeg command encoding the frames to ``path``.
+
+        Frames are read from the PNG sequence in ``tempdir``, starting at
+        ``start_number`` and limited to ``n_frames`` frames if given, or, when
+        ``frame_size`` (width, height) is given, as raw RGB frames from stdin.
+        ``threads`` limits the encoder threads. ``output_size`` (even width,
+        height) scales every frame to that size instead of deriving it from
+        ``video_width`` and the input, and ``gop`` sets the keyframe interval.
+        """
         path = Path(path)
         suffix = path.suffix.lower()
         if suffix not in (".avi", ".mkv", ".mov", ".mp4"):
@@ -772,16 +1683,29 @@ class Animation:
             scale_filter = f"scale={target_width}:-2"
         else:
             scale_filter = "scale='if(mod(iw,2),iw+1,iw)':'if(mod(ih,2),ih+1,ih)'"
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-f",
-            "image2",
-            "-framerate",
-            str(fps),
-            "-i",
-            str(Path(tempdir) / "frame_%08d.png"),
-        ]
+        if output_size is not None:
+            scale_filter = "scale={}:{}".format(*output_size)
+        if frame_size is None:
+            cmd = ["ffmpeg", "-y", "-f", "image2", "-framerate", str(fps)]
+            if start_number:
+                cmd.extend(["-start_number", str(start_number)])
+            cmd.extend(["-i", str(Path(tempdir) / "frame_%08d.png")])
+        else:
+            width, height = frame_size
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-f",
+                "rawvideo",
+                "-pix_fmt",
+                "rgb24",
+                "-s",
+                f"{width}x{height}",
+                "-framerate",
+                str(fps),
+                "-i",
+                "-",
+            ]
         if suffix in (".mkv", ".mov", ".mp4"):
             cmd.extend(
                 [
@@ -797,20 +1721,59 @@ class Animation:
                     scale_filter,  # Force dimensions paires
                 ]
             )
-            if suffix == ".mp4":
-                cmd.extend(["-movflags", "+faststart"])  # Optimisation streaming web
+            cmd.extend(Animation._container_flags(path))
         elif suffix == ".avi":
             cmd.extend(["-vcodec", "mpeg4", "-q:v", "5"])
-            if video_width is not None:
+            if video_width is not None or output_size is not None:
                 cmd.extend(["-vf", scale_filter])
+        if gop is not None:
+            cmd.extend(["-g", str(gop), "-keyint_min", str(gop)])
+        if n_frames is not None:
+            cmd.extend(["-frames:v", str(n_frames)])
+        if threads is not None:
+            cmd.extend(["-threads", str(threads)])
         cmd.append(str(path))
         return cmd
 
     @staticmethod
-    def _create_video(tempdir, path, fps, timeout, crf=20, video_width: int | None = None):
-        cmd = Animation._build_ffmpeg_cmd(tempdir, path, fps, crf=crf, video_width=video_width)
+    def _container_flags(path):
+        if Path(path).suffix.lower() == ".mp4":
+            return ["-movflags", "+faststart"]  # Optimisation streaming web
+        return []
+
+    @staticmethod
+    def _build_concat_cmd(listing, path):
+        """Builds the FFmpeg command concatenating the videos listed in ``listing`` to ``path``, without re-encoding."""
+        cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", str(listing), "-c", "copy"]
+        return [*cmd, *Animation._container_flags(path), str(path)]
+
+    @staticmethod
+    def _concat_videos(paths, path, timeout):
+        """Concatenates the videos ``paths``, encoded with the same settings, and replaces ``path`` with the result."""
+        path = Path(path)
+        with TemporaryDirectory(dir=path.parent, prefix=".mapflow-concat-") as tempdir:
+            listing = Path(tempdir) / "inputs.txt"
+            quoted = (str(Path(p).resolve()).replace("'", "'\\''") for p in paths)
+            listing.write_text("".join(f"file '{p}'\n" for p in quoted))
+            joined = Path(tempdir) / f"joined{path.suffix}"
+            Animation._run_ffmpeg(Animation._build_concat_cmd(listing, joined), timeout)
+            joined.replace(path)
+
+    @staticmethod
+    def _create_video(tempdir, path, fps, timeout, crf=20, video_width: int | None = None, start_number: int = 0):
+        cmd = Animation._build_ffmpeg_cmd(
+            tempdir, path, fps, crf=crf, video_width=video_width, start_number=start_number
+        )
+        Animation._run_ffmpeg(cmd, timeout)
+
+    @staticmethod
+    def _run_ffmpeg(cmd, timeout):
+        runner = current_runner()
         try:
-            result = subprocess.run(cmd, check=True, text=True, capture_output=True, timeout=timeout)
+            if runner is None:
+                result = subprocess.run(cmd, check=True, text=True, capture_output=True, timeout=timeout)
+            else:
+                result = runner.run_ffmpeg(cmd, timeout)
             if result.stdout:
                 print(result.stdout)
         except subprocess.CalledProcessError as e:
@@ -823,6 +1786,44 @@ class Animation:
             print(f"Video creation timed out after {timeout} seconds")
             raise
 
+    @staticmethod
+    def _stream_video(frames, path, fps, frame_size, timeout, crf=20, video_width: int | None = None):
+        """Encodes raw RGB frames with FFmpeg as they are produced.
+
+        Frames are written in order to the stdin of a single FFmpeg process,
+        so encoding overlaps with rendering. ``timeout`` applies to the
+        encoding left once the last frame has been written.
+        """
+        cmd = Animation._build_ffmpeg_cmd(None, path, fps, crf=crf, video_width=video_width, frame_size=frame_size)
+        with TemporaryFile() as stderr:
+            process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=stderr)
+            try:
+                try:
+                    for frame in frames:
+                        process.stdin.write(frame)
+                except BrokenPipeError:
+                    pass  # FFmpeg exited early, its error is reported below.
+                finally:
+                    with suppress(BrokenPipeError):
+                        process.stdin.close()
+                returncode = wait_process(process, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                print(f"Video creation timed out after {timeout} seconds")
+                raise
+            except BaseException:
+                process.kill()
+                process.wait()
+                raise
+            if returncode:
+                stderr.seek(0)
+                error = subprocess.CalledProcessError(returncode, cmd, stderr=stderr.read().decode(errors="replace"))
+                print(f"Error during video creation: {error}")
+                print(f"Command: {' '.join(cmd)}")
+                print(f"Standard error: {error.stderr}")
+                raise error
+
 
 def animate(
     da: xr.DataArray,
@@ -832,7 +1833,7 @@ def animate(
     x_name: str | None = None,
     y_name: str | None = None,
     crs=None,
-    borders: gpd.GeoDataFrame | gpd.GeoSeries | None = None,
+    borders: "gpd.GeoDataFrame | gpd.GeoSeries | None" = None,
     verbose: int = 0,
     diff=False,
     fps: int | None = None,
@@ -853,7 +1854,8 @@ def animate(
             2D inputs are not supported. Lazily-backed DataArrays (netCDF/zarr stores, dask) are streamed
             one time step at a time: the full dataset is never loaded in memory. Note that when relying on
             quantile-based color scaling (no ``vmin``/``vmax``/``norm`` given), an extra streaming pass over
-            the data is required to compute the color range.
+            the data is required to compute the color range, which matches the exact global quantiles
+            within a relative error of 1e-4.
         path (str): Output path for the video file. Supported formats are avi, mkv,
             mov, and mp4.
         time_name (str, optional): Name of the time coordinate in `da`. If None,
@@ -890,7 +1892,24 @@ def animate(
             - `dpi` (int, optional): Dots per inch for the saved frames.
             - `timeout` (str | int, optional): Timeout for video creation.
             - `crf` (int, optional): Constant Rate Factor for video encoding. Lower values mean better quality.
-
+            - `engine` (str, optional): Frame rendering engine, "persistent" (default), "rebuild" or "numpy".
+            - `pipe` (bool, optional): Stream raw frames to FFmpeg instead of writing PNG files.
+            - `chunksize` (int, optional): Number of frames sent to a worker at once.
+            - `max_inflight` (int, optional): Maximum number of frames dispatched and not rendered yet.
+            - `norm_cache` (str | Path, optional): Directory caching the color scale statistics across runs.
+            - `prefetch` (int, optional): Number of frames of lazily-backed data read ahead in the background.
+            - `backend` (str, optional): "pool" (default) or "dask" to compute and render on the dask scheduler.
+            - `worker_interpolation` (bool, optional): Interpolate frames in the workers from runs of source frames.
+            - `transport` (str, optional): "pickle" (default) or "shm" to send frames through shared memory.
+            - `reduce` (str, optional): "mean", "max" or "nearest" to reduce grids finer than the output pixels.
+            - `workdir` (str | Path, optional): Persistent frame directory, to resume runs and re-encode only.
+            - `append` (bool, optional): Append the new time steps of ``da`` to the video at ``path``.
+            - `segment_frames` (int, optional): Encode segments of that many frames in parallel while rendering.
+            - `encoders` (int, optional): Maximum number of segments encoded at once.
+            - `report` (bool, optional): Return an :class:`AnimationReport` with the timings of the run.
+
+    Returns:
+        AnimationReport | None: The report of the run if ``report=True``, else None.
 
     .. code-block:: python
 
@@ -909,7 +1928,8 @@ def animate(
 
     da, crs_ = check_da(da, actual_time_name, actual_x_name, actual_y_name, crs)
 
-    animation = Animation(
+    batch = current_batch()
+    animation = (Animation if batch is None else partial(batch.animation, Animation))(
         x=da[actual_x_name].values,
         y=da[actual_y_name].values,
         crs=crs_,
@@ -923,7 +1943,7 @@ def animate(
     time = da[actual_time_name].dt.strftime(time_format).values
     field = da.name or da.attrs.get("long_name")
     titles = [f"{field} - {t}" for t in time]
-    animation(
+    return animation(
         data=da,
         path=output_path,
         title=titles,
@@ -936,3 +1956,32 @@ def animate(
         pad_inches=pad_inches,
         **kwargs,
     )
+
+
+async def animate_in_executor(da: xr.DataArray, path: str, *, executor=None, **kwargs):
+    """Awaits :func:`animate` run on a thread of ``executor``, for use inside asyncio applications.
+
+    The animation holds a thread of ``executor`` for its whole run; see
+    :meth:`Animation.render_in_executor` for the execution and the
+    cancellation of the animation.
+
+    Args:
+        da (xr.DataArray): See :func:`animate`.
+        path (str): See :func:`animate`.
+        executor (concurrent.futures.Executor, optional): Executor whose threads
+            run the animations. Defaults to None (the default executor of the
+            event loop).
+        **kwargs: Keyword arguments of :func:`animate`.
+
+    Returns:
+        AnimationReport | None: The report of the run if ``report=True``, else None.
+
+    .. code-block:: python
+
+        from mapflow import animate_in_executor
+
+        async def handler(request):
+            await animate_in_executor(da, "animation.mp4")
+
+    """
+    return await run_in_executor(animate, da, path, executor=executor, **kwargs)
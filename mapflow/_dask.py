@@ -0,0 +1,109 @@
+from ._render import RenderJob
+from ._sketch import QuantileSketch
+
+_MERGE_FAN_IN = 8
+
+
+def require_dask():
+    """Imports dask, with an actionable error if it is not installed."""
+    try:
+        import dask
+    except ImportError as exc:
+        raise ImportError("backend='dask' requires dask. Install it with `pip install dask`.") from exc
+    return dask
+
+
+def is_dask_backed(data):
+    """Whether ``data`` is a dask array or a DataArray backed by one."""
+    data = getattr(data, "data", data)
+    return hasattr(data, "dask") and hasattr(data, "to_delayed")
+
+
+def _sketch_block(block):
+    return QuantileSketch().update(block)
+
+
+def _merge_sketches(sketches):
+    merged = QuantileSketch()
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+def dask_sketch(data):
+    """Computes the :class:`QuantileSketch` of a dask-backed array as a parallel reduction.
+
+    One sketch is built per chunk where the chunk is loaded, and the sketches
+    are merged along a tree, on the current dask scheduler.
+
+    Args:
+        data (xr.DataArray | dask.array.Array): Dask-backed data.
+
+    Returns:
+        QuantileSketch: Sketch of all the values of ``data``.
+    """
+    dask = require_dask()
+    blocks = getattr(data, "data", data).to_delayed().ravel()
+    sketches = [dask.delayed(_sketch_block)(block) for block in blocks]
+    while len(sketches) > 1:
+        sketches = [
+            dask.delayed(_merge_sketches)(sketches[k : k + _MERGE_FAN_IN])
+            for k in range(0, len(sketches), _MERGE_FAN_IN)
+        ]
+    (sketch,) = dask.compute(sketches[0])
+    return sketch
+
+
+def _render_block(animation, settings, block, start, last):
+    """Renders the frames of the source frames ``block``, see :meth:`RenderJob.render_run`.
+
+    ``block`` holds the source frames ``start`` onwards and, unless ``last``,
+    the first source frame of the next block, whose frame is rendered by the
+    next block.
+
+    Returns:
+        int: Number of frames rendered, paired with the timings of the task
+        if the run is reported (see :meth:`RenderJob.collect`).
+    """
+    job = RenderJob(animation, settings)
+    return job.collect(len(job.render_run(start * settings["upsample_ratio"], block, last)))
+
+
+def dask_render(animation, data, settings, report=None):
+    """Renders the frames of dask-backed ``data`` with one task per time chunk.
+
+    Each task loads its chunk (plus the first source frame of the next one,
+    for the interpolation across the boundary), interpolates and renders its
+    frames as PNG files in ``settings["frame_dir"]``, which must be reachable
+    by every dask worker. Tasks run on the current dask scheduler and frames
+    never go through the parent process. Each task builds its own renderer,
+    so a process-based or distributed scheduler is preferable: matplotlib
+    rendering holds the GIL.
+
+    Args:
+        animation (Animation): Animation providing the frame hooks.
+        data: Dask-backed data, as handed to ``Animation._animate``.
+        settings (dict): Render settings, see :class:`RenderJob`.
+        report (AnimationReport, optional): Report the timings of the tasks
+            are added to, if ``settings["report"]``. Defaults to None.
+
+    Returns:
+        int: Number of frames rendered.
+    """
+    dask = require_dask()
+    n_raw = animation._n_frames_raw(data)
+    # Single graph keys, so the plot model and settings are shipped once per worker.
+    shared_animation = dask.delayed(animation, traverse=False)
+    shared_settings = dask.delayed(settings, traverse=False)
+    tasks = []
+    for start, stop in animation._time_chunks(data):
+        last = stop == n_raw
+        block = animation._slice_frames(data, start, stop if last else stop + 1)
+        task = dask.delayed(_render_block)(shared_animation, shared_settings, block, start, last)
+        tasks.append(task)
+    results = dask.compute(*tasks)
+    if settings.get("report"):
+        for _, (pid, stages) in results:
+            report.add_worker(pid, stages)
+        results = [n for n, _ in results]
+    return sum(results)
@@ -1,16 +1,13 @@
-from multiprocessing import Pool
-from os import cpu_count
+from functools import partial
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import geopandas as gpd
-import matplotlib.pyplot as plt
 import numpy as np
 import xarray as xr
-from tqdm.auto import tqdm
 
+from ._batch import current_batch
 from ._classic import Animation, PlotModel
+from ._dask import dask_sketch
 from ._misc import (
     TIME_NAME_CANDIDATES,
     X_NAME_CANDIDATES,
@@ -19,6 +16,11 @@ from ._misc import (
     guess_coord_name,
     process_crs,
 )
+from ._render import QuiverFrameRenderer
+from ._report import AnimationReport, reporting, timed_stage
+
+if TYPE_CHECKING:
+    import geopandas as gpd
 
 
 def plot_da_quiver(
@@ -116,6 +118,8 @@ def plot_da_quiver(
 
     if arrows_kwgs is None:
         arrows_kwgs = {}
+    import matplotlib.pyplot as plt
+
     plt.quiver(x, y, u_subsampled, v_subsampled, **arrows_kwgs)
     if show:
         plt.show()
@@ -147,6 +151,19 @@ class QuiverAnimation(Animation):
         video_width: int | None = None,
         n_jobs: int | None = None,
         timeout: int | str = "auto",
+        engine: str = "persistent",
+        pipe: bool = False,
+        chunksize: int = 1,
+        max_inflight: int | None = None,
+        norm_cache: str | Path | None = None,
+        prefetch: int = 2,
+        backend: str = "pool",
+        worker_interpolation: bool = False,
+        transport: str = "pickle",
+        workdir: str | Path | None = None,
+        segment_frames: int | None = None,
+        encoders: int | None = None,
+        report: bool = False,
         **kwargs,
     ):
         """Generates a quiver animation from two 3D data arrays.
@@ -176,170 +193,151 @@ class QuiverAnimation(Animation):
             video_width (int, optional): Target output video width in pixels.
             n_jobs (int, optional): Number of parallel jobs for frame generation.
             timeout (int | str, optional): Timeout for the ffmpeg command. Defaults to "auto".
+            engine (str, optional): Frame rendering engine, "persistent" or "rebuild".
+                See :meth:`Animation.__call__`. Defaults to "persistent".
+            pipe (bool, optional): Whether to stream raw frames to FFmpeg instead of
+                writing PNG files. See :meth:`Animation.__call__`. Defaults to False.
+            chunksize (int, optional): Number of frames sent to a worker at once.
+                Defaults to 1.
+            max_inflight (int, optional): Maximum number of frames dispatched to the
+                workers and not rendered yet. Defaults to ``2 * n_jobs * chunksize``.
+            norm_cache (str | Path, optional): Directory where the distribution of the
+                vector magnitude is cached for quantile-based color scaling. See
+                :meth:`Animation.__call__`. Defaults to None.
+            prefetch (int, optional): Number of frames of lazily-backed data read ahead
+                by background threads. See :meth:`Animation.__call__`. Defaults to 2.
+            backend (str, optional): "pool" or "dask" (dask-backed ``u`` and ``v``
+                only). See :meth:`Animation.__call__`. Defaults to "pool".
+            worker_interpolation (bool, optional): Whether the workers interpolate the
+                frames from runs of source frames. See :meth:`Animation.__call__`.
+                Defaults to False.
+            transport (str, optional): "pickle" or "shm" to send the (u, v) frames
+                through shared memory. See :meth:`Animation.__call__`. Defaults to "pickle".
+            workdir (str | Path, optional): Persistent directory of the rendered frames, so
+                that a later run only renders missing or stale frames. See
+                :meth:`Animation.__call__`. Defaults to None.
+            segment_frames (int, optional): Number of frames of the segments encoded in
+                parallel while rendering. See :meth:`Animation.__call__`. Defaults to None.
+            encoders (int, optional): Maximum number of segments encoded at once. See
+                :meth:`Animation.__call__`. Defaults to a quarter of the CPU cores.
+            report (bool, optional): Whether to time the run and return an
+                :class:`AnimationReport`. See :meth:`Animation.__call__`. Defaults to False.
             **kwargs: Additional keyword arguments.
+
+        Returns:
+            AnimationReport | None: The report of the run if ``report``, else None.
         """
-        magnitude_frames = (
-            np.sqrt(self._frame_values(u, k) ** 2 + self._frame_values(v, k) ** 2) for k in range(len(u))
-        )
-        norm = self.plot._norm_streaming(
-            magnitude_frames,
-            vmin=vmin,
-            vmax=vmax,
-            qmin=qmin,
-            qmax=qmax,
-            norm=norm,
-            log=log,
-        )
-        figsize, fixed_frame = self._resolve_figsize(
-            figsize,
-            dpi,
-            video_width,
-            self.plot.x,
-            self.plot.y,
-            self.plot.aspect,
-        )
-        self._animate(
-            data=(u, v),
-            path=path,
-            frame_generator=self._generate_quiver_frame,
-            figsize=figsize,
-            title=title,
-            fps=fps,
-            upsample_ratio=upsample_ratio,
-            cmap=cmap,
-            norm=norm,
-            label=label,
-            dpi=dpi,
-            pad_inches=pad_inches,
-            n_jobs=n_jobs,
-            timeout=timeout,
-            subsample=subsample,
-            video_width=video_width,
-            fixed_frame=fixed_frame,
-            **kwargs,
-        )
+        self._check_engine(engine)
+        self._check_backend(backend, pipe, u, v)
+        self._check_transport(transport, backend, worker_interpolation)
+        self._check_workdir(workdir, backend, pipe, worker_interpolation)
+        self._check_segments(segment_frames, encoders, pipe)
+        report = AnimationReport() if report else None
+        with reporting(report):
+            with timed_stage("norm"):
+                magnitude_frames = (
+                    np.sqrt(u_frame**2 + v_frame**2) for u_frame, v_frame in self._iter_source_frames((u, v), prefetch)
+                )
+                norm = self.plot._norm_streaming(
+                    magnitude_frames,
+                    vmin=vmin,
+                    vmax=vmax,
+                    qmin=qmin,
+                    qmax=qmax,
+                    norm=norm,
+                    log=log,
+                    cache=self._norm_cache(norm_cache, u, v, kind="magnitude"),
+                    compute_sketch=(lambda: dask_sketch(np.hypot(getattr(u, "data", u), getattr(v, "data", v))))
+                    if backend == "dask"
+                    else None,
+                )
+            figsize, fixed_frame = self._resolve_figsize(
+                figsize,
+                dpi,
+                video_width,
+                self.plot.x,
+                self.plot.y,
+                self.plot.aspect,
+            )
+            self._animate(
+                data=(u, v),
+                path=path,
+                figsize=figsize,
+                title=title,
+                fps=fps,
+                upsample_ratio=upsample_ratio,
+                cmap=cmap,
+                norm=norm,
+                label=label,
+                dpi=dpi,
+                pad_inches=pad_inches,
+                n_jobs=n_jobs,
+                timeout=timeout,
+                subsample=subsample,
+                video_width=video_width,
+                fixed_frame=fixed_frame,
+                engine=engine,
+                pipe=pipe,
+                chunksize=chunksize,
+                max_inflight=max_inflight,
+                prefetch=prefetch,
+                backend=backend,
+                worker_interpolation=worker_interpolation,
+                transport=transport,
+                workdir=workdir,
+                segment_frames=segment_frames,
+                encoders=encoders,
+                **kwargs,
+            )
+        return report
 
-    def _animate(
-        self,
-        data,
-        path,
-        frame_generator,
-        figsize: tuple[float, float] | None = None,
-        title: str | list[str] | tuple[str, ...] | None = None,
-        fps: int = 24,
-        upsample_ratio: int = 2,
-        cmap="jet",
-        norm=None,
-        label=None,
-        dpi=180,
-        pad_inches: float = 0.2,
-        n_jobs: int | None = None,
-        timeout: int | str = "auto",
-        diff: bool = False,
-        crf: int = 20,
-        video_width: int | None = None,
-        fixed_frame: bool = False,
-        **kwargs,
-    ):
-        self._require_ffmpeg()
-        titles = self._process_title(title, upsample_ratio)
+    def _check_engine(self, engine):
+        if engine == "numpy":
+            raise ValueError("The 'numpy' engine does not support quiver animations.")
+        super()._check_engine(engine)
+
+    @staticmethod
+    def _n_frames_raw(data):
+        return len(data[0])
 
+    def _iter_frames(self, data, upsample_ratio, prefetch=0, ring=None):
         u, v = data
-        n_raw = len(u)
-        data_len = (n_raw - 1) * upsample_ratio + 1 if n_raw > 1 else 1
-        frames = zip(
-            self._iter_upsampled_frames(u, ratio=upsample_ratio),
-            self._iter_upsampled_frames(v, ratio=upsample_ratio),
+        return zip(
+            self._iter_upsampled_frames(u, ratio=upsample_ratio, prefetch=prefetch, ring=ring),
+            self._iter_upsampled_frames(v, ratio=upsample_ratio, prefetch=prefetch, ring=ring),
             strict=True,
         )
 
-        with TemporaryDirectory() as tempdir:
-            # Generator consumed lazily by pool.imap: frames are interpolated
-            # and dispatched to workers on the fly, never all held in memory.
-            args = (
-                (
-                    frame_data,
-                    Path(tempdir) / f"frame_{k:08d}.png",
-                    figsize,
-                    titles[k] if titles and k < len(titles) else None,
-                    cmap,
-                    norm,
-                    label,
-                    dpi,
-                    pad_inches,
-                    fixed_frame,
-                    kwargs,
-                )
-                for k, frame_data in enumerate(frames)
-            )
-
-            cpu_total = cpu_count() or 1
-            default_jobs = max(1, int((2 * cpu_total) / 3))
-            n_jobs = default_jobs if n_jobs is None else n_jobs
-            with Pool(processes=n_jobs) as pool:
-                list(
-                    tqdm(
-                        pool.imap(frame_generator, args),
-                        total=data_len,
-                        disable=(not self.verbose),
-                        desc="Frames generation",
-                        leave=False,
-                    )
-                )
-
-            if timeout == "auto":
-                timeout_seconds = max(20.0, 0.1 * data_len)
-            elif isinstance(timeout, (int, float)):
-                timeout_seconds = timeout
-            else:
-                raise ValueError("timeout must be 'auto' or a numeric value.")
-            self._create_video(tempdir, path, fps, timeout=timeout_seconds, crf=crf, video_width=video_width)
-
-    def _generate_quiver_frame(self, args):
-        """Generates a quiver frame and saves it as a PNG."""
-        (u_frame, v_frame), frame_path, figsize, title, cmap, norm, label, dpi, pad_inches, _fixed_frame, kwargs = args
-        x_name = kwargs.get("x_name")
-        y_name = kwargs.get("y_name")
-        coords = {y_name: self.plot.y, x_name: self.plot.x}
-        dims = (y_name, x_name)
-        u_da = xr.DataArray(u_frame, coords=coords, dims=dims)
-        v_da = xr.DataArray(v_frame, coords=coords, dims=dims)
-        magnitude = np.sqrt(u_frame**2 + v_frame**2)
-        self.plot(
-            data=magnitude,
-            figsize=figsize,
+    def _iter_source_frames(self, data, prefetch=0):
+        u, v = data
+        return zip(self._iter_raw_frames(u, prefetch), self._iter_raw_frames(v, prefetch), strict=True)
+
+    @staticmethod
+    def _stack_frames(frames):
+        return tuple(np.stack(component) for component in zip(*frames, strict=True))
+
+    def _time_chunks(self, data):
+        return self._time_blocks(data[0])
+
+    @staticmethod
+    def _slice_frames(data, start, stop):
+        return tuple(getattr(d, "data", d)[start:stop] for d in data)
+
+    def _make_renderer(self, frame, title, settings):
+        u_frame, v_frame = frame
+        return QuiverFrameRenderer(
+            self.plot,
+            u_frame,
+            v_frame,
+            subsample=settings.get("subsample", 1),
+            arrows_kwgs=settings.get("arrows_kwgs"),
+            figsize=settings["figsize"],
+            dpi=settings["dpi"],
+            cmap=settings["cmap"],
+            norm=settings["norm"],
+            label=settings["label"],
             title=title,
-            show=False,
-            cmap=cmap,
-            norm=norm,
-            label=label,
         )
-        subsample = kwargs.get("subsample", 1)
-        if subsample > 1:
-            u_sub = u_da.isel({y_name: slice(None, None, subsample), x_name: slice(None, None, subsample)})
-            v_sub = v_da.isel({y_name: slice(None, None, subsample), x_name: slice(None, None, subsample)})
-            x = u_sub[x_name].values
-            y = u_sub[y_name].values
-            u_sub = u_sub.values
-            v_sub = v_sub.values
-        else:
-            x = u_da[x_name].values
-            y = u_da[y_name].values
-            u_sub = u_da.values
-            v_sub = v_da.values
-
-        if u_da[x_name].ndim == 1:
-            x, y = np.meshgrid(x, y)
-
-        arrows_kwgs = kwargs.get("arrows_kwgs")
-        if arrows_kwgs is None:
-            arrows_kwgs = {}
-        plt.quiver(x, y, u_sub, v_sub, **arrows_kwgs)
-        bbox = "tight"
-        pad = pad_inches
-        plt.savefig(frame_path, dpi=dpi, bbox_inches=bbox, pad_inches=pad)
-        plt.clf()
-        plt.close()
 
 
 def animate_quiver(
@@ -351,7 +349,7 @@ def animate_quiver(
     y_name: str | None = None,
     crs=None,
     field_name: str | None = None,
-    borders: gpd.GeoDataFrame | gpd.GeoSeries | None = None,
+    borders: "gpd.GeoDataFrame | gpd.GeoSeries | None" = None,
     verbose: int = 0,
     subsample: int = 1,
     arrows_kwgs: dict[str, Any] | None = None,
@@ -403,6 +401,22 @@ def animate_quiver(
             - `n_jobs` (int, optional): Number of parallel jobs for frame generation.
             - `dpi` (int, optional): Dots per inch for the saved frames.
             - `timeout` (str | int, optional): Timeout for video creation.
+            - `engine` (str, optional): Frame rendering engine, "persistent" (default) or "rebuild".
+            - `pipe` (bool, optional): Stream raw frames to FFmpeg instead of writing PNG files.
+            - `chunksize` (int, optional): Number of frames sent to a worker at once.
+            - `max_inflight` (int, optional): Maximum number of frames dispatched and not rendered yet.
+            - `norm_cache` (str | Path, optional): Directory caching the color scale statistics across runs.
+            - `prefetch` (int, optional): Number of frames of lazily-backed data read ahead in the background.
+            - `backend` (str, optional): "pool" (default) or "dask" to compute and render on the dask scheduler.
+            - `worker_interpolation` (bool, optional): Interpolate frames in the workers from runs of source frames.
+            - `transport` (str, optional): "pickle" (default) or "shm" to send frames through shared memory.
+            - `workdir` (str | Path, optional): Persistent frame directory, to resume runs and re-encode only.
+            - `segment_frames` (int, optional): Encode segments of that many frames in parallel while rendering.
+            - `encoders` (int, optional): Maximum number of segments encoded at once.
+            - `report` (bool, optional): Return an :class:`AnimationReport` with the timings of the run.
+
+    Returns:
+        AnimationReport | None: The report of the run if ``report=True``, else None.
 
     Example:
         .. code-block:: python
@@ -423,7 +437,8 @@ def animate_quiver(
     u, crs_ = check_da(u, actual_time_name, actual_x_name, actual_y_name, crs)
     v, _ = check_da(v, actual_time_name, actual_x_name, actual_y_name, crs)
 
-    animation = QuiverAnimation(
+    batch = current_batch()
+    animation = (QuiverAnimation if batch is None else partial(batch.animation, QuiverAnimation))(
         x=u[actual_x_name].values,
         y=u[actual_y_name].values,
         crs=crs_,
@@ -441,7 +456,7 @@ def animate_quiver(
     quiver_kwargs["x_name"] = actual_x_name
     quiver_kwargs["y_name"] = actual_y_name
 
-    animation.quiver(
+    return animation.quiver(
         u=u,
         v=v,
         path=output_path,
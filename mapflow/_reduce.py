@@ -0,0 +1,111 @@
+import numpy as np
+
+REDUCTIONS = ("mean", "max", "nearest")
+
+
+def reduction_factors(shape, figsize, dpi):
+    """Returns the ``(fy, fx)`` block sizes that bring a grid down to the output pixel resolution.
+
+    The map never spans more pixels than the whole figure, so blocks of
+    ``fy`` by ``fx`` cells, with ``fy * figure height <= ny`` and
+    ``fx * figure width <= nx`` in pixels, still leave at least one cell
+    per output pixel.
+
+    Args:
+        shape (tuple[int, int]): Grid shape ``(ny, nx)``.
+        figsize (tuple[float, float]): Figure size in inches.
+        dpi (float): Dots per inch of the frames.
+
+    Returns:
+        tuple[int, int]: Block sizes along y and x, 1 when no reduction is possible.
+    """
+    ny, nx = shape
+    width, height = figsize
+    return max(1, int(ny // (height * dpi))), max(1, int(nx // (width * dpi)))
+
+
+def _pad_blocks(array, factors, fill):
+    """Pads the last two axes of ``array`` to multiples of ``factors`` and splits them into blocks."""
+    fy, fx = factors
+    ny, nx = array.shape[-2:]
+    pad_y, pad_x = -ny % fy, -nx % fx
+    if pad_y or pad_x:
+        pad = [(0, 0)] * (array.ndim - 2) + [(0, pad_y), (0, pad_x)]
+        array = np.pad(array, pad, constant_values=fill)
+    lead = array.shape[:-2]
+    return array.reshape(*lead, (ny + pad_y) // fy, fy, (nx + pad_x) // fx, fx)
+
+
+def block_reduce(array, factors, how="mean"):
+    """Reduces the last two axes of ``array`` by blocks of ``factors`` cells.
+
+    NaN cells are ignored, and partial blocks at the edges are reduced over
+    the cells they contain.
+
+    Args:
+        array (np.ndarray): Array whose last two axes are ``(y, x)``.
+        factors (tuple[int, int]): Block sizes along y and x.
+        how (str, optional): "mean", "max" or "nearest" (the center cell of
+            each block). Defaults to "mean".
+
+    Returns:
+        np.ndarray: Reduced array. Means are float, the other reductions keep
+        the dtype of ``array``.
+    """
+    fy, fx = factors
+    if how == "nearest":
+        return array[..., fy // 2 :: fy, fx // 2 :: fx]
+    if how == "max":
+        if array.dtype.kind == "f":
+            blocks = _pad_blocks(array, factors, np.nan)
+            return np.fmax.reduce(np.fmax.reduce(blocks, axis=-1), axis=-2)
+        blocks = _pad_blocks(array, factors, np.iinfo(array.dtype).min if array.dtype.kind in "iu" else 0)
+        return blocks.max(axis=(-3, -1))
+    if how == "mean":
+        blocks = _pad_blocks(np.asarray(array, dtype=np.result_type(array.dtype, np.float32)), factors, np.nan)
+        valid = ~np.isnan(blocks)
+        total = np.where(valid, blocks, 0).sum(axis=(-3, -1))
+        count = valid.sum(axis=(-3, -1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (total / count).astype(blocks.dtype, copy=False)
+    raise ValueError(f"reduce must be one of {REDUCTIONS}, got {how!r}")
+
+
+class ReducedFrames:
+    """Sequence of frames reduced to a coarser grid as they are read.
+
+    Wraps 3D data (numpy array or lazily-backed DataArray) so that frames, or
+    blocks of frames, are reduced by :func:`block_reduce` right after being
+    read. With "nearest", only the selected cells are read from lazily-backed
+    data. Reads keep the time chunking of the wrapped data.
+
+    Args:
+        data: 3D data ``(time, y, x)``.
+        factors (tuple[int, int]): Block sizes along y and x.
+        how (str): Reduction, see :func:`block_reduce`.
+        time_blocks (list[tuple[int, int]]): Blocks of frames of ``data`` read at once.
+    """
+
+    def __init__(self, data, factors, how, time_blocks):
+        self.data = data
+        self.factors = factors
+        self.how = how
+        self.chunks = (tuple(stop - start for start, stop in time_blocks),)
+        ny, nx = data.shape[1:]
+        fy, fx = factors
+        self.shape = (len(data), -(-ny // fy), -(-nx // fx))
+        if how == "nearest":
+            self.shape = (len(data), len(range(fy // 2, ny, fy)), len(range(fx // 2, nx, fx)))
+        dtype = np.dtype(data.dtype)
+        self.dtype = np.result_type(dtype, np.float32) if how == "mean" else dtype
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if self.how == "nearest":
+            fy, fx = self.factors
+            values = self.data[key, fy // 2 :: fy, fx // 2 :: fx]
+            return np.asarray(getattr(values, "values", values))
+        values = self.data[key]
+        return block_reduce(np.asarray(getattr(values, "values", values)), self.factors, self.how)
@@ -0,0 +1,478 @@
+import os
+import pickle
+from collections import OrderedDict
+from contextlib import nullcontext
+from copy import copy
+from pathlib import Path
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.image import imsave
+
+from ._report import StageTimer
+
+_JOB = None
+# Render jobs of a shared batch pool loaded by the current worker, by job file, least recently used first.
+_BATCH_JOBS = OrderedDict()
+# Number of render jobs kept by each worker of a shared batch pool, see init_batch_worker.
+_BATCH_JOBS_MAX = 1
+
+
+def init_worker(job):
+    """Pool initializer storing the render job of the current worker."""
+    global _JOB
+    _JOB = job
+
+
+def init_batch_worker(max_jobs):
+    """Pool initializer of a shared batch pool, keeping up to ``max_jobs`` render jobs in each worker.
+
+    ``max_jobs`` must be at least the number of animations rendered at once,
+    whose tasks are interleaved: with fewer, a job is evicted before its next
+    task and loaded again, renderer included, for nearly every task.
+    """
+    global _BATCH_JOBS_MAX
+    _BATCH_JOBS_MAX = max(1, max_jobs)
+
+
+def render_task(task):
+    """Renders the ``(index, frame)`` or ``(index, frame, name)`` task with the job of the current worker."""
+    return _JOB.collect(_JOB(*task))
+
+
+def render_slot_task(task):
+    """Renders the ``(index, slot)`` or ``(index, slot, name)`` task, reading the frame from the shared memory ring."""
+    k, slot, *name = task
+    return _JOB.collect(_JOB(k, _JOB.frames.get(slot), *name))
+
+
+def render_run_task(task):
+    """Interpolates and renders the ``(first index, source frames, last)`` task with the job of the current worker."""
+    return _JOB.collect(_JOB.render_run(*task))
+
+
+def render_batch_task(task):
+    """Runs the ``(job file, task function, task)`` task of a shared batch pool.
+
+    The render job of each animation of the batch is read from its file the
+    first time the worker gets one of its tasks, timed as the "load" stage of
+    the job, and the most recently used ones are kept with their renderer
+    (see :func:`init_batch_worker`).
+    """
+    global _JOB
+    path, func, inner = task
+    job = _BATCH_JOBS.pop(path, None)
+    if job is None:
+        timer = StageTimer()
+        with timer.stage("load"), open(path, "rb") as f:
+            job = pickle.load(f)
+        if job.timer is not None:
+            job.timer.stages.update(timer.stages)
+        while len(_BATCH_JOBS) >= _BATCH_JOBS_MAX:
+            _BATCH_JOBS.popitem(last=False)
+    _BATCH_JOBS[path] = _JOB = job
+    return func(inner)
+
+
+class RenderJob:
+    """Constant state of an animation rendering, handed once to each worker.
+
+    Holds the animation (and thus its :class:`PlotModel`) and the render
+    settings shared by all frames, so that tasks only carry a frame index and
+    the frame data. With the "persistent" engine, the renderer built for the
+    first frame is kept and updated for the next ones.
+
+    Args:
+        animation (Animation): Animation providing ``_make_renderer``.
+        settings (dict): Render settings. ``titles``, ``dpi``, ``pad_inches``,
+            ``engine``, ``frame_dir``, ``frame_box`` and ``report`` are used
+            here, the whole dict is passed to ``_make_renderer``.
+        frames (SharedFrameRing, optional): Shared memory ring the frames of
+            slot tasks are read from. Defaults to None.
+    """
+
+    def __init__(self, animation, settings, frames=None):
+        self.animation = animation
+        self.settings = settings
+        self.frames = frames
+        self.renderer = None
+        self.timer = StageTimer() if settings.get("report") else None
+
+    def __getstate__(self):
+        return {**self.__dict__, "renderer": None}
+
+    def stage(self, name):
+        """Times a stage of the worker if the run is reported."""
+        return nullcontext() if self.timer is None else self.timer.stage(name)
+
+    def collect(self, result):
+        """Returns the result of a task, paired with the worker's timings if the run is reported.
+
+        The timings are ``(process id, stages)``, with the stages timed since
+        the previous task (see :meth:`StageTimer.pop`).
+        """
+        if self.timer is None:
+            return result
+        return result, (os.getpid(), self.timer.pop())
+
+    def title(self, k):
+        titles = self.settings["titles"]
+        return titles[k] if titles and k < len(titles) else None
+
+    def __call__(self, k, frame, name=None):
+        """Renders frame ``k``.
+
+        Args:
+            k (int): Index of the frame.
+            frame: Frame data.
+            name (str, optional): File name of the frame in ``frame_dir``. It
+                is then written atomically, so that a persistent frame directory
+                never holds a partial frame. Defaults to ``frame_{k:08d}.png``.
+
+        Returns:
+            np.ndarray | None: The RGB pixels of ``frame_box`` if ``frame_dir``
+            is None, otherwise None once the frame is saved as a PNG in
+            ``frame_dir`` (cropped to ``frame_box`` if set).
+        """
+        settings = self.settings
+        title = self.title(k)
+        frame_path = None
+        if settings["frame_dir"] is not None:
+            target = Path(settings["frame_dir"]) / (name or f"frame_{k:08d}.png")
+            frame_path = target if name is None else target.with_name(f".{target.stem}.{os.getpid()}.png")
+        with self.stage("render"):
+            if self.renderer is None or settings["engine"] == "rebuild":
+                renderer = self.animation._make_renderer(frame, title, settings)
+                if settings["engine"] != "rebuild":
+                    self.renderer = renderer
+            else:
+                renderer = self.renderer
+                renderer.update(frame, title=title)
+            if settings["frame_box"] is None:
+                renderer.savefig(frame_path, dpi=settings["dpi"], pad_inches=settings["pad_inches"])
+            else:
+                rgb = renderer.to_rgb(settings["frame_box"], settings["dpi"])
+        if frame_path is None:
+            return rgb
+        if settings["frame_box"] is not None:
+            with self.stage("write"):
+                imsave(frame_path, rgb)
+        if name is not None:
+            os.replace(frame_path, target)
+
+    def render_run(self, start, source, last):
+        """Interpolates the consecutive source frames ``source`` and renders the resulting frames.
+
+        The frames between each pair of source frames are interpolated here,
+        with ``settings["upsample_ratio"]``, so that only the source frames
+        are sent to the worker. The last source frame of a run is also the
+        first one of the next run, and is only rendered if ``last``.
+
+        Args:
+            start (int): Index of the first rendered frame.
+            source: Source frames, as handed to ``Animation._iter_frames``.
+            last (bool): Whether ``source`` ends with the last source frame.
+
+        Returns:
+            list: The results of :meth:`__call__` for each rendered frame.
+        """
+        ratio = self.settings["upsample_ratio"]
+        n_frames = (self.animation._n_frames_raw(source) - 1) * ratio + (1 if last else 0)
+        # Each frame is rendered before the next one is interpolated: the
+        # smallest interpolation ring is enough.
+        frames = self.animation._iter_frames(source, ratio, ring=1)
+        if self.timer is not None:
+            frames = self.timer.iterate("interpolate", frames)
+        return [self(start + i, frame) for i, frame in zip(range(n_frames), frames, strict=False)]
+
+
+class FrameRenderer:
+    """Persistent figure for rendering successive frames of an animation.
+
+    The figure, colorbar, borders and title are built once from the first
+    frame. Each following frame only updates the data of the image (or mesh)
+    and the title text, which avoids rebuilding the whole layout per frame.
+
+    Args:
+        plot (PlotModel): Plot model of the animated domain.
+        data (np.ndarray): First frame, used to build the figure.
+        figsize (tuple[float, float], optional): Figure size (width, height) in inches.
+        dpi (float, optional): Resolution of the frames, for the simplification
+            of the borders. Defaults to the dpi of the figure.
+        cmap (str, optional): Colormap to use. Defaults to "jet".
+        norm (matplotlib.colors.Normalize, optional): Normalization object.
+        label (str, optional): Label for the colorbar.
+        title (str, optional): Title of the first frame.
+    """
+
+    def __init__(self, plot, data, figsize=None, dpi=None, cmap="jet", norm=None, label=None, title=None):
+        self.figure = Figure(figsize=figsize)
+        FigureCanvasAgg(self.figure)
+        self.ax, self.mappable, self.title = plot._draw(
+            self.figure,
+            plot._process_data(data),
+            cmap=cmap,
+            norm=norm,
+            label=label,
+            title=title,
+            dpi=dpi,
+        )
+        self._mesh = plot.x.ndim == 2
+
+    def update(self, frame, title=None):
+        """Replaces the data and the title shown by the figure, which is cleared if ``title`` is None."""
+        self._set_data(frame)
+        self.title.set_text("" if title is None else str(title))
+
+    def _set_data(self, data):
+        if self._mesh:
+            self.mappable.set_array(np.asarray(data))
+        else:
+            self.mappable.set_data(data)
+
+    def savefig(self, path, dpi, pad_inches):
+        """Saves the current frame to ``path``."""
+        self.figure.savefig(path, dpi=dpi, bbox_inches="tight", pad_inches=pad_inches)
+
+    def frame_box(self, dpi, pad_inches):
+        """Returns the pixel box of the padded tight bounding box of the figure.
+
+        Args:
+            dpi (float): Resolution of the frames.
+            pad_inches (float): Padding in inches around the tight bounding box.
+
+        Returns:
+            tuple[int, int, int, int]: Left, top, right and bottom pixel bounds,
+            measured from the top-left corner of the figure canvas.
+        """
+        self.figure.set_dpi(dpi)
+        bbox = self.figure.get_tightbbox(self.figure.canvas.get_renderer()).padded(pad_inches)
+        left = round(bbox.x0 * dpi)
+        top = round((self.figure.get_figheight() - bbox.y1) * dpi)
+        # Same truncation as the canvas created by ``savefig(bbox_inches="tight")``.
+        return left, top, left + int(bbox.width * dpi), top + int(bbox.height * dpi)
+
+    def to_rgb(self, frame_box, dpi):
+        """Draws the current frame and returns the RGB pixels of ``frame_box``.
+
+        Parts of the box lying outside of the canvas are filled with the
+        figure facecolor, as ``savefig`` does with ``bbox_inches="tight"``.
+
+        Returns:
+            np.ndarray: Array of shape (height, width, 3) and dtype uint8.
+        """
+        if self.figure.dpi != dpi:
+            self.figure.set_dpi(dpi)
+        self.figure.canvas.draw()
+        return _crop(np.asarray(self.figure.canvas.buffer_rgba())[..., :3], frame_box, self._facecolor())
+
+    def _facecolor(self):
+        return np.round(np.asarray(self.figure.get_facecolor()[:3]) * 255).astype(np.uint8)
+
+
+def _crop(image, frame_box, fill):
+    """Crops ``image`` to ``frame_box``, filling the parts outside of the image with ``fill``."""
+    left, top, right, bottom = frame_box
+    out = np.empty((bottom - top, right - left, image.shape[2]), dtype=image.dtype)
+    out[...] = fill
+    src_top, src_left = max(top, 0), max(left, 0)
+    src_bottom, src_right = min(bottom, image.shape[0]), min(right, image.shape[1])
+    out[src_top - top : src_bottom - top, src_left - left : src_right - left] = image[
+        src_top:src_bottom, src_left:src_right
+    ]
+    return out
+
+
+def _sparse_layer(rgba):
+    """Returns the flat indices, colors and alphas of the visible pixels of an RGBA layer."""
+    alpha = rgba[..., 3].ravel()
+    index = np.flatnonzero(alpha)
+    return index, rgba.reshape(-1, 4)[index, :3].astype(np.uint16), alpha[index, None].astype(np.uint16)
+
+
+def _blend(out, layer):
+    """Alpha-composites a layer returned by :func:`_sparse_layer` onto the RGB array ``out``."""
+    index, color, alpha = layer
+    flat = out.reshape(-1, 3)
+    flat[index] = (color * alpha + flat[index] * (255 - alpha) + 127) // 255
+
+
+class CompositeRenderer(FrameRenderer):
+    """Renders frames of regular grids with NumPy instead of matplotlib.
+
+    The figure is drawn once by matplotlib without data, borders and title to
+    get a static background (axes layout and colorbar). Each frame is then
+    colormapped with a lookup table, resampled to the pixel box of the image
+    by nearest-neighbour indexing and pasted on the background, before the
+    borders and the title, rasterized separately, are alpha-composited on
+    top. Only 1D x/y grids are supported.
+
+    Args:
+        plot (PlotModel): Plot model of the animated domain.
+        data (np.ndarray): First frame, used to build the figure.
+        **kwargs: Arguments passed to :class:`FrameRenderer`.
+    """
+
+    def __init__(self, plot, data, **kwargs):
+        if plot.x.ndim != 1:
+            raise ValueError("The 'numpy' engine requires 1D x and y coordinates.")
+        super().__init__(plot, data, **kwargs)
+        self._plot = plot
+        self._data = np.asarray(data)
+        self._title_text = self.title.get_text()
+        self._title_layer = (None, None)
+        self._prepared = None
+        cmap = self.mappable.get_cmap()
+        self._lut = np.concatenate(
+            [
+                cmap(np.arange(cmap.N), bytes=True),
+                cmap([-1.0, 2.0, np.nan], bytes=True),  # under, over and bad colors
+            ]
+        )
+
+    def update(self, frame, title=None):
+        """Replaces the data and the title of the next composited frame, which is cleared if ``title`` is None."""
+        self._data = frame
+        self._title_text = "" if title is None else str(title)
+
+    def savefig(self, path, dpi, pad_inches):
+        """Saves the current frame to ``path``."""
+        imsave(path, self.to_rgb(self.frame_box(dpi, pad_inches), dpi))
+
+    def to_rgb(self, frame_box, dpi):
+        """Composites the current frame and returns the RGB pixels of ``frame_box``."""
+        if self._prepared != (frame_box, dpi):
+            self._prepare(frame_box, dpi)
+        out = self._background.copy()
+        rgba = self._lut[self._lut_index(self._data)[self._rows[:, None], self._cols]]
+        region = out[self._region]
+        alpha = rgba[..., 3:]
+        if self._opaque:
+            np.copyto(region, rgba[..., :3], where=alpha == 255)
+        else:
+            alpha = alpha.astype(np.uint16)
+            region[...] = (rgba[..., :3] * alpha + region * (255 - alpha) + 127) // 255
+        _blend(out, self._borders_layer)
+        _blend(out, self._title(frame_box))
+        return out
+
+    def _lut_index(self, data):
+        """Maps data to rows of the lookup table, as ``Colormap.__call__`` does."""
+        n = self.mappable.get_cmap().N
+        values = np.ma.asarray(self.mappable.norm(data))
+        bad = np.ma.getmaskarray(values)
+        xa = np.ma.getdata(values) * n
+        xa[xa == n] = n - 1
+        bad |= np.isnan(xa)
+        under = xa < 0
+        over = xa >= n
+        with np.errstate(invalid="ignore"):
+            index = xa.astype(np.intp)
+        index[under] = n
+        index[over] = n + 1
+        index[bad] = n + 2
+        return index
+
+    def _prepare(self, frame_box, dpi):
+        """Rasterizes the static layers and the pixel mapping for ``frame_box`` at ``dpi``."""
+        fig, ax = self.figure, self.ax
+        fig.set_dpi(dpi)
+        height, width = fig.canvas.get_width_height()[::-1]
+
+        # Static background: everything but the data, the borders and the title.
+        hidden = [*ax.collections, self.title]
+        for artist in hidden:
+            artist.set_visible(False)
+        data = self.mappable.get_array()
+        self.mappable.set_data(np.full(data.shape, np.nan))
+        fig.canvas.draw()
+        self._background = _crop(np.asarray(fig.canvas.buffer_rgba())[..., :3], frame_box, self._facecolor())
+        self.mappable.set_data(data)
+        for artist in hidden:
+            artist.set_visible(True)
+
+        # Pixels whose centers fall in the image extent, and the data cell of each one.
+        x0, x1, y0, y1 = self.mappable.get_extent()
+        (px0, py0), (px1, py1) = ax.transData.transform([(x0, y0), (x1, y1)])
+        ny, nx = data.shape
+        cols = np.arange(int(np.ceil(px0 - 0.5)), int(np.ceil(px1 - 0.5)))
+        rows = np.arange(int(np.floor(height - py1 - 0.5)) + 1, int(np.floor(height - py0 - 0.5)) + 1)
+        left, top, right, bottom = frame_box
+        cols = cols[(cols >= max(left, 0)) & (cols < min(right, width))]
+        rows = rows[(rows >= max(top, 0)) & (rows < min(bottom, height))]
+        self._cols = np.clip(((cols + 0.5 - px0) / (px1 - px0) * nx).astype(np.intp), 0, nx - 1)
+        self._rows = np.clip(((height - rows - 0.5 - py0) / (py1 - py0) * ny).astype(np.intp), 0, ny - 1)
+        self._region = (
+            slice(rows[0] - top, rows[-1] - top + 1) if rows.size else slice(0, 0),
+            slice(cols[0] - left, cols[-1] - left + 1) if cols.size else slice(0, 0),
+        )
+        self._opaque = bool(np.isin(self._lut[:, 3], (0, 255)).all())
+
+        # Overlay figure with the same axes position, for the borders and titles.
+        self._overlay = Figure(figsize=fig.get_size_inches(), dpi=dpi)
+        FigureCanvasAgg(self._overlay)
+        self._overlay.patch.set_alpha(0)
+        overlay_ax = self._overlay.add_axes(ax.get_position())
+        overlay_ax.set_xlim(ax.get_xlim())
+        overlay_ax.set_ylim(ax.get_ylim())
+        overlay_ax.axis("off")
+        borders = self._plot._borders_for(fig.get_size_inches(), dpi)
+        self._overlay_borders = overlay_ax.add_collection(copy(borders))
+        self._overlay_title = overlay_ax.set_title("")
+        self._borders_layer = self._rasterize_overlay(frame_box)
+        self._overlay_borders.set_visible(False)
+        self._title_layer = (None, None)
+        self._prepared = (frame_box, dpi)
+
+    def _rasterize_overlay(self, frame_box):
+        self._overlay.canvas.draw()
+        rgba = np.asarray(self._overlay.canvas.buffer_rgba())
+        return _sparse_layer(_crop(rgba, frame_box, 0))
+
+    def _title(self, frame_box):
+        """Returns the title layer, rasterized again only when the title text changes."""
+        text, layer = self._title_layer
+        if text != self._title_text:
+            self._overlay_title.set_text(self._title_text)
+            layer = self._rasterize_overlay(frame_box)
+            self._title_layer = (self._title_text, layer)
+        return layer
+
+
+class QuiverFrameRenderer(FrameRenderer):
+    """Persistent figure for quiver animations.
+
+    The magnitude of the vector field is drawn as in :class:`FrameRenderer`,
+    and the arrows are updated in place with ``Quiver.set_UVC``.
+
+    Args:
+        plot (PlotModel): Plot model of the animated domain.
+        u (np.ndarray): U-component of the first frame.
+        v (np.ndarray): V-component of the first frame.
+        subsample (int, optional): Subsampling factor for the arrows. Defaults to 1.
+        arrows_kwgs (dict, optional): Keyword arguments passed to ``Axes.quiver``.
+        **kwargs: Arguments passed to :class:`FrameRenderer`.
+    """
+
+    def __init__(self, plot, u, v, subsample=1, arrows_kwgs=None, **kwargs):
+        super().__init__(plot, np.sqrt(u**2 + v**2), **kwargs)
+        self.subsample = max(1, subsample)
+        step = slice(None, None, self.subsample)
+        if plot.x.ndim == 1:
+            x, y = np.meshgrid(plot.x[step], plot.y[step])
+        else:
+            x, y = plot.x[step, step], plot.y[step, step]
+        arrows_kwgs = arrows_kwgs or {}
+        self.arrows = self.ax.quiver(x, y, u[step, step], v[step, step], **arrows_kwgs)
+        # Arrows are rescaled on every frame unless the scale is fixed by the user.
+        self._autoscale = arrows_kwgs.get("scale") is None
+
+    def update(self, frame, title=None):
+        """Replaces the vector field, given as a (u, v) pair, and the title shown by the figure."""
+        u, v = frame
+        super().update(np.sqrt(u**2 + v**2), title=title)
+        step = slice(None, None, self.subsample)
+        self.arrows.set_UVC(u[step, step], v[step, step])
+        if self._autoscale:
+            self.arrows.scale = None
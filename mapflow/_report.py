@@ -0,0 +1,214 @@
+import json
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from time import perf_counter, thread_time
+
+import numpy as np
+
+_ACTIVE = ContextVar("mapflow_report", default=None)
+
+
+@dataclass
+class StageTiming:
+    """Accumulated wall and CPU time of a stage, in seconds, and number of times it was entered."""
+
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+    def add(self, wall, cpu, calls=1):
+        self.wall += wall
+        self.cpu += cpu
+        self.calls += calls
+
+
+class StageTimer:
+    """Accumulates the wall and CPU time of the stages of the current thread.
+
+    Stages can be nested: the time of a stage excludes the time of the stages
+    entered while it is active, e.g. reading source frames while pulling an
+    interpolated frame. CPU time is the time of the calling thread.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name):
+        # [start wall, start cpu, wall of the nested stages, cpu of the nested stages]
+        frame = [perf_counter(), thread_time(), 0.0, 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            wall, cpu = perf_counter() - frame[0], thread_time() - frame[1]
+            if self._stack:
+                self._stack[-1][2] += wall
+                self._stack[-1][3] += cpu
+            self.stages.setdefault(name, StageTiming()).add(wall - frame[2], cpu - frame[3])
+
+    def iterate(self, name, iterable):
+        """Yields from ``iterable``, timing the production of each item as stage ``name``."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def pop(self):
+        """Returns the stages timed so far as ``{name: (wall, cpu, calls)}`` and resets them."""
+        stages = {name: (t.wall, t.cpu, t.calls) for name, t in self.stages.items()}
+        self.stages.clear()
+        return stages
+
+
+@dataclass
+class AnimationReport:
+    """Timings and volumes of an animation run, returned with ``report=True``.
+
+    Stages of the parent process are "norm" (color range), "read" (waiting
+    for source frames), "interpolate", "layout" (tight frame box), "dispatch"
+    (sending frames and waiting for the workers) and "encode" (FFmpeg, or
+    writing frames to its stdin with ``pipe=True``). Worker stages are
+    "interpolate" (``worker_interpolation=True`` or the dask backend),
+    "render" and "write" (PNG encoding of composited frames; with
+    ``savefig`` it is part of "render"). Each stage only counts its own time,
+    not the one of the stages it triggers.
+
+    Attributes:
+        n_frames (int): Number of frames of the video.
+        wall (float): Wall time of the whole call, in seconds.
+        stages (dict[str, StageTiming]): Stages of the parent process.
+        worker_stages (dict[str, StageTiming]): Stages of the workers, summed over workers.
+        workers (dict[int, dict[str, StageTiming]]): Stages of each worker, by process id.
+        bytes_to_workers (int | None): Bytes of frame data handed to the workers,
+            through pipes or shared memory. None with the dask backend.
+        temp_disk_bytes (int): Bytes of the temporary frame files.
+        ffmpeg_wall (float): Wall time of FFmpeg, in seconds.
+
+    .. code-block:: python
+
+        report = animation(da, "animation.mp4", report=True)
+        print(report.frames_per_second, report.stages["dispatch"].wall)
+        report.to_json("report.json")
+
+    """
+
+    n_frames: int = 0
+    wall: float = 0.0
+    stages: dict = field(default_factory=dict)
+    worker_stages: dict = field(default_factory=dict)
+    workers: dict = field(default_factory=dict)
+    bytes_to_workers: int | None = 0
+    temp_disk_bytes: int = 0
+    ffmpeg_wall: float = 0.0
+
+    def __post_init__(self):
+        self._timer = StageTimer()
+        self._timer.stages = self.stages
+
+    @property
+    def frames_per_second(self):
+        """Frames of the video produced per second of wall time."""
+        return self.n_frames / self.wall if self.wall else 0.0
+
+    @contextmanager
+    def active(self):
+        """Makes the report the active one of the current context while timing the whole call."""
+        token = _ACTIVE.set(self)
+        start = perf_counter()
+        try:
+            yield self
+        finally:
+            self.wall += perf_counter() - start
+            _ACTIVE.reset(token)
+
+    def add_worker(self, pid, stages):
+        """Adds the stages timed by worker ``pid``, as returned by :meth:`StageTimer.pop`."""
+        worker = self.workers.setdefault(pid, {})
+        for name, (wall, cpu, calls) in stages.items():
+            worker.setdefault(name, StageTiming()).add(wall, cpu, calls)
+            self.worker_stages.setdefault(name, StageTiming()).add(wall, cpu, calls)
+
+    def collect(self, results):
+        """Yields the results of tasks returned by :meth:`RenderJob.collect`, adding the timings of the workers."""
+        for result, (pid, stages) in results:
+            self.add_worker(pid, stages)
+            yield result
+
+    def add_temp_files(self, directory):
+        """Counts the size of the files in ``directory`` as temporary disk usage."""
+        self.temp_disk_bytes += sum(path.stat().st_size for path in Path(directory).iterdir() if path.is_file())
+
+    @contextmanager
+    def encoding(self):
+        """Times FFmpeg, as the "encode" stage and as ``ffmpeg_wall``."""
+        start = perf_counter()
+        try:
+            with self._timer.stage("encode"):
+                yield
+        finally:
+            self.ffmpeg_wall += perf_counter() - start
+
+    def sent(self, iterable):
+        """Yields from ``iterable``, counting the bytes of the arrays of each item as sent to the workers."""
+        for item in iterable:
+            self.bytes_to_workers += _nbytes(item)
+            yield item
+
+    def to_dict(self):
+        """Returns the report as a JSON-serializable dictionary."""
+        report = asdict(self)
+        report["workers"] = {str(pid): stages for pid, stages in report["workers"].items()}
+        report["frames_per_second"] = self.frames_per_second
+        return report
+
+    def to_json(self, path=None, indent=2):
+        """Returns the report as JSON, also written to ``path`` if given."""
+        text = json.dumps(self.to_dict(), indent=indent)
+        if path is not None:
+            Path(path).write_text(text)
+        return text
+
+
+def _nbytes(item):
+    if isinstance(item, np.ndarray):
+        return item.nbytes
+    if isinstance(item, (tuple, list)):
+        return sum(_nbytes(value) for value in item)
+    return 0
+
+
+def current_report():
+    """Returns the active :class:`AnimationReport`, or None."""
+    return _ACTIVE.get()
+
+
+def timed_stage(name):
+    """Times a stage of the active report, if any."""
+    report = _ACTIVE.get()
+    return nullcontext() if report is None else report._timer.stage(name)
+
+
+def timed_iter(name, iterable):
+    """Times the production of each item of ``iterable`` as a stage of the active report, if any."""
+    report = _ACTIVE.get()
+    return iterable if report is None else report._timer.iterate(name, iterable)
+
+
+def timed_encoding():
+    """Times FFmpeg in the active report, if any (see :meth:`AnimationReport.encoding`)."""
+    report = _ACTIVE.get()
+    return nullcontext() if report is None else report.encoding()
+
+
+def reporting(report):
+    """Activates ``report`` (see :meth:`AnimationReport.active`), or does nothing if it is None."""
+    return nullcontext() if report is None else report.active()
@@ -0,0 +1,160 @@
+import re
+import struct
+import subprocess
+from collections import deque
+from pathlib import Path
+from tempfile import TemporaryFile
+from time import monotonic
+
+from ._async import wait_process
+
+
+class SegmentEncoder:
+    """Encodes a PNG frame sequence in segments, each by its own FFmpeg process.
+
+    The frames ``frame_%08d.png`` of ``frame_dir`` are split into segments of
+    ``segment_frames`` frames. A segment is encoded as soon as all of its
+    frames are rendered (see :meth:`ready`), by at most ``encoders``
+    concurrent FFmpeg processes, and the segments are joined without
+    re-encoding once the last one is done (see :meth:`finish`). Each segment
+    starts with a keyframe, so the joined video is identical to the segments.
+    Every segment is scaled to the size derived from the first frame, and
+    has a keyframe interval of ``segment_frames``, so that frames of
+    different sizes cannot make the segments incompatible; the sizes of the
+    segments are checked before they are joined.
+
+    Args:
+        animation (type[Animation]): Class providing ``_build_ffmpeg_cmd`` and
+            ``_concat_videos``.
+        frame_dir (str | Path): Directory of the frames.
+        path (str | Path): Output video.
+        fps (float): Frames per second.
+        n_frames (int): Number of frames of the sequence, including the
+            ones before ``start``.
+        segment_frames (int): Number of frames per segment.
+        timeout (float): Time limit of the encoding of each segment, in seconds.
+        encoders (int): Maximum number of concurrent FFmpeg processes.
+        start (int, optional): Index of the first frame of the video. Defaults to 0.
+        **encoding: ``crf``, ``video_width`` and ``threads``, see ``_build_ffmpeg_cmd``.
+    """
+
+    def __init__(
+        self, animation, frame_dir, path, fps, n_frames, segment_frames, timeout, encoders, start=0, **encoding
+    ):
+        if segment_frames < 1:
+            raise ValueError("segment_frames must be a positive integer.")
+        self.animation = animation
+        self.frame_dir = Path(frame_dir)
+        self.path = Path(path)
+        self.fps = fps
+        self.n_frames = n_frames
+        self.segment_frames = segment_frames
+        self.timeout = timeout
+        self.encoders = max(1, encoders)
+        self.encoding = encoding
+        self.next = start
+        self.output_size = None
+        self.segments = []
+        # (process, stderr file, deadline, command) of the segments being encoded, oldest first.
+        self.running = deque()
+
+    def ready(self, n_ready):
+        """Starts encoding the complete segments among the first ``n_ready`` frames."""
+        while n_ready - self.next >= self.segment_frames:
+            self._launch(self.segment_frames)
+        # Failed or overdue segments are reported as soon as possible.
+        while self.running and (self.running[0][0].poll() is not None or monotonic() > self.running[0][2]):
+            self._wait(self.running.popleft())
+
+    def finish(self):
+        """Encodes the last segment, waits for every segment and joins them."""
+        try:
+            if self.n_frames > self.next:
+                self._launch(self.n_frames - self.next)
+            while self.running:
+                self._wait(self.running.popleft())
+        finally:
+            self.close()
+        if len(self.segments) > 1:
+            sizes = {_video_size(segment) for segment in self.segments}
+            if len(sizes) > 1:
+                raise RuntimeError(f"Video segments of different sizes cannot be joined: {sorted(sizes)}")
+        self.animation._concat_videos(self.segments, self.path, self.timeout)
+
+    def close(self):
+        """Kills the FFmpeg processes still running."""
+        while self.running:
+            process, stderr, *_ = self.running.popleft()
+            process.kill()
+            process.wait()
+            stderr.close()
+
+    def _launch(self, n_frames):
+        if len(self.running) >= self.encoders:
+            self._wait(self.running.popleft())
+        if self.output_size is None:
+            frame_size = _png_size(self.frame_dir / f"frame_{self.next:08d}.png")
+            self.output_size = _output_size(frame_size, self.encoding.get("video_width"))
+        segment = self.frame_dir / f"segment_{len(self.segments):05d}{self.path.suffix}"
+        cmd = self.animation._build_ffmpeg_cmd(
+            self.frame_dir,
+            segment,
+            self.fps,
+            start_number=self.next,
+            n_frames=n_frames,
+            output_size=self.output_size,
+            gop=self.segment_frames,
+            **self.encoding,
+        )
+        stderr = TemporaryFile()  # noqa: SIM115, closed once the process is waited for or killed.
+        process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=stderr)
+        self.running.append((process, stderr, monotonic() + self.timeout, cmd))
+        self.segments.append(segment)
+        self.next += n_frames
+
+    def _wait(self, entry):
+        process, stderr, deadline, cmd = entry
+        with stderr:
+            try:
+                returncode = wait_process(process, timeout=max(0.0, deadline - monotonic()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                self.close()
+                print(f"Video segment encoding timed out after {self.timeout} seconds")
+                raise
+            if returncode:
+                stderr.seek(0)
+                error = subprocess.CalledProcessError(returncode, cmd, stderr=stderr.read().decode(errors="replace"))
+                self.close()
+                print(f"Error during video creation: {error}")
+                print(f"Command: {' '.join(cmd)}")
+                print(f"Standard error: {error.stderr}")
+                raise error
+
+
+def _png_size(path):
+    """Returns the (width, height) of the PNG image ``path``, read from its header."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if len(header) < 24 or not header.startswith(b"\x89PNG\r\n\x1a\n") or header[12:16] != b"IHDR":
+        raise ValueError(f"{path} is not a PNG image.")
+    return struct.unpack(">II", header[16:24])
+
+
+def _output_size(frame_size, video_width=None):
+    """Returns the even (width, height) the frames of ``frame_size`` are encoded at, see ``_build_ffmpeg_cmd``."""
+    width, height = frame_size
+    if video_width is None:
+        return width + width % 2, height + height % 2
+    target_width = int(video_width) + int(video_width) % 2
+    return target_width, max(2, 2 * round(height * target_width / width / 2))
+
+
+def _video_size(path):
+    """Returns the (width, height) of the video stream of ``path``, as reported by FFmpeg."""
+    result = subprocess.run(["ffmpeg", "-hide_banner", "-i", str(path)], capture_output=True, text=True, check=False)
+    match = re.search(r"Video:.*?, (\d+)x(\d+)", result.stderr)
+    if match is None:
+        raise RuntimeError(f"Could not read the frame size of {path}: {result.stderr}")
+    return int(match[1]), int(match[2])
@@ -0,0 +1,102 @@
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+def _attach(name):
+    """Attaches to an existing shared memory block without tracking it.
+
+    The block is owned, and eventually unlinked, by the process that created
+    it: the attaching worker must not register it with the resource tracker.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    block = SharedMemory(name=name)
+    resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+class SharedArray:
+    """A numpy array in shared memory, pickled by name.
+
+    Unpickling it in another process attaches to the same memory instead of
+    copying the data. The process creating it owns the memory and must call
+    :meth:`close`.
+
+    Args:
+        shape (tuple[int, ...]): Shape of the array.
+        dtype (np.dtype | str): Dtype of the array.
+    """
+
+    def __init__(self, shape, dtype):
+        self.shape, self.dtype = tuple(shape), np.dtype(dtype).str
+        self._block = SharedMemory(create=True, size=max(1, int(np.prod(self.shape)) * np.dtype(dtype).itemsize))
+        self.name = self._block.name
+        self._owner = True
+
+    @classmethod
+    def from_array(cls, array):
+        """Returns a shared copy of ``array``."""
+        array = np.asarray(array)
+        shared = cls(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @property
+    def array(self):
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=self._block.buf)
+
+    def __getstate__(self):
+        return {"name": self.name, "shape": self.shape, "dtype": self.dtype}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._block = _attach(self.name)
+        self._owner = False
+
+    def close(self):
+        """Releases the memory, and frees it if this process created it."""
+        self._block.close()
+        if self._owner:
+            self._block.unlink()
+
+
+class SharedFrameRing:
+    """Ring of frame slots in shared memory, used to send frames to the render workers.
+
+    The parent writes frame ``k`` into slot ``k % n_slots`` and only sends the
+    slot index to a worker, which reads the frame in place, so frames are
+    neither pickled nor copied through a pipe. A slot is overwritten
+    ``n_slots`` frames later, which must be more than the number of frames
+    dispatched and not rendered yet. Frames can be arrays or tuples of arrays
+    (e.g. ``(u, v)`` pairs), all with the shape and dtype of the first frame.
+
+    Args:
+        frame (np.ndarray | tuple[np.ndarray, ...]): First frame, giving the
+            shape and dtype of the slots.
+        n_slots (int): Number of slots.
+    """
+
+    def __init__(self, frame, n_slots):
+        components = frame if isinstance(frame, tuple) else (frame,)
+        self.is_tuple = isinstance(frame, tuple)
+        self.n_slots = n_slots
+        self.components = [SharedArray((n_slots, *np.shape(c)), np.asarray(c).dtype) for c in components]
+
+    def put(self, k, frame):
+        """Writes frame ``k`` into its slot and returns the slot index."""
+        slot = k % self.n_slots
+        for component, values in zip(self.components, frame if self.is_tuple else (frame,), strict=True):
+            component.array[slot] = values
+        return slot
+
+    def get(self, slot):
+        """Returns the frame in ``slot``, as a view of the shared memory."""
+        frame = tuple(component.array[slot] for component in self.components)
+        return frame if self.is_tuple else frame[0]
+
+    def close(self):
+        for component in self.components:
+            component.close()
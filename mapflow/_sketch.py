@@ -0,0 +1,198 @@
+import numpy as np
+
+_MAX_BUCKETS = 2**20
+_TINY = np.finfo(np.float64).tiny
+
+
+class _BucketStore:
+    """Dense counts of logarithmic bucket indices, starting at ``offset``.
+
+    At most ``_MAX_BUCKETS`` buckets are kept: when the range of indices
+    grows beyond that, the lowest buckets (the values closest to zero) are
+    collapsed into a single one.
+    """
+
+    def __init__(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.offset = 0
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def copy(self):
+        store = _BucketStore()
+        store.counts, store.offset = self.counts.copy(), self.offset
+        return store
+
+    def add(self, index):
+        """Counts the bucket indices in ``index``."""
+        if index.size == 0:
+            return
+        high = int(index.max())
+        low = max(int(index.min()), high - _MAX_BUCKETS + 1)
+        if index.min() < low:
+            index = np.maximum(index, low)
+        self.add_counts(low, np.bincount(index - low))
+
+    def add_counts(self, low, counts):
+        """Adds ``counts`` for the consecutive buckets starting at index ``low``."""
+        new_low, new_high = low, low + counts.size - 1
+        if self.counts.size:
+            new_low = min(new_low, self.offset)
+            new_high = max(new_high, self.offset + self.counts.size - 1)
+        new_low = max(new_low, new_high - _MAX_BUCKETS + 1)
+        self._resize(new_low, new_high)
+        if low < new_low:
+            counts = np.concatenate(([counts[: new_low - low].sum()], counts[new_low - low :]))
+            low = new_low
+        start = low - self.offset
+        self.counts[start : start + counts.size] += counts
+
+    def _resize(self, low, high):
+        if self.counts.size and low == self.offset and high == self.offset + self.counts.size - 1:
+            return
+        counts = np.zeros(high - low + 1, dtype=np.int64)
+        old, start = self.counts, self.offset - low
+        if old.size and start < 0:
+            counts[0] += old[:-start].sum()
+            old, start = old[-start:], 0
+        counts[start : start + old.size] += old
+        self.counts, self.offset = counts, low
+
+
+class QuantileSketch:
+    """Mergeable sketch of a distribution giving quantiles with a bounded relative error.
+
+    Values are counted in logarithmically spaced buckets, separately for
+    positive and negative values, in the manner of DDSketch. Updating the
+    sketch is O(n) in the number of values (no sort), sketches of different
+    frames can be merged, and any quantile of the union is then known within
+    ``relative_accuracy`` of the exact ``np.nanpercentile`` value. NaN and
+    infinite values are ignored.
+
+    Args:
+        relative_accuracy (float, optional): Relative error of the quantiles.
+            Defaults to 1e-4.
+
+    .. code-block:: python
+
+        sketch = QuantileSketch()
+        for frame in frames:
+            sketch.update(frame)
+        vmin, vmax = sketch.quantile(0.01), sketch.quantile(99.9)
+
+    """
+
+    def __init__(self, relative_accuracy=1e-4):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be between 0 and 1, got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self._gamma)
+        self.positive = _BucketStore()
+        self.negative = _BucketStore()
+        self.zero_count = 0
+
+    @property
+    def count(self):
+        """Number of values counted in the sketch."""
+        return self.positive.total + self.negative.total + self.zero_count
+
+    def update(self, values):
+        """Adds the finite values of ``values`` to the sketch."""
+        values = np.asarray(values)
+        if values.dtype.kind != "f":
+            values = values.astype(np.float64)
+        values = values.ravel()
+        values = values[np.isfinite(values)]
+        positive = values[values > _TINY]
+        negative = values[values < -_TINY]
+        self.zero_count += values.size - positive.size - negative.size
+        self.positive.add(self._index(positive))
+        self.negative.add(self._index(-negative))
+        return self
+
+    def merge(self, other):
+        """Adds the values counted in ``other`` to the sketch."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged.")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            if other_store.counts.size:
+                store.add_counts(other_store.offset, other_store.counts)
+        self.zero_count += other.zero_count
+        return self
+
+    def to_arrays(self):
+        """Returns the state of the sketch as a dictionary of numpy arrays, e.g. to store it with ``np.savez``."""
+        return {
+            "relative_accuracy": np.array(self.relative_accuracy),
+            "zero_count": np.array(self.zero_count),
+            "positive_offset": np.array(self.positive.offset),
+            "positive_counts": self.positive.counts,
+            "negative_offset": np.array(self.negative.offset),
+            "negative_counts": self.negative.counts,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuilds a sketch from the output of ``to_arrays``."""
+        sketch = cls(float(arrays["relative_accuracy"]))
+        sketch.zero_count = int(arrays["zero_count"])
+        for name, store in (("positive", sketch.positive), ("negative", sketch.negative)):
+            store.offset = int(arrays[f"{name}_offset"])
+            store.counts = np.asarray(arrays[f"{name}_counts"], dtype=np.int64)
+        return sketch
+
+    def quantile(self, q, mode="linear"):
+        """Returns the ``q``-th percentile of the counted values.
+
+        Args:
+            q (float): Percentile, between 0 and 100. Order statistics are
+                linearly interpolated, as in ``np.nanpercentile``.
+            mode (str, optional): "linear" for all the values, "positive" for
+                the strictly positive values only (log scales), or "abs" for
+                the absolute values (divergent scales). Defaults to "linear".
+
+        Returns:
+            float: The percentile, or NaN if there are no values.
+        """
+        values, counts = self._sorted_buckets(mode)
+        total = counts.sum()
+        if total == 0:
+            return np.nan
+        rank = q / 100 * (total - 1)
+        low = int(np.floor(rank))
+        cumulative = np.cumsum(counts)
+        value_low = values[np.searchsorted(cumulative, low, side="right")]
+        value_high = values[np.searchsorted(cumulative, min(low + 1, total - 1), side="right")]
+        return float(value_low + (rank - low) * (value_high - value_low))
+
+    def _index(self, magnitudes):
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def _values(self, store):
+        index = np.arange(store.offset, store.offset + store.counts.size)
+        return 2 * np.exp(index * self._log_gamma) / (self._gamma + 1)
+
+    def _sorted_buckets(self, mode):
+        """Returns the representative values and counts of the buckets, in ascending order."""
+        if mode == "linear":
+            parts = [
+                (-self._values(self.negative)[::-1], self.negative.counts[::-1]),
+                (np.zeros(1), np.array([self.zero_count])),
+                (self._values(self.positive), self.positive.counts),
+            ]
+        elif mode == "positive":
+            parts = [(self._values(self.positive), self.positive.counts)]
+        elif mode == "abs":
+            magnitudes = self.positive.copy()
+            if self.negative.counts.size:
+                magnitudes.add_counts(self.negative.offset, self.negative.counts)
+            parts = [(np.zeros(1), np.array([self.zero_count])), (self._values(magnitudes), magnitudes.counts)]
+        else:
+            raise ValueError(f"mode must be 'linear', 'positive' or 'abs', got {mode!r}")
+        values = np.concatenate([part[0] for part in parts])
+        counts = np.concatenate([part[1] for part in parts])
+        keep = counts > 0
+        return values[keep], counts[keep]
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+# Render settings that change the pixels of a frame. Encoding settings (fps,
+# crf, the video width once the figure size is resolved) are deliberately not
+# part of it, and neither are the titles, which are keyed per frame.
+RENDER_SETTINGS = ("figsize", "dpi", "label", "pad_inches", "engine", "frame_box", "subsample", "arrows_kwgs")
+NORM_ATTRIBUTES = ("vmin", "vmax", "clip", "vcenter", "halfrange", "linthresh", "linscale", "base", "gamma")
+
+
+class FrameStore:
+    """Persistent directory of rendered frames, keyed by what they depict.
+
+    The key of a frame hashes the render settings, its title and the values
+    of the interpolated frame, which stand for its source frames and their
+    interpolation weight. A frame whose key is already stored is not rendered
+    again, so an interrupted run resumes where it stopped, and changing only
+    the encoding settings re-encodes the stored frames. Frames rendered with
+    settings that are no longer used stay in the directory until it is
+    removed.
+
+    Args:
+        directory (str | Path): Work directory, created if needed.
+        render_key (str): Key of the render settings, see :meth:`render_key`.
+    """
+
+    def __init__(self, directory, render_key):
+        self.directory = Path(directory)
+        self.frames = self.directory / "frames"
+        self.frames.mkdir(parents=True, exist_ok=True)
+        self.render_key = render_key
+        self.names = []
+
+    @classmethod
+    def render_key(cls, animation, settings):
+        """Returns the key of the plot of ``animation`` and of the render ``settings``."""
+        from . import __version__
+
+        digest = hashlib.sha256(repr((__version__, type(animation).__name__)).encode())
+        plot = animation.plot
+        for array in (plot.x, plot.y):
+            _update(digest, array)
+        digest.update(plot.crs.to_wkt().encode())
+        digest.update(repr((plot.border_tolerance, plot.borders.get_linewidth().tolist())).encode())
+        for segment in plot.borders.get_segments():
+            _update(digest, segment)
+        norm = settings["norm"]
+        norm_state = None if norm is None else [type(norm).__name__] + [getattr(norm, a, None) for a in NORM_ATTRIBUTES]
+        digest.update(repr(norm_state).encode())
+        _update(digest, cls._colors(settings["cmap"]))
+        digest.update(repr([settings.get(name) for name in RENDER_SETTINGS]).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _colors(cmap):
+        import matplotlib
+        from matplotlib.colors import Colormap
+
+        if not isinstance(cmap, Colormap):
+            cmap = matplotlib.colormaps[cmap]
+        return cmap(np.linspace(0, 1, cmap.N))
+
+    def name(self, frame, title):
+        """Returns the file name of ``frame`` (an array, or a tuple of arrays) rendered with ``title``."""
+        digest = hashlib.sha256(self.render_key.encode())
+        digest.update(repr(title).encode())
+        for array in frame if isinstance(frame, tuple) else (frame,):
+            _update(digest, array)
+        return f"{digest.hexdigest()}.png"
+
+    def __contains__(self, name):
+        return (self.frames / name).is_file()
+
+    def missing(self, frames, titles):
+        """Yields the ``(index, frame, name)`` tasks of the frames of ``frames`` that are not stored yet.
+
+        The names of all the frames, stored or not, are recorded in order in
+        ``names``.
+        """
+        self.names = []
+        for k, frame in enumerate(frames):
+            name = self.name(frame, titles[k] if titles and k < len(titles) else None)
+            self.names.append(name)
+            if name not in self:
+                yield k, frame, name
+
+    @contextmanager
+    def sequence(self, names):
+        """Yields a directory exposing the stored frames ``names`` as the numbered sequence FFmpeg reads.
+
+        The frames are hard-linked (or symlinked, or copied where links are
+        not supported) into a temporary directory of the work directory.
+        """
+        with TemporaryDirectory(dir=self.directory, prefix=".encode-") as tempdir:
+            for k, name in enumerate(names):
+                _link(self.frames / name, Path(tempdir) / f"frame_{k:08d}.png")
+            yield tempdir
+
+
+def _update(digest, array):
+    array = np.ascontiguousarray(array)
+    digest.update(repr((array.dtype.str, array.shape)).encode())
+    digest.update(array.data)
+
+
+def _link(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        try:
+            os.symlink(source.resolve(), target)
+        except OSError:
+            shutil.copyfile(source, target)
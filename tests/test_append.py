@@ -0,0 +1,115 @@
+import json
+import re
+import subprocess
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from mapflow import Animation, animate
+from mapflow._append import AppendState
+
+
+def count_frames(path):
+    result = subprocess.run(
+        ["ffmpeg", "-i", str(path), "-map", "0:v:0", "-f", "null", "-"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return int(re.findall(r"frame=\s*(\d+)", result.stderr)[-1])
+
+
+@pytest.fixture
+def grid():
+    x, y = np.linspace(-10, 10, 16), np.linspace(40, 50, 8)
+    data = np.random.default_rng(0).random((6, 8, 16))
+    return x, y, data
+
+
+def test_append_renders_only_new_frames(tmp_path, grid):
+    x, y, data = grid
+    animation, path = Animation(x, y), tmp_path / "out.mp4"
+    options = {"upsample_ratio": 2, "n_jobs": 2, "dpi": 50, "append": True, "report": True}
+    first = animation(data[:4], path, **options)
+    assert first.n_frames == 7 and count_frames(path) == 7
+    state = json.loads(AppendState.paths(path)[0].read_text())
+    assert state["n_source"] == 4
+    # The color range of the first run is kept, whatever the new data.
+    report = animation(data[4:] * 10, path, **options)
+    assert report.n_frames == 4
+    assert report.worker_stages["render"].calls == 5
+    assert count_frames(path) == 11
+    assert json.loads(AppendState.paths(path)[0].read_text()) == {**state, "n_source": 6}
+    np.testing.assert_array_equal(AppendState.load(path)[1], data[-1] * 10)
+
+
+def test_append_skips_known_time_steps(tmp_path, air_data):
+    path = tmp_path / "out.mp4"
+    options = {"n_jobs": 1, "upsample_ratio": 1, "dpi": 50, "append": True, "report": True}
+    animate(air_data.isel(time=slice(0, 5)), path, **options)
+    # A rolling window: two known time steps and three new ones.
+    report = animate(air_data.isel(time=slice(3, 8)), path, **options)
+    assert report.n_frames == 3
+    assert count_frames(path) == 8
+    state, _ = AppendState.load(path)
+    assert np.datetime64(state.last_time) == air_data.time.values[7]
+    assert state.last_title.endswith(str(air_data.time.dt.strftime("%Y-%m-%dT%H").values[7]))
+    assert animate(air_data.isel(time=slice(3, 8)), path, **options).n_frames == 0
+
+
+@pytest.mark.parametrize(
+    "changed",
+    [{"fps": 10}, {"upsample_ratio": 5}, {"duration": 2}, {"dpi": 60}, {"crf": 30}, {"video_width": 320}],
+)
+def test_append_rejects_other_settings(tmp_path, grid, changed):
+    x, y, data = grid
+    animation, path = Animation(x, y), tmp_path / "out.mp4"
+    options = {"upsample_ratio": 2, "n_jobs": 1, "dpi": 50, "append": True}
+    animation(data[:4], path, **options)
+    size = path.stat().st_size
+    options = {**options, **changed}
+    if "duration" in changed:
+        del options["upsample_ratio"]
+    with pytest.raises(ValueError, match=r"append(ing| to)"):
+        animation(data[4:], path, **options)
+    assert path.stat().st_size == size
+    assert AppendState.load(path)[0].n_source == 4
+
+
+def test_append_without_state_creates_the_video(tmp_path, grid):
+    x, y, data = grid
+    path = tmp_path / "out.mp4"
+    Animation(x, y)(data, path, upsample_ratio=1, n_jobs=1, dpi=50)
+    assert not AppendState.paths(path)[0].exists()
+    Animation(x, y)(data, path, upsample_ratio=1, n_jobs=1, dpi=50, append=True)
+    assert count_frames(path) == 6
+    assert AppendState.load(path)[0].n_source == 6
+
+
+@pytest.mark.parametrize("norm", ["TwoSlopeNorm(vcenter=0.5, vmin=0, vmax=2)", "LogNorm(vmin=0.1, vmax=1)"])
+def test_append_state_norm(norm):
+    import matplotlib.colors
+
+    norm = eval(norm, vars(matplotlib.colors))
+    state = AppendState(fps=24, upsample_ratio=2, norm=AppendState.describe_norm(norm), n_source=1)
+    restored = state.make_norm()
+    assert type(restored) is type(norm)
+    assert (restored.vmin, restored.vmax) == (norm.vmin, norm.vmax)
+    json.dumps(state.norm)
+
+
+def test_append_state_new_steps():
+    times = pd.date_range("2024-01-01", periods=4, freq="h")
+    data = xr.DataArray(np.zeros((4, 2, 2)), dims=("time", "y", "x"), coords={"time": times})
+    state = AppendState(fps=24, upsample_ratio=1, norm={}, n_source=2, last_time=AppendState.time_of(data[:2]))
+    np.testing.assert_array_equal(state.new_steps(data), [False, False, True, True])
+    assert state.new_steps(data.values) is None
+
+
+def test_concat_cmd_keeps_faststart(tmp_path):
+    cmd = Animation._build_concat_cmd(tmp_path / "inputs.txt", "out.mp4")
+    assert cmd[cmd.index("-c") + 1] == "copy"
+    assert cmd[cmd.index("-movflags") + 1] == "+faststart"
+    assert "-movflags" not in Animation._build_concat_cmd(tmp_path / "inputs.txt", "out.avi")
@@ -0,0 +1,95 @@
+import asyncio
+import multiprocessing
+import subprocess
+import time
+
+import numpy as np
+import pytest
+
+from mapflow import Animation, AnimationReport, animate_in_executor
+from mapflow._async import run_in_executor
+
+
+@pytest.fixture
+def grid():
+    x, y = np.linspace(-10, 10, 16), np.linspace(40, 50, 8)
+    data = np.random.default_rng(0).random((4, 8, 16))
+    return x, y, data
+
+
+def test_render_in_executor_does_not_block_the_event_loop(tmp_path, grid):
+    x, y, data = grid
+    animation = Animation(x, y)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        reports = await asyncio.gather(
+            *(
+                animation.render_in_executor(
+                    data, tmp_path / f"out{i}.mp4", upsample_ratio=2, n_jobs=1, dpi=50, report=True
+                )
+                for i in range(2)
+            )
+        )
+        task.cancel()
+        return ticks, reports
+
+    ticks, reports = asyncio.run(main())
+    assert ticks > 0
+    assert all(isinstance(report, AnimationReport) and report.n_frames == 7 for report in reports)
+    assert (tmp_path / "out0.mp4").stat().st_size > 0 and (tmp_path / "out1.mp4").stat().st_size > 0
+
+
+@pytest.mark.parametrize("options", [{}, {"pipe": True, "engine": "numpy"}, {"segment_frames": 8}])
+def test_render_in_executor_cancellation_terminates_workers(tmp_path, options):
+    x, y = np.linspace(-10, 10, 64), np.linspace(40, 50, 32)
+    data = np.random.default_rng(0).random((60, 32, 64))
+
+    async def main():
+        task = asyncio.create_task(
+            Animation(x, y).render_in_executor(data, tmp_path / "out.mp4", n_jobs=2, dpi=80, **options)
+        )
+        await asyncio.sleep(1)
+        task.cancel()
+        start = time.perf_counter()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.perf_counter() - start
+
+    assert asyncio.run(main()) < 5
+    assert not multiprocessing.active_children()
+    assert not (tmp_path / "out.mp4").exists() or "pipe" in options
+
+
+def test_cancellation_kills_ffmpeg(tmp_path):
+    async def main():
+        task = asyncio.create_task(run_in_executor(Animation._run_ffmpeg, ["sleep", "30"], 60))
+        await asyncio.sleep(0.3)
+        start = time.perf_counter()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.perf_counter() - start
+
+    assert asyncio.run(main()) < 2
+
+
+def test_async_ffmpeg_errors():
+    with pytest.raises(subprocess.CalledProcessError):
+        asyncio.run(run_in_executor(Animation._run_ffmpeg, ["false"], 10))
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(run_in_executor(Animation._run_ffmpeg, ["sleep", "5"], 0.2))
+
+
+def test_animate_in_executor(tmp_path, air_data):
+    report = asyncio.run(animate_in_executor(air_data, tmp_path / "out.mp4", n_jobs=1, upsample_ratio=1, report=True))
+    assert report.n_frames == len(air_data)
+    assert (tmp_path / "out.mp4").stat().st_size > 0
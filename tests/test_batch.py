@@ -0,0 +1,93 @@
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+import mapflow._batch
+import mapflow._render
+from mapflow import BatchResult, animate_batch
+from mapflow._batch import SharedPool
+from mapflow._render import RenderJob, init_batch_worker, render_batch_task
+
+
+def test_animate_batch(tmp_path, air_data, air_temperature_gradient_data):
+    u, v = air_temperature_gradient_data["dTdx"], air_temperature_gradient_data["dTdy"]
+    options = {"upsample_ratio": 1, "dpi": 50, "report": True}
+    specs = [
+        {"da": air_data, "path": tmp_path / "a.mp4", **options},
+        {"da": air_data.isel(lat=slice(4, None)), "path": tmp_path / "b.mp4", **options},
+        {"da": air_data, "path": tmp_path / "c.mp4", "cmap": "missing-cmap", **options},
+        {"u": u, "v": v, "path": tmp_path / "d.mp4", **options},
+        {"da": air_data, "path": tmp_path / "e.mp4", "engine": "missing-engine"},
+    ]
+    results = animate_batch(specs, n_jobs=2)
+    assert all(isinstance(result, BatchResult) for result in results)
+    assert [result.path for result in results] == [spec["path"] for spec in specs]
+    assert [result.ok for result in results] == [True, True, False, True, False]
+    # Failures in the workers and in the main process are reported for their own animation.
+    assert "missing-cmap" in str(results[2].error)
+    assert isinstance(results[4].error, ValueError)
+    for result in (results[0], results[1], results[3]):
+        assert result.path.stat().st_size > 0
+        assert result.report.n_frames == len(air_data)
+    workers = set().union(*(result.report.workers for result in results if result.ok))
+    assert len(workers) <= 2
+    # Each worker loads the render job of an animation once.
+    for result in (results[0], results[1], results[3]):
+        assert result.report.worker_stages["load"].calls <= len(result.report.workers)
+
+
+def test_batch_workers_keep_the_jobs_of_concurrent_animations(tmp_path, monkeypatch):
+    loads = []
+    paths = []
+    for i in range(10):
+        paths.append(tmp_path / f"job_{i}.pkl")
+        with open(paths[-1], "wb") as f:
+            pickle.dump(RenderJob(None, {}), f)
+    monkeypatch.setattr(mapflow._render, "_BATCH_JOBS", OrderedDict())
+    monkeypatch.setattr(mapflow._render, "_BATCH_JOBS_MAX", 1)
+    real_load = pickle.load
+    monkeypatch.setattr(pickle, "load", lambda f: loads.append(f.name) or real_load(f))
+    init_batch_worker(len(paths))
+    # The tasks of the concurrent animations are interleaved.
+    for _ in range(5):
+        for path in paths:
+            assert render_batch_task((str(path), str, 1)) == "1"
+    assert len(loads) == len(paths)
+
+
+def test_animate_batch_schedules_largest_first(tmp_path, air_data, monkeypatch):
+    started = []
+    monkeypatch.setattr(mapflow._batch, "_run", lambda spec, n_jobs: started.append(spec["path"]))
+    sizes = [4, 8, 2, 6]
+    specs = [{"da": air_data.isel(time=slice(n)), "path": n} for n in sizes]
+    results = animate_batch(specs, n_jobs=1, max_concurrent=1)
+    assert started == sorted(sizes, reverse=True)
+    assert all(result.ok for result in results)
+
+
+def test_shared_pool_shares_plot_models(tmp_path):
+    from pyproj import CRS
+
+    from mapflow import Animation
+
+    x, y = np.linspace(-10, 10, 16), np.linspace(40, 50, 8)
+    crs = CRS.from_epsg(4326)
+    with SharedPool(1, tmp_path) as shared:
+        first = shared.animation(Animation, x, y, crs, verbose=0, borders=None)
+        assert shared.animation(Animation, x.copy(), y, crs, verbose=0, borders=None) is first
+        assert shared.animation(Animation, x + 1, y, crs, verbose=0, borders=None) is not first
+
+
+def test_animate_batch_empty():
+    assert animate_batch([]) == []
+
+
+@pytest.mark.parametrize("options", [{"transport": "shm"}, {"worker_interpolation": True, "chunksize": 2}])
+def test_animate_batch_transports(tmp_path, air_data, options):
+    specs = [
+        {"da": air_data, "path": tmp_path / f"{i}.mp4", "upsample_ratio": 2, "dpi": 50, **options} for i in range(2)
+    ]
+    results = animate_batch(specs, n_jobs=2)
+    assert all(result.ok for result in results), [result.error for result in results]
@@ -0,0 +1,123 @@
+import gc
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+from pyproj import CRS
+from shapely.geometry import LineString, box
+
+import mapflow._borders
+from mapflow import PlotModel, border_cache_info, clear_border_cache
+from mapflow._borders import WORLD_BORDERS, _intersecting, _round_bbox, border_lines, simplify_lines
+
+
+@pytest.fixture(autouse=True)
+def _empty_border_cache():
+    clear_border_cache()
+    yield
+    clear_border_cache()
+
+
+def test_plot_models_of_a_same_domain_share_borders():
+    x, y = np.linspace(-5, 10, 20), np.linspace(40, 55, 15)
+    first = PlotModel(x, y)
+    # Slightly different domain, same rounded bounding box.
+    second = PlotModel(x + 1e-3, y)
+    info = border_cache_info()
+    assert (info.misses, info.hits, info.currsize) == (1, 1, 1)
+    assert len(first.borders.get_segments()) == len(second.borders.get_segments()) > 0
+
+
+def test_border_cache_on_disk(tmp_path):
+    x, y = np.linspace(-5, 10, 20), np.linspace(40, 55, 15)
+    expected = PlotModel(x, y, border_cache=tmp_path).borders.get_segments()
+    clear_border_cache()
+    cached = PlotModel(x, y, border_cache=tmp_path).borders.get_segments()
+    assert border_cache_info().disk_hits == 1
+    assert len(cached) == len(expected)
+    for a, b in zip(cached, expected, strict=True):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_custom_borders_are_keyed_by_geometry():
+    crs = CRS.from_epsg(4326)
+    bbox = (0.0, 0.0, 10.0, 10.0)
+    small = gpd.GeoSeries([box(1, 1, 2, 2)], crs=4326)
+    large = gpd.GeoSeries([box(1, 1, 5, 5)], crs=4326)
+    border_lines(small, crs, bbox)
+    lines = border_lines(large, crs, bbox)
+    assert border_cache_info().misses == 2
+    assert lines[0][:, 0].max() == 5
+    assert border_lines(gpd.GeoSeries([box(1, 1, 5, 5)], crs=4326), crs, bbox) is lines
+
+
+def test_custom_borders_are_hashed_once(monkeypatch):
+    digests = []
+    real_digest = mapflow._borders._geometry_digest
+    monkeypatch.setattr(mapflow._borders, "_geometry_digest", lambda b: digests.append(b) or real_digest(b))
+    crs, borders = CRS.from_epsg(4326), gpd.GeoSeries([box(1, 1, 5, 5)], crs=4326)
+    lines = border_lines(borders, crs, (0.0, 0.0, 10.0, 10.0))
+    assert border_lines(borders, crs, (0.0, 0.0, 10.0, 10.0)) is lines
+    border_lines(borders, crs, (0.0, 0.0, 20.0, 20.0))
+    assert len(digests) == 1
+    del borders, digests[:]
+    gc.collect()
+    assert not mapflow._borders._DIGESTS
+
+
+def test_round_bbox_is_outward():
+    xmin, ymin, xmax, ymax = _round_bbox((-4.93, 40.23, 10.07, 55.12))
+    np.testing.assert_allclose((xmin, ymin, xmax, ymax), (-5.0, 40.2, 10.1, 55.2))
+    assert xmin <= -4.93 and ymin <= 40.23 and xmax >= 10.07 and ymax >= 55.12
+
+
+def test_invalid_borders():
+    with pytest.raises(TypeError, match="borders must be"):
+        PlotModel(np.arange(3), np.arange(3), borders="world")
+
+
+def test_simplify_lines_within_tolerance():
+    t = np.linspace(0, 2 * np.pi, 1000)
+    line = np.column_stack([np.cos(t), np.sin(t) + 0.01 * np.sin(50 * t)])
+    (simplified,) = simplify_lines([line], 0.05)
+    assert len(simplified) < len(line) / 10
+    np.testing.assert_array_equal(simplified[[0, -1]], line[[0, -1]])
+    assert shapely.hausdorff_distance(LineString(line), LineString(simplified)) <= 0.05 + 1e-9
+    assert simplify_lines([line], 0)[0] is line
+
+
+def test_borders_simplified_once_per_figure():
+    x, y = np.linspace(-180, 180, 72), np.linspace(-90, 90, 36)
+    plot = PlotModel(x, y)
+    full = sum(len(line) for line in plot.borders.get_segments())
+    borders = plot._borders_for((8, 4), 100)
+    assert sum(len(line) for line in borders.get_segments()) < full / 2
+    assert plot._borders_for((8, 4), 100) is borders
+    assert plot._borders_for((16, 8), 100) is not borders
+    unsimplified = PlotModel(x, y, border_tolerance=None)
+    assert unsimplified._borders_for((8, 4), 100) is unsimplified.borders
+
+
+@pytest.mark.parametrize(
+    ("epsg", "bbox"),
+    [
+        (4326, (-5, 40, 10, 55)),
+        (2154, (1e5, 6e6, 1.2e6, 7.2e6)),
+        # Pacific mercator domain crossing the antimeridian.
+        (3832, (-4e6, -1e6, 4e6, 1e6)),
+    ],
+)
+def test_intersecting_keeps_the_clipped_features(epsg, bbox):
+    world = gpd.read_file(WORLD_BORDERS)
+    crs = CRS.from_epsg(epsg)
+    selected = _intersecting(world, crs, bbox)
+    assert len(selected) < len(world) / 4
+    expected = world.to_crs(crs).clip(bbox)
+    assert set(expected.index) <= set(selected.index)
+
+
+def test_intersecting_splits_at_the_antimeridian():
+    features = gpd.GeoSeries([box(170, -5, 175, 5), box(-175, -5, -170, 5), box(0, -5, 5, 5)], crs=4326)
+    selected = _intersecting(features, CRS.from_epsg(3832), (-4e6, -1e6, 4e6, 1e6))
+    assert list(selected.index) == [0, 1]
@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from mapflow import Animation
+from mapflow._cache import DiskCache, data_fingerprint
+from mapflow._classic import PlotModel
+
+
+def _write_netcdf(path, seed=0):
+    rng = np.random.default_rng(seed)
+    da = xr.DataArray(
+        rng.random((4, 6, 8)).astype("float32"),
+        dims=("time", "lat", "lon"),
+        coords={
+            "time": np.arange(np.datetime64("2020-01-01"), np.datetime64("2020-01-05")),
+            "lat": np.linspace(40, 50, 6),
+            "lon": np.linspace(-5, 5, 8),
+        },
+        name="field",
+    )
+    da.to_netcdf(path)
+    return da
+
+
+def test_disk_cache_round_trip_and_eviction(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=3000)
+    assert cache.get("missing") is None
+    cache.set("a", {"x": np.arange(100)})
+    np.testing.assert_array_equal(cache.get("a")["x"], np.arange(100))
+    os.utime(tmp_path / "a.npz", ns=(0, 0))
+    cache.set("b", {"x": np.arange(100)})
+    cache.set("c", {"x": np.arange(100)})
+    # "a" is the least recently used entry and is evicted first.
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_data_fingerprint(tmp_path):
+    nc_path = tmp_path / "data.nc"
+    da = _write_netcdf(nc_path)
+    assert data_fingerprint(da) is None
+    assert data_fingerprint(da.values) is None
+    with xr.open_dataarray(nc_path) as lazy:
+        fingerprint = data_fingerprint(lazy)
+        assert fingerprint is not None
+        assert data_fingerprint(lazy) == fingerprint
+        assert data_fingerprint(lazy.isel(time=slice(1, None))) != fingerprint
+        assert data_fingerprint(lazy.isel(lon=slice(0, 3))) != data_fingerprint(lazy.isel(lon=slice(3, 6)))
+        assert data_fingerprint(lazy.isel(time=[0, 1, 3])) != data_fingerprint(lazy.isel(time=[0, 2, 3]))
+        # Once loaded, the values may be modified in memory.
+        loaded = lazy.load()
+        loaded[0] = 0
+        assert data_fingerprint(loaded) is None
+    _write_netcdf(nc_path, seed=1)
+    os.utime(nc_path, ns=(0, 0))
+    with xr.open_dataarray(nc_path) as lazy:
+        assert data_fingerprint(lazy) != fingerprint
+
+
+def test_norm_cache_hit_skips_data_pass(tmp_path):
+    nc_path = tmp_path / "data.nc"
+    da = _write_netcdf(nc_path)
+
+    def frames():
+        raise AssertionError("frames should not be consumed on a cache hit")
+        yield
+
+    with xr.open_dataarray(nc_path) as lazy:
+        cache = Animation._norm_cache(tmp_path / "cache", lazy)
+        first = PlotModel._norm_streaming(iter(lazy.values), None, None, 1, 99, None, log=False, cache=cache)
+        cached = PlotModel._norm_streaming(frames(), None, None, 1, 99, None, log=False, cache=cache)
+        assert (cached.vmin, cached.vmax) == (first.vmin, first.vmax)
+        # Other quantiles are served by the same cached sketch.
+        other = PlotModel._norm_streaming(frames(), None, None, 5, 95, None, log=True, cache=cache)
+    exact = PlotModel._norm(da.values, None, None, 5, 95, None, log=True)
+    assert other.vmin == pytest.approx(exact.vmin, rel=1e-3)
+    assert other.vmax == pytest.approx(exact.vmax, rel=1e-3)
+    assert Animation._norm_cache(tmp_path / "cache", da) is None
+    assert Animation._norm_cache(None, lazy) is None
+
+
+def test_norm_cache_of_disjoint_slices(tmp_path):
+    nc_path = tmp_path / "data.nc"
+    da = _write_netcdf(nc_path)
+    da[1, :, :4] += 10
+    da.to_netcdf(nc_path)
+    with xr.open_dataarray(nc_path) as lazy:
+        parts = [
+            lazy.isel(lon=slice(0, 4)),
+            lazy.isel(lon=slice(4, 8)),
+            lazy.isel(time=[0, 1, 3]),
+            lazy.isel(time=[0, 2, 3]),
+        ]
+        limits = []
+        for part in parts:
+            cache = Animation._norm_cache(tmp_path / "cache", part)
+            norm = PlotModel._norm_streaming(iter(part.values), None, None, 0, 100, None, log=False, cache=cache)
+            limits.append(norm.vmax)
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 4
+    assert limits[0] > 10 > limits[1]
+    assert limits[2] > 10 > limits[3]
+
+
+def test_animate_with_norm_cache(tmp_path):
+    nc_path = tmp_path / "data.nc"
+    _write_netcdf(nc_path)
+    with xr.open_dataarray(nc_path) as lazy:
+        animation = Animation(x=lazy["lon"].values, y=lazy["lat"].values)
+        animation(lazy, tmp_path / "out.mp4", dpi=60, norm_cache=tmp_path / "cache")
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 1
+    assert (tmp_path / "out.mp4").stat().st_size > 0
@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from mapflow import Animation, QuiverAnimation
+from mapflow._classic import PlotModel
+from mapflow._dask import dask_sketch
+
+dask = pytest.importorskip("dask")
+
+
+def _field(n_frames=7, seed=0):
+    rng = np.random.default_rng(seed)
+    return xr.DataArray(
+        rng.normal(size=(n_frames, 12, 16)),
+        dims=("time", "lat", "lon"),
+        coords={"lat": np.linspace(40, 51, 12), "lon": np.linspace(0, 15, 16)},
+    )
+
+
+def test_dask_sketch_matches_frame_pass():
+    da = _field().chunk(time=2, lat=5)
+    sketch = dask_sketch(da)
+    assert sketch.count == da.size
+    for q in (0.1, 50, 99.9):
+        assert sketch.quantile(q) == pytest.approx(np.nanpercentile(da.values, q), rel=1e-3)
+
+
+def test_dask_backend_norm_does_not_iterate_frames():
+    da = _field().chunk(time=3)
+
+    def frames():
+        raise AssertionError("frames should not be consumed by the dask reduction")
+        yield
+
+    norm = PlotModel._norm_streaming(
+        frames(), None, None, 1, 99, None, log=False, compute_sketch=lambda: dask_sketch(da)
+    )
+    exact = PlotModel._norm(da.values, None, None, 1, 99, None, log=False)
+    assert norm.vmin == pytest.approx(exact.vmin, rel=1e-3)
+    assert norm.vmax == pytest.approx(exact.vmax, rel=1e-3)
+
+
+@pytest.mark.parametrize("scheduler", ["synchronous", "threads", "processes"])
+def test_dask_backend_renders_every_frame(tmp_path, monkeypatch, scheduler):
+    da = _field().chunk(time=3)
+    animation = Animation(x=da["lon"].values, y=da["lat"].values)
+    rendered = {}
+
+    def create_video(tempdir, path, fps, timeout, crf=20, video_width=None):
+        rendered["frames"] = sorted(p.name for p in Path(tempdir).glob("*.png"))
+
+    monkeypatch.setattr(Animation, "_create_video", staticmethod(create_video))
+    with dask.config.set(scheduler=scheduler):
+        animation(da, tmp_path / "out.mp4", dpi=40, upsample_ratio=3, fps=24, backend="dask")
+    # 7 source frames upsampled 3x: 19 frames, with no gaps or duplicates at chunk boundaries.
+    assert rendered["frames"] == [f"frame_{k:08d}.png" for k in range(19)]
+
+
+def test_dask_backend_video(tmp_path):
+    da = _field(n_frames=4).chunk(time=2)
+    animation = Animation(x=da["lon"].values, y=da["lat"].values)
+    with dask.config.set(scheduler="synchronous"):
+        animation(da, tmp_path / "out.mp4", dpi=40, title="field", backend="dask")
+    assert (tmp_path / "out.mp4").stat().st_size > 0
+
+
+def test_dask_backend_quiver(tmp_path):
+    u, v = _field(n_frames=4).chunk(time=2), _field(n_frames=4, seed=1).chunk(time=2)
+    animation = QuiverAnimation(x=u["lon"].values, y=u["lat"].values)
+    with dask.config.set(scheduler="synchronous"):
+        animation.quiver(u, v, tmp_path / "out.mp4", dpi=40, subsample=3, backend="dask")
+    assert (tmp_path / "out.mp4").stat().st_size > 0
+
+
+def test_dask_backend_errors(tmp_path):
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 51, 12))
+    with pytest.raises(ValueError, match="dask-backed"):
+        animation(_field(), tmp_path / "out.mp4", backend="dask")
+    with pytest.raises(ValueError, match="pipe"):
+        animation(_field().chunk(time=2), tmp_path / "out.mp4", backend="dask", pipe=True)
+    with pytest.raises(ValueError, match="backend"):
+        animation(_field(), tmp_path / "out.mp4", backend="ray")
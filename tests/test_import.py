@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+
+import mapflow
+
+HEAVY_MODULES = ("geopandas", "matplotlib", "xarray", "dask", "pyproj", "shapely", "pandas", "mapflow._classic")
+
+
+def _imported(statement, modules):
+    """Returns the ``modules`` in ``sys.modules`` once ``statement`` is run in a fresh interpreter."""
+    code = f"import sys\n{statement}\nprint(' '.join(m for m in {modules!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def test_import_is_lazy():
+    assert not _imported("import mapflow", HEAVY_MODULES)
+
+
+def test_workers_do_not_import_pyplot_nor_geopandas():
+    assert not _imported("import mapflow._classic, mapflow._quiver", ("geopandas", "matplotlib.pyplot"))
+
+
+def test_border_cache_hit_does_not_import_geopandas(tmp_path):
+    statement = (
+        "from pyproj import CRS\n"
+        "from mapflow._borders import border_lines\n"
+        f"border_lines(None, CRS.from_epsg(4326), (-5, 40, 10, 55), cache_dir={str(tmp_path)!r})"
+    )
+    assert _imported(statement, ("geopandas",)) == {"geopandas"}
+    assert not _imported(statement, ("geopandas",))
+
+
+def test_public_api_is_resolved_lazily():
+    from mapflow._classic import Animation
+
+    assert mapflow.Animation is Animation
+    assert set(mapflow.__all__) <= set(dir(mapflow))
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        mapflow.missing  # noqa: B018
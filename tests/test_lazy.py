@@ -1,7 +1,12 @@
+import threading
+import time
+import tracemalloc
+from multiprocessing import Pool
+
 import numpy as np
 import pytest
 import xarray as xr
-from matplotlib.colors import LogNorm, Normalize
+from matplotlib.colors import LogNorm
 
 from mapflow import Animation, QuiverAnimation, animate
 from mapflow._classic import PlotModel
@@ -22,6 +27,15 @@ class LoadCounter:
         return self.arr[k]
 
 
+def _interp_reference(data, ratio):
+    """Linear interpolation along time, one pixel at a time."""
+    t_source = np.arange(len(data)) * ratio
+    t_out = np.arange((len(data) - 1) * ratio + 1)
+    flat = data.reshape(len(data), -1).astype(np.float64)
+    out = np.stack([np.interp(t_out, t_source, flat[:, k]) for k in range(flat.shape[1])], axis=1)
+    return out.reshape(len(t_out), *data.shape[1:])
+
+
 @pytest.mark.parametrize("ratio", [1, 2, 5])
 @pytest.mark.parametrize("dtype", ["float32", "float64"])
 def test_iter_upsampled_frames_matches_upsample(ratio, dtype):
@@ -30,8 +44,32 @@ def test_iter_upsampled_frames_matches_upsample(ratio, dtype):
     expected = Animation.upsample(data, ratio=ratio)
     frames = list(Animation._iter_upsampled_frames(data, ratio=ratio))
     got = np.stack(frames)
-    assert got.dtype == expected.dtype
+    assert got.dtype == expected.dtype == data.dtype
     np.testing.assert_allclose(got, expected, rtol=1e-6)
+    np.testing.assert_allclose(got, _interp_reference(data, ratio), rtol=1e-6)
+
+
+@pytest.mark.parametrize("dtype", ["int16", "uint8", "float16", "bool"])
+def test_upsample_integer_data_is_not_truncated(dtype):
+    data = np.array([[[0]], [[1]], [[3]]]).astype(dtype)
+    got = Animation.upsample(data, ratio=4)
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, _interp_reference(data, 4), rtol=1e-6)
+
+
+def test_iter_upsampled_frames_ring_buffer():
+    rng = np.random.default_rng(0)
+    data = rng.random((6, 4, 3))
+    expected = _interp_reference(data, 4)
+    window = []
+    for k, frame in enumerate(Animation._iter_upsampled_frames(data, ratio=4, ring=5)):
+        window = [*window[-4:], (k, frame)]
+        # The last 5 yielded frames are intact.
+        for j, previous in window:
+            np.testing.assert_allclose(previous, expected[j])
+    frames = list(Animation._iter_upsampled_frames(data, ratio=4, ring=5))
+    # Views into a buffer of 3 groups of 4 frames.
+    assert len({id(frame.base) for frame in frames}) == 1
 
 
 def test_iter_upsampled_frames_single_frame():
@@ -99,14 +137,16 @@ def test_animate_lazy_netcdf(tmp_path):
     assert out.exists()
 
 
-def test_norm_streaming_default_bounds_widen_exact():
+@pytest.mark.parametrize(("log", "diff"), [(False, False), (True, False), (False, True)])
+def test_norm_streaming_matches_exact_global_quantiles(log, diff):
     rng = np.random.default_rng(0)
     data = rng.normal(size=(4, 20, 20))
-    exact = PlotModel._norm(data, None, None, 1, 99, None, log=False)
-    streamed = PlotModel._norm_streaming(iter(data), None, None, 1, 99, None, log=False)
-    assert type(streamed) is Normalize
-    assert streamed.vmin <= exact.vmin
-    assert streamed.vmax >= exact.vmax
+    data[0] *= 10  # A single noisy frame must not widen the range.
+    exact = PlotModel._norm(data, None, None, 1, 99, None, log=log, diff=diff)
+    streamed = PlotModel._norm_streaming(iter(data), None, None, 1, 99, None, log=log, diff=diff)
+    assert type(streamed) is type(exact)
+    assert streamed.vmin == pytest.approx(exact.vmin, rel=1e-3)
+    assert streamed.vmax == pytest.approx(exact.vmax, rel=1e-3)
 
 
 def test_norm_streaming_log():
@@ -146,3 +186,129 @@ def test_missing_ffmpeg_has_actionable_error(monkeypatch):
 
     with pytest.raises(RuntimeError, match=r"FFmpeg is required.*PATH"):
         Animation._require_ffmpeg()
+
+
+def test_imap_bounded_keeps_order_and_window():
+    pulled = []
+
+    def tasks():
+        for k in range(40):
+            pulled.append(k)
+            yield np.full(10, k)
+
+    with Pool(2) as pool:
+        results = []
+        for result in Animation._imap_bounded(pool, np.sum, tasks(), max_inflight=4, chunksize=2):
+            # Frames pulled from the generator and not returned yet never exceed the window.
+            assert len(pulled) - len(results) <= 4
+            results.append(result)
+    assert results == [10 * k for k in range(40)]
+
+
+def test_ring_buffer_frames_survive_dispatch():
+    rng = np.random.default_rng(0)
+    data = rng.random((20, 32, 32))
+    max_inflight, chunksize = 4, 2
+    frames = Animation._iter_upsampled_frames(data, ratio=3, ring=max_inflight + 2 * chunksize)
+    with Pool(2) as pool:
+        sums = list(Animation._imap_bounded(pool, np.sum, frames, max_inflight, chunksize))
+    np.testing.assert_allclose(sums, _interp_reference(data, 3).sum(axis=(1, 2)))
+
+
+def _render_stub(k):
+    return np.full(2**17, k, dtype=float)
+
+
+def test_imap_bounded_memory():
+    frame_bytes = 2**20
+    with Pool(2) as pool:
+        tracemalloc.start()
+        try:
+            for _ in Animation._imap_bounded(pool, _render_stub, range(64), max_inflight=4):
+                # Slow consumer, e.g. FFmpeg encoding piped frames: rendered
+                # frames must not pile up in the parent process.
+                time.sleep(0.005)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    assert peak < 12 * frame_bytes
+
+
+def test_time_blocks_follow_storage_chunks(tmp_path):
+    da = xr.DataArray(np.random.default_rng(0).random((10, 4, 5)).astype("float32"), dims=("time", "y", "x"))
+    assert Animation._time_blocks(da) == [(k, k + 1) for k in range(10)]
+    assert Animation._time_blocks(da.values) == [(k, k + 1) for k in range(10)]
+    nc_path = tmp_path / "chunked.nc"
+    da.rename("field").to_netcdf(nc_path, encoding={"field": {"chunksizes": (4, 4, 5), "zlib": True}})
+    with xr.open_dataarray(nc_path) as lazy:
+        assert Animation._time_blocks(lazy) == [(0, 4), (4, 8), (8, 10)]
+        # Blocks are split to bound the memory they hold (one frame is 80 bytes).
+        assert Animation._time_blocks(lazy, max_bytes=200) == [(0, 2), (2, 4), (4, 6), (6, 8), (8, 10)]
+        frames = list(Animation._iter_raw_frames(lazy))
+        # The offset of a selection along time is not known: blocks could straddle two chunks.
+        assert Animation._time_blocks(lazy.isel(time=slice(3, None))) == [(k, k + 1) for k in range(7)]
+        assert Animation._time_blocks(lazy.isel(x=slice(1, None))) == [(0, 4), (4, 8), (8, 10)]
+    np.testing.assert_array_equal(np.stack(frames), da.values)
+    # Time is not the first stored dimension.
+    transposed_path = tmp_path / "transposed.nc"
+    stored = da.rename("field").transpose("y", "x", "time")
+    stored.to_netcdf(transposed_path, encoding={"field": {"chunksizes": (4, 5, 3)}})
+    with xr.open_dataarray(transposed_path) as lazy:
+        assert Animation._time_blocks(lazy.transpose("time", "y", "x")) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+
+
+def test_read_blocks_are_bounded_by_read_block_bytes(tmp_path, monkeypatch):
+    da = xr.DataArray(np.zeros((10, 4, 5), dtype="float32"), dims=("time", "y", "x"), name="field")
+    nc_path = tmp_path / "chunked.nc"
+    da.to_netcdf(nc_path, encoding={"field": {"chunksizes": (10, 4, 5)}})
+    monkeypatch.setattr(Animation, "read_block_bytes", 240)
+    with xr.open_dataarray(nc_path) as lazy:
+        assert Animation._time_blocks(lazy) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+        assert [len(block) for block in Animation._read_blocks(lazy)] == [3, 3, 3, 1]
+
+
+def test_time_blocks_follow_dask_chunks():
+    pytest.importorskip("dask")
+    da = xr.DataArray(np.random.default_rng(0).random((7, 4, 5)), dims=("time", "y", "x")).chunk(time=3)
+    assert Animation._time_blocks(da) == [(0, 3), (3, 6), (6, 7)]
+    frames = list(Animation._iter_upsampled_frames(da, ratio=2))
+    np.testing.assert_allclose(np.stack(frames), Animation.upsample(da.values, ratio=2))
+
+
+def test_prefetch_reads_ahead_with_bounded_depth():
+    produced = []
+
+    def items():
+        for k in range(10):
+            produced.append(k)
+            yield k
+
+    prefetched = Animation._prefetch(items(), depth=2)
+    assert next(prefetched) == 0
+    time.sleep(0.3)
+    # One item consumed, two queued and one held by the blocked producer.
+    assert len(produced) == 4
+    assert list(prefetched) == list(range(1, 10))
+
+
+def test_prefetch_propagates_errors_and_stops_on_close():
+    def failing():
+        yield 0
+        raise OSError("corrupted chunk")
+
+    prefetched = Animation._prefetch(failing(), depth=2)
+    assert next(prefetched) == 0
+    with pytest.raises(OSError, match="corrupted chunk"):
+        next(prefetched)
+
+    prefetched = Animation._prefetch(iter(range(100)), depth=1)
+    next(prefetched)
+    prefetched.close()
+    assert not any(thread.name == "mapflow-prefetch" for thread in threading.enumerate())
+
+
+def test_iter_upsampled_frames_prefetch():
+    data = LoadCounter(np.random.default_rng(0).random((5, 4, 3)))
+    frames = list(Animation._iter_upsampled_frames(data, ratio=3, prefetch=2))
+    np.testing.assert_allclose(np.stack(frames), Animation.upsample(data.arr, ratio=3))
+    assert data.loads == list(range(5))
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from mapflow import Animation
+from mapflow._reduce import ReducedFrames, block_reduce, reduction_factors
+
+
+def test_reduction_factors():
+    assert reduction_factors((3600, 7200), (12.8, 7.2), 100) == (5, 5)
+    assert reduction_factors((100, 200), (6.4, 4.8), 100) == (1, 1)
+
+
+def test_block_reduce_mean_ignores_nan_and_pads_edges():
+    array = np.arange(20, dtype=float).reshape(4, 5)
+    array[0, 0] = np.nan
+    got = block_reduce(array, (2, 2), "mean")
+    assert got.shape == (2, 3)
+    assert got[0, 0] == pytest.approx(np.nanmean(array[:2, :2]))
+    assert got[1, 2] == pytest.approx(array[2:, 4].mean())
+    all_nan = block_reduce(np.full((2, 2), np.nan), (2, 2), "mean")
+    assert np.isnan(all_nan).all()
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int16"])
+def test_block_reduce_max_and_nearest(dtype):
+    rng = np.random.default_rng(0)
+    array = (rng.random((3, 7, 9)) * 100).astype(dtype)
+    got = block_reduce(array, (3, 4), "max")
+    assert got.dtype == array.dtype
+    assert got.shape == (3, 3, 3)
+    assert got[1, 2, 2] == array[1, 6:, 8:].max()
+    assert got[2, 0, 1] == array[2, :3, 4:8].max()
+    nearest = block_reduce(array, (3, 4), "nearest")
+    np.testing.assert_array_equal(nearest, array[:, 1::3, 2::4])
+
+
+def test_reduced_frames_reads_lazily_per_block(tmp_path):
+    rng = np.random.default_rng(0)
+    da = xr.DataArray(rng.random((6, 40, 60)).astype("float32"), dims=("time", "y", "x"), name="field")
+    nc_path = tmp_path / "data.nc"
+    da.to_netcdf(nc_path, encoding={"field": {"chunksizes": (3, 40, 60)}})
+    with xr.open_dataarray(nc_path) as lazy:
+        reduced = ReducedFrames(lazy, (4, 4), "mean", Animation._time_blocks(lazy))
+        assert reduced.shape == (6, 10, 15)
+        assert Animation._time_blocks(reduced) == [(0, 3), (3, 6)]
+        frames = np.stack(list(Animation._iter_raw_frames(reduced)))
+    np.testing.assert_allclose(frames, block_reduce(da.values, (4, 4), "mean"), rtol=1e-6)
+
+
+@pytest.mark.parametrize("how", ["mean", "max", "nearest"])
+def test_reduce_grid(how):
+    rng = np.random.default_rng(0)
+    x, y = np.linspace(-10, 10, 400), np.linspace(30, 50, 300)
+    animation = Animation(x=x, y=y)
+    data = rng.random((3, 300, 400))
+    reduced_animation, reduced = animation._reduce_grid(data, (2, 1.5), 50, how)
+    assert reduced_animation.plot is not animation.plot
+    assert reduced_animation.plot.x.shape == (reduced.shape[2],)
+    assert reduced_animation.plot.y.shape == (reduced.shape[1],)
+    assert reduced.shape[1] >= 1.5 * 50 and reduced.shape[2] >= 2 * 50
+    # The extent of the map is kept.
+    plot = reduced_animation.plot
+    assert plot.x.min() - plot.dx / 2 == pytest.approx(x.min() - animation.plot.dx / 2, abs=plot.dx)
+    assert plot.x.max() + plot.dx / 2 == pytest.approx(x.max() + animation.plot.dx / 2, abs=plot.dx)
+
+
+def test_reduce_grid_dask_is_lazy():
+    pytest.importorskip("dask")
+    da = xr.DataArray(np.random.default_rng(0).random((4, 300, 400)), dims=("time", "y", "x")).chunk(time=2)
+    animation = Animation(x=np.linspace(-10, 10, 400), y=np.linspace(30, 50, 300))
+    _, reduced = animation._reduce_grid(da, (2, 1.5), 50, "mean")
+    assert reduced.chunks is not None
+    np.testing.assert_allclose(reduced.values, block_reduce(da.values, (4, 4), "mean"))
+
+
+def test_animate_with_reduce(tmp_path):
+    rng = np.random.default_rng(0)
+    animation = Animation(x=np.linspace(-10, 10, 400), y=np.linspace(30, 50, 300))
+    path = tmp_path / "out.mp4"
+    animation(rng.random((3, 300, 400)), path, figsize=(2, 1.5), dpi=50, reduce="max", engine="numpy")
+    assert path.stat().st_size > 0
+    with pytest.raises(ValueError, match="reduce"):
+        animation(rng.random((3, 300, 400)), path, reduce="median")
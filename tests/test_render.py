@@ -0,0 +1,250 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+from matplotlib.colors import LogNorm, Normalize
+from matplotlib.image import imread
+
+from mapflow import Animation, QuiverAnimation
+from mapflow._render import RenderJob
+
+
+def _job(animation, tmp_path, engine, titles=None):
+    settings = {
+        "figsize": (4, 3),
+        "titles": titles,
+        "cmap": "viridis",
+        "norm": Normalize(vmin=0.0, vmax=1.0),
+        "label": "K",
+        "dpi": 60,
+        "pad_inches": 0.2,
+        "engine": engine,
+        "frame_dir": tmp_path / engine,
+        "frame_box": None,
+        "subsample": 2,
+    }
+    (tmp_path / engine).mkdir()
+    return RenderJob(animation, settings)
+
+
+def _assert_same_frames(tmp_path, n_frames):
+    for k in range(n_frames):
+        rebuilt = imread(tmp_path / "rebuild" / f"frame_{k:08d}.png")
+        persistent = imread(tmp_path / "persistent" / f"frame_{k:08d}.png")
+        assert rebuilt.shape == persistent.shape
+        assert np.abs(rebuilt - persistent).mean() < 1e-3
+
+
+@pytest.mark.parametrize("grid", ["regular", "curvilinear"])
+def test_persistent_engine_matches_rebuild(tmp_path, grid):
+    rng = np.random.default_rng(0)
+    frames = rng.random((3, 12, 16))
+    x, y = np.linspace(-5, 5, 16), np.linspace(40, 50, 12)
+    if grid == "curvilinear":
+        x, y = np.meshgrid(x, y)
+    animation = Animation(x=x, y=y)
+    titles = [f"frame {k}" for k in range(3)]
+    for engine in ("rebuild", "persistent"):
+        job = _job(animation, tmp_path, engine, titles)
+        for k, frame in enumerate(frames):
+            job(k, frame)
+    _assert_same_frames(tmp_path, 3)
+
+
+def test_persistent_quiver_engine_matches_rebuild(tmp_path):
+    rng = np.random.default_rng(0)
+    u, v = rng.normal(size=(2, 2, 12, 12))
+    animation = QuiverAnimation(x=np.linspace(0, 11, 12), y=np.linspace(40, 51, 12))
+    for engine in ("rebuild", "persistent"):
+        job = _job(animation, tmp_path, engine, ["frame 0", "frame 1"])
+        for k in range(2):
+            job(k, (u[k], v[k]))
+    _assert_same_frames(tmp_path, 2)
+
+
+def test_string_title_is_rendered_alike_by_every_engine(tmp_path, monkeypatch):
+    frames = {}
+
+    def create_video(tempdir, path, fps, timeout, crf=20, video_width=None):
+        frames[path.stem] = [imread(p)[..., :3] for p in sorted(Path(tempdir).glob("*.png"))]
+
+    monkeypatch.setattr(Animation, "_create_video", staticmethod(create_video))
+    data = np.random.default_rng(0).random((4, 16, 16))
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    for engine in ("rebuild", "persistent", "numpy"):
+        animation(data, tmp_path / f"{engine}.mp4", title="field", upsample_ratio=3, dpi=60, n_jobs=1, engine=engine)
+    assert len(frames["rebuild"]) == 10
+    for engine in ("persistent", "numpy"):
+        for rebuilt, image in zip(frames["rebuild"], frames[engine], strict=True):
+            assert image.shape == rebuilt.shape
+            assert np.abs(image - rebuilt).mean() < 4e-3
+
+
+def test_renderer_update_clears_the_title(tmp_path):
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    settings = _job(animation, tmp_path, "persistent").settings
+    reference = animation._make_renderer(np.zeros((16, 16)), "title", settings)
+    composite = animation._make_renderer(np.zeros((16, 16)), "title", {**settings, "engine": "numpy"})
+    box = reference.frame_box(60, 0.2)
+    titled = reference.to_rgb(box, 60).astype(int)
+    reference.update(np.zeros((16, 16)), title=None)
+    composite.update(np.zeros((16, 16)), title=None)
+    assert reference.title.get_text() == ""
+    expected = reference.to_rgb(box, 60).astype(int)
+    got = composite.to_rgb(box, 60)
+    assert np.abs(got - expected).mean() < np.abs(expected - titled).mean() / 4
+
+
+def test_render_job_is_shipped_without_renderer(tmp_path):
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    job = _job(animation, tmp_path, "persistent")
+    job(0, np.zeros((16, 16)))
+    renderer = job.renderer
+    job(1, np.ones((16, 16)))
+    assert job.renderer is renderer
+    shipped = pickle.loads(pickle.dumps(job))
+    assert shipped.renderer is None
+    assert shipped.settings["cmap"] == "viridis"
+
+
+def test_unknown_engine(tmp_path):
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    with pytest.raises(ValueError, match="engine"):
+        animation(np.zeros((2, 16, 16)), tmp_path / "out.mp4", engine="opengl")
+
+
+def test_to_rgb_matches_savefig(tmp_path):
+    rng = np.random.default_rng(0)
+    frame = rng.random((12, 16))
+    animation = Animation(x=np.linspace(-5, 5, 16), y=np.linspace(40, 50, 12))
+    renderer = animation._make_renderer(frame, "title", _job(animation, tmp_path, "persistent").settings)
+    left, top, right, bottom = renderer.frame_box(60, 0.2)
+    rgb = np.frombuffer(renderer.to_rgb((left, top, right, bottom), 60), dtype=np.uint8)
+    rgb = rgb.reshape(bottom - top, right - left, 3)
+    renderer.savefig(tmp_path / "frame.png", dpi=60, pad_inches=0.2)
+    png = (imread(tmp_path / "frame.png")[..., :3] * 255).round()
+    assert rgb.shape == png.shape
+    assert np.abs(rgb - png).mean() < 8
+
+
+def test_build_ffmpeg_cmd_raw_frames():
+    cmd = Animation._build_ffmpeg_cmd(None, "out.mp4", 24, frame_size=(321, 240))
+    assert cmd[cmd.index("-f") + 1] == "rawvideo"
+    assert cmd[cmd.index("-s") + 1] == "321x240"
+    assert cmd[cmd.index("-i") + 1] == "-"
+    assert cmd[-3:] == ["-movflags", "+faststart", "out.mp4"]
+
+
+@pytest.mark.parametrize("engine", ["persistent", "rebuild"])
+def test_animation_pipe(tmp_path, engine):
+    rng = np.random.default_rng(0)
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    titles = [f"step {k}" for k in range(4)]
+    path = tmp_path / "out.mp4"
+    animation(rng.random((4, 16, 16)), path, title=titles, dpi=60, pipe=True, engine=engine, n_jobs=2)
+    assert path.stat().st_size > 0
+
+
+def test_quiver_pipe(tmp_path):
+    rng = np.random.default_rng(0)
+    animation = QuiverAnimation(x=np.linspace(0, 11, 12), y=np.linspace(40, 51, 12))
+    path = tmp_path / "out.mkv"
+    animation.quiver(rng.random((3, 12, 12)), rng.random((3, 12, 12)), path, dpi=60, subsample=3, pipe=True)
+    assert path.stat().st_size > 0
+
+
+def test_animation_chunksize(tmp_path):
+    rng = np.random.default_rng(0)
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    path = tmp_path / "out.mp4"
+    animation(rng.random((5, 16, 16)), path, dpi=60, n_jobs=2, chunksize=3)
+    assert path.stat().st_size > 0
+
+
+@pytest.mark.parametrize("log", [False, True])
+def test_numpy_engine_matches_matplotlib(tmp_path, log):
+    rng = np.random.default_rng(0)
+    frames = rng.random((3, 30, 40)) + 0.05
+    frames[0, 5:10, 5:15] = np.nan
+    animation = Animation(x=np.linspace(-5, 5, 40), y=np.linspace(40, 50, 30))
+    settings = _job(animation, tmp_path, "persistent").settings
+    settings["norm"] = LogNorm(vmin=0.1, vmax=0.9) if log else Normalize(vmin=0.1, vmax=0.9)
+    reference = animation._make_renderer(frames[0], "frame 0", settings)
+    composite = animation._make_renderer(frames[0], "frame 0", {**settings, "engine": "numpy"})
+    box = reference.frame_box(80, 0.2)
+    for k, frame in enumerate(frames):
+        reference.update(frame, title=f"frame {k}")
+        composite.update(frame, title=f"frame {k}")
+        expected = reference.to_rgb(box, 80).astype(int)
+        got = composite.to_rgb(box, 80)
+        assert got.shape == expected.shape
+        assert np.abs(got - expected).mean() < 1
+
+
+def test_numpy_engine_animation(tmp_path):
+    rng = np.random.default_rng(0)
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    path = tmp_path / "out.mp4"
+    animation(rng.random((3, 16, 16)), path, title="field", dpi=60, engine="numpy")
+    assert path.stat().st_size > 0
+
+
+def test_numpy_engine_requires_regular_grid(tmp_path):
+    x, y = np.meshgrid(np.linspace(0, 15, 16), np.linspace(40, 55, 16))
+    with pytest.raises(ValueError, match="1D"):
+        Animation(x=x, y=y)(np.zeros((2, 16, 16)), tmp_path / "out.mp4", engine="numpy")
+    quiver = QuiverAnimation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    with pytest.raises(ValueError, match="quiver"):
+        quiver.quiver(np.zeros((2, 16, 16)), np.zeros((2, 16, 16)), tmp_path / "out.mp4", engine="numpy")
+
+
+def test_iter_source_runs():
+    data = np.arange(7)[:, None, None] * np.ones((7, 2, 3))
+    animation = Animation(x=np.linspace(0, 2, 3), y=np.linspace(0, 1, 2))
+    runs = list(animation._iter_source_runs(data, upsample_ratio=4, run_length=3))
+    assert [(start, source[:, 0, 0].tolist(), last) for start, source, last in runs] == [
+        (0, [0, 1, 2, 3], False),
+        (12, [3, 4, 5, 6], False),
+        (24, [6], True),
+    ]
+    # Each source frame is sent once, plus one frame shared per run, for 25 rendered frames.
+    assert sum(len(source) for _, source, _ in runs) == 9
+
+
+@pytest.mark.parametrize("chunksize", [1, 3])
+def test_worker_interpolation_matches_main_process(tmp_path, monkeypatch, chunksize):
+    rng = np.random.default_rng(0)
+    frames = {}
+
+    def create_video(tempdir, path, fps, timeout, crf=20, video_width=None):
+        frames[path.name] = {p.name: imread(p) for p in Path(tempdir).glob("*.png")}
+
+    monkeypatch.setattr(Animation, "_create_video", staticmethod(create_video))
+    data = rng.random((5, 16, 16))
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    titles = [f"step {k}" for k in range(5)]
+    for name, worker_interpolation in (("main.mp4", False), ("worker.mp4", True)):
+        animation(
+            data,
+            tmp_path / name,
+            title=titles,
+            dpi=40,
+            upsample_ratio=3,
+            fps=24,
+            n_jobs=2,
+            chunksize=chunksize,
+            worker_interpolation=worker_interpolation,
+        )
+    assert sorted(frames["worker.mp4"]) == [f"frame_{k:08d}.png" for k in range(13)]
+    for name, image in frames["main.mp4"].items():
+        np.testing.assert_allclose(frames["worker.mp4"][name], image, atol=1e-6)
+
+
+def test_worker_interpolation_pipe_quiver(tmp_path):
+    rng = np.random.default_rng(0)
+    animation = QuiverAnimation(x=np.linspace(0, 11, 12), y=np.linspace(40, 51, 12))
+    path = tmp_path / "out.mp4"
+    u, v = rng.random((2, 3, 12, 12))
+    animation.quiver(u, v, path, dpi=60, subsample=3, pipe=True, worker_interpolation=True, n_jobs=2)
+    assert path.stat().st_size > 0
@@ -0,0 +1,56 @@
+import json
+import time
+
+import numpy as np
+import pytest
+
+from mapflow import Animation, AnimationReport, QuiverAnimation, animate
+from mapflow._report import StageTimer
+
+
+def test_stage_timer_excludes_nested_stages():
+    timer = StageTimer()
+    with timer.stage("outer"):
+        with timer.stage("inner"):
+            time.sleep(0.05)
+        items = list(timer.iterate("items", range(3)))
+    assert items == [0, 1, 2]
+    assert timer.stages["inner"].wall >= 0.05
+    assert timer.stages["outer"].wall < 0.05
+    assert timer.stages["items"].calls == 4
+    assert set(timer.pop()) == {"outer", "inner", "items"}
+    assert timer.stages == {}
+
+
+@pytest.mark.parametrize("options", [{}, {"pipe": True, "engine": "numpy"}, {"worker_interpolation": True}])
+def test_animation_report(tmp_path, options):
+    x, y = np.linspace(-10, 10, 16), np.linspace(40, 50, 8)
+    data = np.random.default_rng(0).random((4, 8, 16))
+    report = Animation(x, y)(data, tmp_path / "out.mp4", upsample_ratio=2, n_jobs=2, dpi=50, report=True, **options)
+    assert isinstance(report, AnimationReport)
+    assert report.n_frames == 7
+    assert report.wall > 0 and report.frames_per_second == pytest.approx(7 / report.wall)
+    assert {"norm", "read", "dispatch", "encode"} <= set(report.stages)
+    assert report.worker_stages["render"].calls == 7
+    assert sum(stages["render"].calls for stages in report.workers.values()) == 7
+    # 7 interpolated frames, or with worker interpolation 3 runs of 2 source frames and the closing run.
+    assert report.bytes_to_workers == 7 * data[0].nbytes
+    assert (report.temp_disk_bytes > 0) != bool(options.get("pipe"))
+    assert report.ffmpeg_wall >= report.stages["encode"].wall
+    exported = json.loads(report.to_json(tmp_path / "report.json"))
+    assert exported == json.loads((tmp_path / "report.json").read_text())
+    assert exported["stages"]["encode"]["calls"] == 1
+
+
+def test_quiver_report(tmp_path):
+    x, y = np.linspace(-10, 10, 16), np.linspace(40, 50, 8)
+    u, v = np.random.default_rng(0).random((2, 3, 8, 16))
+    report = QuiverAnimation(x, y).quiver(u, v, tmp_path / "out.mp4", upsample_ratio=1, n_jobs=1, report=True)
+    assert report.n_frames == 3
+    assert report.bytes_to_workers == 3 * (u[0].nbytes + v[0].nbytes)
+
+
+def test_animate_report(tmp_path, air_data):
+    assert animate(air_data, tmp_path / "none.mp4", n_jobs=1, upsample_ratio=1) is None
+    report = animate(air_data, tmp_path / "out.mp4", n_jobs=1, upsample_ratio=1, report=True)
+    assert report.n_frames == len(air_data)
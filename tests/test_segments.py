@@ -0,0 +1,168 @@
+import re
+import subprocess
+
+import numpy as np
+import pytest
+from matplotlib.image import imsave
+
+from mapflow import Animation, QuiverAnimation
+from mapflow._segments import SegmentEncoder, _png_size, _video_size
+
+
+def count_frames(path):
+    result = subprocess.run(["ffmpeg", "-i", str(path), "-f", "null", "-"], check=True, capture_output=True, text=True)
+    return int(re.findall(r"frame=\s*(\d+)", result.stderr)[-1])
+
+
+@pytest.fixture
+def grid():
+    x, y = np.linspace(-10, 10, 16), np.linspace(40, 50, 8)
+    data = np.random.default_rng(0).random((6, 8, 16))
+    return x, y, data
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"segment_frames": 4},
+        {"segment_frames": 1, "encoders": 3},
+        {"segment_frames": 20},
+        {"segment_frames": 3, "worker_interpolation": True, "chunksize": 2},
+        {"segment_frames": 4, "engine": "numpy", "transport": "shm"},
+    ],
+)
+def test_segmented_encoding(tmp_path, grid, options):
+    x, y, data = grid
+    path = tmp_path / "out.mp4"
+    Animation(x, y)(data, path, upsample_ratio=2, n_jobs=2, dpi=50, **options)
+    assert count_frames(path) == 11
+
+
+def test_segmented_append_and_workdir(tmp_path, grid):
+    x, y, data = grid
+    animation, path = Animation(x, y), tmp_path / "out.mp4"
+    options = {"upsample_ratio": 2, "n_jobs": 2, "dpi": 50, "segment_frames": 2, "append": True}
+    animation(data[:4], path, workdir=tmp_path / "work", **options)
+    assert count_frames(path) == 7
+    animation(data[4:], path, **options)
+    assert count_frames(path) == 11
+
+
+def test_segmented_quiver(tmp_path, grid):
+    x, y, _ = grid
+    u, v = np.random.default_rng(0).random((2, 3, 8, 16))
+    path = tmp_path / "out.mp4"
+    QuiverAnimation(x, y).quiver(u, v, path, upsample_ratio=1, n_jobs=1, segment_frames=2)
+    assert count_frames(path) == 3
+
+
+def test_segment_encoder_overlaps_rendering(tmp_path):
+    for k in range(5):
+        imsave(tmp_path / f"frame_{k:08d}.png", np.full((16, 16, 3), k / 5))
+    path = tmp_path / "out.mp4"
+    encoder = SegmentEncoder(Animation, tmp_path, path, 24, n_frames=5, segment_frames=2, timeout=20, encoders=2)
+    encoder.ready(3)
+    assert len(encoder.segments) == 1 and encoder.next == 2
+    encoder.ready(4)
+    assert len(encoder.segments) == 2
+    encoder.finish()
+    assert len(encoder.segments) == 3 and not encoder.running
+    assert count_frames(path) == 5
+
+
+class _Command:
+    def __init__(self, cmd):
+        self.cmd = cmd
+
+    def _build_ffmpeg_cmd(self, *args, **kwargs):
+        return self.cmd
+
+
+@pytest.mark.parametrize(
+    ("cmd", "error"),
+    [(["sleep", "5"], subprocess.TimeoutExpired), (["false"], subprocess.CalledProcessError)],
+)
+def test_segment_encoder_errors(tmp_path, cmd, error):
+    for k in range(4):
+        imsave(tmp_path / f"frame_{k:08d}.png", np.zeros((16, 16, 3)))
+    encoder = SegmentEncoder(
+        _Command(cmd), tmp_path, "out.mp4", 24, n_frames=4, segment_frames=2, timeout=0.5, encoders=2
+    )
+
+    def encode():
+        # Failures are reported as soon as they are noticed, possibly before finish.
+        encoder.ready(4)
+        encoder.finish()
+
+    with pytest.raises(error):
+        encode()
+    assert not encoder.running
+
+
+@pytest.mark.parametrize(("suffix", "encoding"), [(".mp4", {}), (".mp4", {"video_width": 11}), (".avi", {})])
+def test_segments_share_the_size_of_the_first_frame(tmp_path, suffix, encoding):
+    # Tight bounding boxes can give frames of different sizes.
+    for k in range(6):
+        imsave(tmp_path / f"frame_{k:08d}.png", np.full((15, 21 + 2 * (k // 2), 3), k / 6))
+    path = tmp_path / f"out{suffix}"
+    encoder = SegmentEncoder(
+        Animation, tmp_path, path, 24, n_frames=6, segment_frames=2, timeout=20, encoders=2, **encoding
+    )
+    encoder.ready(6)
+    encoder.finish()
+    expected = (12, 8) if encoding else (22, 16)
+    assert {_video_size(segment) for segment in encoder.segments} == {expected}
+    assert _video_size(path) == expected
+    assert count_frames(path) == 6
+
+
+def test_segments_of_different_sizes_are_not_joined(tmp_path, monkeypatch):
+    for k in range(4):
+        imsave(tmp_path / f"frame_{k:08d}.png", np.zeros((16, 16, 3)))
+    path = tmp_path / "out.mp4"
+    encoder = SegmentEncoder(Animation, tmp_path, path, 24, n_frames=4, segment_frames=2, timeout=20, encoders=1)
+    encoder.ready(2)
+    encoder.output_size = (32, 32)
+    monkeypatch.setattr(Animation, "_concat_videos", staticmethod(lambda *args: pytest.fail("joined")))
+    with pytest.raises(RuntimeError, match="different sizes"):
+        encoder.finish()
+    assert not path.exists()
+
+
+def test_png_size(tmp_path):
+    imsave(tmp_path / "frame.png", np.zeros((5, 7, 3)))
+    assert _png_size(tmp_path / "frame.png") == (7, 5)
+    (tmp_path / "frame.txt").write_text("frame")
+    with pytest.raises(ValueError, match="PNG"):
+        _png_size(tmp_path / "frame.txt")
+
+
+@pytest.mark.parametrize(
+    ("options", "match"),
+    [
+        ({"segment_frames": 0}, "segment_frames"),
+        ({"segment_frames": 2, "encoders": 0}, "encoders"),
+        ({"segment_frames": 2, "pipe": True}, "pipe"),
+    ],
+)
+def test_segment_options(tmp_path, grid, options, match):
+    x, y, data = grid
+    with pytest.raises(ValueError, match=match):
+        Animation(x, y)(data, tmp_path / "out.mp4", **options)
+
+
+def test_ffmpeg_cmd_segment_options():
+    cmd = Animation._build_ffmpeg_cmd("frames", "out.mp4", 24, start_number=8, n_frames=4, threads=2)
+    assert cmd[cmd.index("-start_number") + 1] == "8"
+    assert cmd.index("-start_number") < cmd.index("-i")
+    assert cmd[cmd.index("-frames:v") + 1] == "4"
+    assert cmd[cmd.index("-threads") + 1] == "2"
+    assert "-start_number" not in Animation._build_ffmpeg_cmd("frames", "out.mp4", 24)
+
+
+def test_ffmpeg_cmd_output_size_and_gop():
+    for suffix in (".mp4", ".avi"):
+        cmd = Animation._build_ffmpeg_cmd("frames", f"out{suffix}", 24, video_width=100, output_size=(64, 48), gop=8)
+        assert cmd[cmd.index("-vf") + 1] == "scale=64:48"
+        assert cmd[cmd.index("-g") + 1] == cmd[cmd.index("-keyint_min") + 1] == "8"
+    assert "-g" not in Animation._build_ffmpeg_cmd("frames", "out.mp4", 24)
@@ -0,0 +1,113 @@
+import pickle
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pytest
+from matplotlib.image import imread
+
+from mapflow import Animation, QuiverAnimation
+from mapflow._shm import SharedArray, SharedFrameRing
+
+
+def _ring_sum(args):
+    ring, slot = args
+    return float(ring.get(slot).sum())
+
+
+def test_shared_array_is_pickled_by_name():
+    x = np.linspace(0, 1, 10_000)
+    shared = SharedArray.from_array(x)
+    try:
+        payload = pickle.dumps(shared)
+        assert len(payload) < 1000
+        attached = pickle.loads(payload)
+        np.testing.assert_array_equal(attached.array, x)
+        shared.array[0] = 42.0
+        assert attached.array[0] == 42.0
+        del attached
+    finally:
+        shared.close()
+
+
+def test_frame_ring_across_processes():
+    rng = np.random.default_rng(0)
+    frames = rng.random((6, 20, 30)).astype("float32")
+    ring = SharedFrameRing(frames[0], n_slots=3)
+    try:
+        with get_context("spawn").Pool(1) as pool:
+            for k, frame in enumerate(frames):
+                slot = ring.put(k, frame)
+                assert slot == k % 3
+                assert pool.apply(_ring_sum, ((ring, slot),)) == pytest.approx(float(frame.sum()), rel=1e-5)
+    finally:
+        ring.close()
+
+
+def test_frame_ring_tuples():
+    u, v = np.ones((4, 5)), np.zeros((4, 5))
+    ring = SharedFrameRing((u, v), n_slots=2)
+    try:
+        got_u, got_v = ring.get(ring.put(1, (u, v)))
+        np.testing.assert_array_equal(got_u, u)
+        np.testing.assert_array_equal(got_v, v)
+    finally:
+        ring.close()
+
+
+def test_plot_model_coordinates_pickled_by_name():
+    animation = Animation(x=np.linspace(0, 15, 400), y=np.linspace(40, 55, 300))
+    frame = np.zeros((300, 400))
+    with animation._shared_memory(frame, n_slots=2) as (shared_animation, _):
+        payload = pickle.dumps(shared_animation.plot)
+        assert len(payload) < len(pickle.dumps(animation.plot))
+        plot = pickle.loads(payload)
+        np.testing.assert_array_equal(plot.x, animation.plot.x)
+        np.testing.assert_array_equal(plot.y, animation.plot.y)
+        del plot
+
+
+@pytest.mark.parametrize("pipe", [False, True])
+def test_animation_shm_transport(tmp_path, pipe):
+    rng = np.random.default_rng(0)
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    path = tmp_path / "out.mp4"
+    animation(rng.random((4, 16, 16)), path, dpi=60, n_jobs=2, transport="shm", pipe=pipe, upsample_ratio=3)
+    assert path.stat().st_size > 0
+
+
+def test_quiver_shm_transport(tmp_path):
+    rng = np.random.default_rng(0)
+    animation = QuiverAnimation(x=np.linspace(0, 11, 12), y=np.linspace(40, 51, 12))
+    path = tmp_path / "out.mp4"
+    u, v = rng.random((2, 3, 12, 12))
+    animation.quiver(u, v, path, dpi=60, subsample=3, transport="shm", n_jobs=2)
+    assert path.stat().st_size > 0
+
+
+def test_shm_transport_errors(tmp_path):
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    with pytest.raises(ValueError, match="transport"):
+        animation(np.zeros((2, 16, 16)), tmp_path / "out.mp4", transport="zmq")
+    with pytest.raises(ValueError, match="worker_interpolation"):
+        animation(np.zeros((2, 16, 16)), tmp_path / "out.mp4", transport="shm", worker_interpolation=True)
+
+
+# The second case reuses ring slots many times, with chunks larger than max_inflight.
+@pytest.mark.parametrize("window", [{}, {"chunksize": 3, "max_inflight": 1}])
+def test_shm_transport_matches_pickle(tmp_path, monkeypatch, window):
+    rng = np.random.default_rng(0)
+    frames = {}
+
+    def create_video(tempdir, path, fps, timeout, crf=20, video_width=None):
+        frames[path.name] = {p.name: imread(p) for p in Path(tempdir).glob("*.png")}
+
+    monkeypatch.setattr(Animation, "_create_video", staticmethod(create_video))
+    data = rng.random((4, 16, 16))
+    animation = Animation(x=np.linspace(0, 15, 16), y=np.linspace(40, 55, 16))
+    for transport in ("pickle", "shm"):
+        path = tmp_path / f"{transport}.mp4"
+        animation(data, path, dpi=40, upsample_ratio=4, fps=24, n_jobs=2, transport=transport, **window)
+    assert sorted(frames["shm.mp4"]) == sorted(frames["pickle.mp4"])
+    for name, image in frames["pickle.mp4"].items():
+        np.testing.assert_array_equal(frames["shm.mp4"][name], image)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from mapflow._sketch import QuantileSketch
+
+
+@pytest.mark.parametrize("q", [0, 0.01, 1, 25, 50, 99, 99.9, 100])
+def test_quantile_matches_nanpercentile(q):
+    rng = np.random.default_rng(0)
+    values = rng.normal(loc=2, scale=5, size=(50, 40))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    values[:, :3] = 0.0
+    sketch = QuantileSketch().update(values)
+    assert sketch.quantile(q) == pytest.approx(np.nanpercentile(values, q), rel=1e-3, abs=1e-9)
+
+
+def test_quantile_modes():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=1000) * rng.choice([-1, 1], size=1000)
+    sketch = QuantileSketch().update(values)
+    positive = values[values > 0]
+    assert sketch.quantile(5, mode="positive") == pytest.approx(np.percentile(positive, 5), rel=1e-3)
+    assert sketch.quantile(95, mode="abs") == pytest.approx(np.percentile(np.abs(values), 95), rel=1e-3)
+    with pytest.raises(ValueError, match="mode"):
+        sketch.quantile(5, mode="log")
+
+
+def test_merge_equals_single_sketch():
+    rng = np.random.default_rng(0)
+    frames = [rng.gamma(2.0, scale=10.0**k, size=(10, 10)) for k in range(-3, 3)]
+    merged = QuantileSketch()
+    for frame in frames:
+        merged.merge(QuantileSketch().update(frame))
+    single = QuantileSketch().update(np.stack(frames))
+    assert merged.count == single.count == 600
+    for q in (0.1, 50, 99.9):
+        assert merged.quantile(q) == single.quantile(q)
+
+
+def test_empty_sketch():
+    sketch = QuantileSketch().update(np.full((3, 3), np.nan))
+    assert sketch.count == 0
+    assert np.isnan(sketch.quantile(50))
+
+
+def test_integer_values():
+    values = np.arange(-100, 101)
+    assert QuantileSketch().update(values).quantile(75) == pytest.approx(50, rel=1e-3)
+
+
+def test_to_arrays_round_trip():
+    rng = np.random.default_rng(0)
+    sketch = QuantileSketch().update(rng.normal(size=500))
+    restored = QuantileSketch.from_arrays(sketch.to_arrays())
+    for q in (0.1, 50, 99.9):
+        assert restored.quantile(q) == sketch.quantile(q)
+    assert restored.count == sketch.count
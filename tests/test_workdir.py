@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from mapflow import Animation, QuiverAnimation
+
+
+@pytest.fixture
+def grid():
+    x, y = np.linspace(-10, 10, 16), np.linspace(40, 50, 8)
+    data = np.random.default_rng(0).random((4, 8, 16))
+    return x, y, data
+
+
+def _rendered(report):
+    stage = report.worker_stages.get("render")
+    return 0 if stage is None else stage.calls
+
+
+def _run(animation, data, path, **kwargs):
+    options = {"upsample_ratio": 2, "n_jobs": 2, "dpi": 50, "vmin": 0, "vmax": 1, "report": True}
+    return animation(data, path, **{**options, **kwargs})
+
+
+@pytest.mark.parametrize("transport", ["pickle", "shm"])
+def test_workdir_only_renders_missing_frames(tmp_path, grid, transport):
+    x, y, data = grid
+    animation, workdir = Animation(x, y), tmp_path / "work"
+    assert _rendered(_run(animation, data, tmp_path / "a.mp4", workdir=workdir, transport=transport)) == 7
+    frames = sorted((workdir / "frames").iterdir())
+    assert len(frames) == 7
+    # Encoding settings only: nothing is rendered again.
+    assert _rendered(_run(animation, data, tmp_path / "b.mp4", workdir=workdir, fps=12, crf=30)) == 0
+    assert (tmp_path / "b.mp4").stat().st_size > 0
+    # An interrupted run: the missing frames are rendered, the others are kept.
+    frames[0].unlink()
+    frames[1].unlink()
+    assert _rendered(_run(animation, data, tmp_path / "c.mp4", workdir=workdir, transport=transport)) == 2
+    assert not [path for path in workdir.iterdir() if path.name != "frames"]
+
+
+def test_workdir_rerenders_stale_frames(tmp_path, grid):
+    x, y, data = grid
+    animation, workdir = Animation(x, y), tmp_path / "work"
+    _run(animation, data, tmp_path / "a.mp4", workdir=workdir)
+    # The last source frame changed: so did the last interpolated frame and the last one.
+    changed = data.copy()
+    changed[-1] += 0.1
+    assert _rendered(_run(animation, changed, tmp_path / "b.mp4", workdir=workdir)) == 2
+    assert _rendered(_run(animation, data, tmp_path / "c.mp4", workdir=workdir, title=list("abcd"))) == 7
+    assert _rendered(_run(animation, data, tmp_path / "d.mp4", workdir=workdir, cmap="viridis")) == 7
+    assert _rendered(_run(animation, data, tmp_path / "e.mp4", workdir=workdir, vmax=2)) == 7
+    assert _rendered(_run(Animation(x + 1, y), data, tmp_path / "f.mp4", workdir=workdir)) == 7
+
+
+def test_quiver_workdir(tmp_path, grid):
+    x, y, _ = grid
+    u, v = np.random.default_rng(0).random((2, 3, 8, 16))
+    animation, workdir = QuiverAnimation(x, y), tmp_path / "work"
+    options = {"upsample_ratio": 1, "n_jobs": 1, "dpi": 50, "report": True, "workdir": workdir}
+    assert _rendered(animation.quiver(u, v, tmp_path / "a.mp4", **options)) == 3
+    assert _rendered(animation.quiver(u, v, tmp_path / "b.mp4", crf=30, **options)) == 0
+
+
+@pytest.mark.parametrize("options", [{"pipe": True}, {"worker_interpolation": True}])
+def test_workdir_unsupported_options(tmp_path, grid, options):
+    x, y, data = grid
+    with pytest.raises(ValueError, match="workdir"):
+        Animation(x, y)(data, tmp_path / "out.mp4", workdir=tmp_path / "work", **options)